@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+文章儲存管線
+將生成的文章直接寫入 BlogManager 資料庫，累積成批後以單一交易寫入
+"""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import List, Set
+
+from blog_manager import BlogManager, BlogPost
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def new_article_id(now: datetime = None) -> str:
+    """
+    產生文章 ID
+
+    保留原本的時間前綴（依 ID 排序仍大致等於依建立時間排序），
+    加上隨機後綴，同一秒內並行生成的文章也不會重複。
+
+    Args:
+        now: 建立時間（預設為現在）
+
+    Returns:
+        形如 blog_20250101_093000_1a2b3c4d 的 ID
+    """
+    return f"blog_{(now or datetime.now()).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+class ArticleSink:
+    """
+    生成文章的資料庫寫入端（執行緒安全）
+
+    add() 只把文章放進緩衝區，累積 batch_size 篇或最舊的文章已等待超過 flush_interval 秒時
+    （於 add 時檢查）以 BlogManager.add_articles 整批寫入；生成結束前應呼叫 flush()／close()。
+    資料有誤的單篇文章由 add_articles 略過，整批交易失敗（資料庫鎖定等）時放回緩衝區重試，
+    連續失敗超過 max_retries 次即捨棄該批並記錄文章 ID。
+    """
+
+    def __init__(self, manager: BlogManager, batch_size: int = 20, flush_interval: float = 30.0,
+                 max_retries: int = 5):
+        """
+        初始化儲存管線
+
+        Args:
+            manager: 部落格管理器
+            batch_size: 每批寫入的文章數
+            flush_interval: 緩衝區最舊文章的最長等待秒數（0 表示每篇立即寫入）
+            max_retries: 整批寫入連續失敗的最多重試次數
+        """
+        self.manager = manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+
+        self._buffer: List[BlogPost] = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # 寫入時不持有緩衝區鎖，生成執行緒不會被資料庫寫入卡住
+        self._retries = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def add(self, article) -> str:
+        """
+        加入一篇生成的文章
+
+        Args:
+            article: BlogArticle 物件
+
+        Returns:
+            文章 ID
+        """
+        post = BlogPost(
+            id=article.id,
+            title=article.title,
+            content=article.content,
+            summary=article.summary,
+            category=article.category,
+            tags=article.tags,
+            author=article.author,
+            status=article.status,
+            publish_date=article.publish_date,
+            created_at=article.created_at,
+            updated_at=article.updated_at,
+            read_time=article.read_time,
+            seo_keywords=article.seo_keywords,
+            featured_image=article.featured_image
+        )
+
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append(post)
+            due = (len(self._buffer) >= self.batch_size
+                   or time.monotonic() - self._oldest >= self.flush_interval)
+
+        if due:
+            self.flush()
+        return post.id
+
+    def pending(self) -> int:
+        """緩衝區中尚未寫入的文章數"""
+        with self._lock:
+            return len(self._buffer)
+
+    def pending_ids(self) -> Set[str]:
+        """緩衝區中尚未寫入的文章 ID"""
+        with self._lock:
+            return {post.id for post in self._buffer}
+
+    def flush(self) -> List[str]:
+        """
+        寫入緩衝區中的所有文章
+
+        Returns:
+            已寫入的文章 ID 列表
+        """
+        with self._write_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return []
+
+            added = self.manager.add_articles(batch)
+            if added is None:
+                self.failed += 1
+                self._retries += 1
+                if self._retries > self.max_retries:
+                    # 持續失敗（非暫時性錯誤），不再無限重試
+                    self._retries = 0
+                    self.dropped += len(batch)
+                    logger.error(f"連續 {self.max_retries + 1} 次寫入失敗，捨棄 {len(batch)} 篇文章："
+                                 f"{', '.join(post.id for post in batch)}")
+                    return []
+                # 整批交易失敗（資料庫鎖定等），放回緩衝區等下次寫入
+                with self._lock:
+                    self._buffer[:0] = batch
+                    self._oldest = time.monotonic()
+                return []
+            self._retries = 0
+            self.written += len(added)
+            return added
+
+    def close(self) -> List[str]:
+        """寫入剩餘文章"""
+        added = self.flush()
+        if self.pending():
+            logger.error(f"尚有 {self.pending()} 篇文章未能寫入資料庫")
+        return added
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+搜尋框自動完成
+以排序前綴陣列索引文章標題、標籤與 SEO 關鍵字，依熱門程度（瀏覽與按讚）排序建議
+"""
+
+import bisect
+import heapq
+import json
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+from blog_manager import BlogManager
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 標題依標點切成子句，讓「：」之後的副標題也能以前綴找到
+_CLAUSE_RE = re.compile(r'[：:，,、｜|？?！!（）()「」\s]+')
+
+# 前綴查詢範圍的上界字元
+_MAX_CHAR = "\U0010ffff"
+
+def normalize(text: str) -> str:
+    """正規化（全形轉半形、英文小寫、合併空白）"""
+    return " ".join(unicodedata.normalize("NFKC", text or "").lower().split())
+
+class AutocompleteIndex:
+    """
+    自動完成索引
+
+    所有建議詞正規化後存於排序陣列，前綴查詢以二分搜尋取得範圍；
+    短前綴（預設 1～2 字）的前幾名事先計算並在寫入時增量維護，
+    較長的前綴範圍很小，直接在範圍內挑選並快取。
+    標籤只計入已發布文章；瀏覽與按讚事件會即時調整標題的熱門程度。
+    """
+
+    def __init__(self, manager: BlogManager, max_suggestions: int = 10, warm_prefix_length: int = 2,
+                 like_weight: float = 5.0, cache_size: int = 50000):
+        """
+        初始化索引
+
+        Args:
+            manager: 部落格管理器
+            max_suggestions: 每個前綴保留的建議數
+            warm_prefix_length: 事先計算前幾名的前綴長度上限
+            like_weight: 標題熱門程度中按讚相對於瀏覽的權重
+            cache_size: 前綴快取上限
+        """
+        self.manager = manager
+        self.db_path = manager.db_path
+        self.max_suggestions = max_suggestions
+        self.warm_prefix_length = warm_prefix_length
+        self.like_weight = like_weight
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._sources: Dict[str, Dict[tuple, float]] = {}  # 建議詞 -> {來源: 權重}
+        self._display: Dict[str, str] = {}
+        self._weights: Dict[str, float] = {}
+        self._meta: Dict[str, tuple] = {}  # 建議詞 -> (種類, 文章 ID)
+        self._posts: Dict[str, Dict[tuple, str]] = {}  # 文章 ID -> 該文章貢獻的 {來源: 建議詞}
+        self._cache: Dict[str, List[str]] = {}
+        self._warm: Dict[str, List[str]] = {}
+
+        self.rebuild()
+        manager.add_change_listener(self.on_article_changed)
+        manager.add_engagement_listener(self.on_engagement)
+
+    def suggest(self, prefix: str, limit: int = None) -> List[Dict]:
+        """
+        獲取自動完成建議
+
+        Args:
+            prefix: 使用者輸入的前綴
+            limit: 限制數量（最多 max_suggestions）
+
+        Returns:
+            建議列表，依熱門程度排序；標題建議附上文章 ID
+        """
+        key = normalize(prefix)
+        if not key:
+            return []
+
+        with self._lock:
+            keys = self._warm.get(key)
+            if keys is None:
+                keys = self._cache.get(key)
+            if keys is None:
+                keys = self._top_in_range(key)
+                if len(self._cache) >= self.cache_size:
+                    self._cache.clear()
+                self._cache[key] = keys
+
+            return [self._suggestion(k) for k in keys[:limit or self.max_suggestions]]
+
+    def rebuild(self) -> bool:
+        """
+        從資料庫全量重建索引
+
+        Returns:
+            是否成功
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT id, title, seo_keywords, views, likes, tags
+                FROM blog_posts WHERE status = 'published'
+            ''')
+            posts = cursor.fetchall()
+            cursor.execute("SELECT name, count FROM tag_stats WHERE status = 'published' AND count > 0")
+            tags = cursor.fetchall()
+
+            conn.close()
+
+            with self._lock:
+                self._sources = {}
+                self._display = {}
+                self._weights = {}
+                self._meta = {}
+                self._posts = {}
+                self._cache = {}
+
+                for row in posts:
+                    contributed = self._posts.setdefault(row[0], {})
+                    for source, (text, weight) in self._post_sources(row).items():
+                        self._add_source(contributed, source, text, weight, incremental=False)
+                    for tag in json.loads(row[5]) if row[5] else []:
+                        contributed[("post_tag", tag)] = normalize(tag)
+                for name, count in tags:
+                    self._add_source(None, ("tag", name), name, count, incremental=False)
+
+                self._keys = sorted(self._sources)
+                self._warm_up()
+
+            logger.info(f"自動完成索引重建完成，共 {len(self._keys)} 個建議詞")
+            return True
+
+        except Exception as e:
+            logger.error(f"重建自動完成索引失敗: {e}")
+            return False
+
+    def on_article_changed(self, article_id: str, action: str):
+        """BlogManager 變更監聽器：增量更新單篇文章的建議詞與相關標籤"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            row = None
+            if action != "delete":
+                cursor.execute('''
+                    SELECT id, title, seo_keywords, views, likes, tags
+                    FROM blog_posts WHERE id = ? AND status = 'published'
+                ''', (article_id,))
+                row = cursor.fetchone()
+
+            with self._lock:
+                previous_tags = {source[1] for source in self._posts.get(article_id, {}) if source[0] == "post_tag"}
+            current_tags = set(json.loads(row[5])) if row and row[5] else set()
+
+            # 標籤數由觸發器維護，重新讀取受影響標籤的已發布文章數（與 rebuild 相同來源）
+            affected_tags = list(previous_tags | current_tags)
+            tag_counts = {}
+            for start in range(0, len(affected_tags), 500):
+                chunk = affected_tags[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(f'''
+                    SELECT name, count FROM tag_stats
+                    WHERE status = 'published' AND name IN ({placeholders})
+                ''', chunk)
+                tag_counts.update(cursor.fetchall())
+
+            conn.close()
+
+            with self._lock:
+                for source, key in self._posts.pop(article_id, {}).items():
+                    if source[0] != "post_tag":
+                        self._remove_source(source, key)
+
+                if row:
+                    contributed = self._posts.setdefault(article_id, {})
+                    for source, (text, weight) in self._post_sources(row).items():
+                        self._add_source(contributed, source, text, weight)
+                    for tag in current_tags:
+                        contributed[("post_tag", tag)] = normalize(tag)
+
+                for tag in affected_tags:
+                    key = normalize(tag)
+                    if key in self._sources and ("tag", tag) in self._sources[key]:
+                        self._remove_source(("tag", tag), key)
+                    if tag_counts.get(tag, 0) > 0:
+                        self._add_source(None, ("tag", tag), tag, tag_counts[tag])
+
+        except Exception as e:
+            logger.error(f"更新自動完成索引失敗: {e}")
+
+    def on_engagement(self, article_id: str, kind: str):
+        """BlogManager 互動事件監聽器：瀏覽或按讚後調高該文章標題與子句的權重"""
+        delta = self.like_weight if kind == "like" else 1
+        with self._lock:
+            contributed = self._posts.get(article_id)
+            if not contributed:
+                return
+            for source, key in list(contributed.items()):
+                if source[0] in ("post", "clause") and source in self._sources.get(key, {}):
+                    weight = self._sources[key][source] + delta
+                    self._add_source(contributed, source, self._display[key], weight)
+
+    def _post_sources(self, row) -> Dict[tuple, tuple]:
+        """文章貢獻的建議詞：標題、標題子句與 SEO 關鍵字"""
+        article_id, title, seo_keywords = row[0], row[1], row[2]
+        popularity = (row[3] or 0) + (row[4] or 0) * self.like_weight + 1
+
+        sources = {("post", article_id): (title, popularity)}
+        clauses = [clause for clause in _CLAUSE_RE.split(title or "") if clause]
+        for clause in clauses[1:]:
+            sources[("clause", article_id, clause)] = (clause, popularity)
+        for keyword in json.loads(seo_keywords) if seo_keywords else []:
+            sources[("keyword", article_id, keyword)] = (keyword, 1)
+        return sources
+
+    def _suggestion(self, key: str) -> Dict:
+        """組成建議結果（種類與文章 ID 在建議詞變更後才重新整理；呼叫時須持有鎖）"""
+        meta = self._meta.get(key)
+        if meta is None:
+            sources = self._sources[key]
+            article_id = next((source[1] for source in sources if source[0] in ("post", "clause")), None)
+            kinds = {source[0] for source in sources}
+            kind = "tag" if "tag" in kinds else "keyword" if kinds == {"keyword"} else "title"
+            meta = self._meta[key] = (kind, article_id)
+
+        return {
+            "text": self._display[key],
+            "kind": meta[0],
+            "article_id": meta[1],
+            "weight": self._weights[key]
+        }
+
+    def _add_source(self, contributed: Optional[Dict], source: tuple, text: str, weight: float,
+                    incremental: bool = True):
+        """加入一個建議詞來源（呼叫時須持有鎖；重建時不維護排序陣列與前幾名）"""
+        key = normalize(text)
+        if not key:
+            return
+
+        sources = self._sources.get(key)
+        if sources is None:
+            sources = self._sources[key] = {}
+            self._display[key] = text.strip()
+            if incremental:
+                bisect.insort(self._keys, key)
+
+        previous = self._weights.get(key, 0.0)
+        self._weights[key] = previous - sources.get(source, 0.0) + weight
+        sources[source] = weight
+        self._meta.pop(key, None)
+        if contributed is not None:
+            contributed[source] = key
+
+        if incremental:
+            self._on_weight_changed(key, increased=self._weights[key] >= previous)
+
+    def _remove_source(self, source: tuple, key: str):
+        """移除一個建議詞來源（呼叫時須持有鎖）"""
+        sources = self._sources.get(key)
+        if not sources or source not in sources:
+            return
+
+        weight = sources.pop(source)
+        self._meta.pop(key, None)
+        if sources:
+            self._weights[key] -= weight
+        else:
+            del self._sources[key]
+            del self._display[key]
+            del self._weights[key]
+            index = bisect.bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+        self._on_weight_changed(key, increased=False)
+
+    def _on_weight_changed(self, key: str, increased: bool):
+        """
+        建議詞新增或權重變更後，增量維護各前綴的前幾名（呼叫時須持有鎖）
+
+        權重上升時直接插入該前綴的清單；下降或移除且原本在清單中時，
+        短前綴重新計算，其餘前綴從快取移除待下次查詢再計算。
+        """
+        for length in range(1, len(key) + 1):
+            prefix = key[:length]
+            for store in (self._warm, self._cache):
+                top = store.get(prefix)
+                if top is None:
+                    continue
+
+                if increased:
+                    if key in top:
+                        top.remove(key)
+                    if len(top) < self.max_suggestions or self._weights[key] > self._weights[top[-1]]:
+                        top.append(key)
+                        top.sort(key=self._rank)
+                        del top[self.max_suggestions:]
+                elif key in top:
+                    if store is self._warm:
+                        store[prefix] = self._top_in_range(prefix)
+                    else:
+                        del store[prefix]
+
+    def _rank(self, key: str):
+        """排序鍵：權重高者優先，同分依字典序"""
+        return (-self._weights[key], key)
+
+    def _top_in_range(self, prefix: str) -> List[str]:
+        """在排序陣列中取得前綴範圍並挑選前幾名（呼叫時須持有鎖）"""
+        low = bisect.bisect_left(self._keys, prefix)
+        high = bisect.bisect_left(self._keys, prefix + _MAX_CHAR, low)
+        return heapq.nsmallest(self.max_suggestions, self._keys[low:high], key=self._rank)
+
+    def _warm_up(self):
+        """一次掃描排序陣列，計算所有短前綴的前幾名（呼叫時須持有鎖）"""
+        heaps: Dict[str, list] = {}
+        for key in self._keys:
+            entry = (self._weights[key], _Reversed(key))
+            for length in range(1, min(len(key), self.warm_prefix_length) + 1):
+                heap = heaps.setdefault(key[:length], [])
+                if len(heap) < self.max_suggestions:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        self._warm = {
+            prefix: [entry[1].key for entry in sorted(heap, reverse=True)]
+            for prefix, heap in heaps.items()
+        }
+
+class _Reversed:
+    """反向比較的字串（讓最小堆積在同分時保留字典序較小者）"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __lt__(self, other):
+        return self.key > other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+def main():
+    """主函數 - 互動式測試自動完成"""
+    manager = BlogManager()
+    index = AutocompleteIndex(manager)
+
+    print("=== 自動完成 ===")
+    for prefix in ["黃", "黃金", "投資", "etf"]:
+        suggestions = ", ".join(item["text"] for item in index.suggest(prefix, limit=5))
+        print(f"{prefix}：{suggestions}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+BlogManager 規模效能測試
+以合成語料在 1 萬、10 萬、100 萬篇文章規模下量測各項操作的延遲，輸出 JSON 供追蹤效能退化
+
+用法：python benchmarks/bench_blog_manager.py [--sizes 10000,100000,1000000] [--output results.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blog_manager import BlogManager
+from corpus import CATEGORIES, bulk_insert, generate_posts
+
+SEARCH_KEYWORDS = ["黃金ETF", "聯準會", "定期定額", "不存在的關鍵字"]
+
+def summarize(samples) -> dict:
+    """計算延遲統計（毫秒）"""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_sec": len(ordered) / sum(ordered) if sum(ordered) else None,
+    }
+
+def measure(func, repeat: int) -> dict:
+    """重複執行並統計延遲"""
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+def count_bench_posts(db_path: str) -> int:
+    """目前的合成文章數"""
+    conn = sqlite3.connect(db_path)
+    total = conn.execute("SELECT COUNT(*) FROM blog_posts WHERE id LIKE 'bench_%'").fetchone()[0]
+    conn.close()
+    return total
+
+def run_size(manager: BlogManager, size: int, repeat: int, add_samples: int,
+             content_chars: int, rng: random.Random) -> list:
+    """在單一規模下執行所有量測"""
+    results = []
+
+    def record(operation: str, params: dict, stats: dict):
+        results.append({"size": size, "operation": operation, "params": params, **stats})
+        print(f"  {operation:<26} {json.dumps(params, ensure_ascii=False):<32} "
+              f"p50 {stats['p50_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms")
+
+    # add_article：新增後刪除，維持語料規模
+    new_posts = list(generate_posts(add_samples, start=10_000_000 + size, content_chars=content_chars))
+    record("add_article", {}, measure(lambda i: manager.add_article(new_posts[i]), len(new_posts)))
+    for post in new_posts:
+        manager.delete_article(post.id)
+
+    for offset in sorted({0, 100, 1000, size // 10, size // 2}):
+        if offset < size:
+            record("get_articles", {"offset": offset, "limit": 10},
+                   measure(lambda i: manager.get_articles(limit=10, offset=offset), repeat))
+
+    for keyword in SEARCH_KEYWORDS:
+        record("search_articles", {"keyword": keyword},
+               measure(lambda i: manager.search_articles(keyword), max(3, repeat // 5)))
+
+    record("get_articles_by_category", {},
+           measure(lambda i: manager.get_articles_by_category(CATEGORIES[i % len(CATEGORIES)]), repeat))
+
+    article_ids = [f"bench_{rng.randrange(size):07d}" for _ in range(repeat)]
+    record("increment_views", {}, measure(lambda i: manager.increment_views(article_ids[i]), repeat))
+
+    record("get_popular_tags", {"limit": 20}, measure(lambda i: manager.get_popular_tags(), repeat))
+
+    return results
+
+def main():
+    """主函數 - 執行規模效能測試"""
+    parser = argparse.ArgumentParser(description="BlogManager 規模效能測試")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="以逗號分隔的文章數規模")
+    parser.add_argument("--db", help="測試資料庫路徑（預設使用暫存檔，指定時可重複使用已建立的語料）")
+    parser.add_argument("--output", default="bench_blog_manager.json", help="JSON 結果輸出路徑")
+    parser.add_argument("--repeat", type=int, default=50, help="每項讀取操作的重複次數")
+    parser.add_argument("--add-samples", type=int, default=200, help="add_article 量測筆數")
+    parser.add_argument("--content-chars", type=int, default=1500, help="每篇文章內容字數")
+    parser.add_argument("--seed", type=int, default=42, help="亂數種子")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    rng = random.Random(args.seed)
+
+    tmp_dir = None
+    db_path = args.db
+    if not db_path:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(tmp_dir.name, "blog.db")
+
+    manager = BlogManager(db_path)
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "content_chars": args.content_chars,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "build": [],
+        "results": [],
+    }
+
+    print("=== BlogManager 規模效能測試 ===")
+    try:
+        for size in sizes:
+            # 逐步擴充語料至目標規模
+            bench_rows = count_bench_posts(db_path)
+            if bench_rows < size:
+                start = time.perf_counter()
+                inserted = bulk_insert(db_path, generate_posts(
+                    size - bench_rows, start=bench_rows, seed=args.seed, content_chars=args.content_chars
+                ))
+                elapsed = time.perf_counter() - start
+                report["build"].append({"size": size, "inserted": inserted, "seconds": elapsed,
+                                        "db_bytes": os.path.getsize(db_path)})
+                print(f"\n建立語料：{size} 篇（新增 {inserted} 篇，{elapsed:.1f} 秒）")
+
+            print(f"\n規模 {size}：")
+            report["results"].extend(
+                run_size(manager, size, args.repeat, args.add_samples, args.content_chars, rng)
+            )
+    finally:
+        manager.close()
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n結果已儲存至 {args.output}")
+
+if __name__ == "__main__":
+    main()
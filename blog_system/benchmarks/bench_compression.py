@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+內容壓縮效能測試
+比較未壓縮與壓縮內容的資料庫大小、頁面快取命中率與讀取延遲
+
+用法：python benchmarks/bench_compression.py [--posts 50000] [--reads 20000] [--cache-pages 2000]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blog_manager import BlogManager
+from corpus import bulk_insert, generate_posts
+
+# sqlite3_db_status 的頁面快取計數項目
+SQLITE_DBSTATUS_CACHE_HIT = 7
+SQLITE_DBSTATUS_CACHE_MISS = 8
+SQLITE_OPEN_READONLY = 1
+SQLITE_ROW = 100
+SQLITE_TRANSIENT = ctypes.c_void_p(-1)
+
+def _load_sqlite_library():
+    """
+    載入 SQLite C 函式庫並設定用到的函數簽章（Python 的 sqlite3 模組未提供 db_status）
+
+    Returns:
+        ctypes 函式庫；找不到時回傳 None
+    """
+    name = ctypes.util.find_library("sqlite3")
+    if not name:
+        return None
+    try:
+        library = ctypes.CDLL(name)
+    except OSError:
+        return None
+
+    handle, pointer = ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p)
+    signatures = {
+        "sqlite3_open_v2": ([ctypes.c_char_p, pointer, ctypes.c_int, ctypes.c_char_p], ctypes.c_int),
+        "sqlite3_exec": ([handle, ctypes.c_char_p, handle, handle, handle], ctypes.c_int),
+        "sqlite3_prepare_v2": ([handle, ctypes.c_char_p, ctypes.c_int, pointer, handle], ctypes.c_int),
+        "sqlite3_bind_text": ([handle, ctypes.c_int, ctypes.c_char_p, ctypes.c_int, handle], ctypes.c_int),
+        "sqlite3_step": ([handle], ctypes.c_int),
+        "sqlite3_column_bytes": ([handle, ctypes.c_int], ctypes.c_int),
+        "sqlite3_reset": ([handle], ctypes.c_int),
+        "sqlite3_finalize": ([handle], ctypes.c_int),
+        "sqlite3_close": ([handle], ctypes.c_int),
+        "sqlite3_db_status": ([handle, ctypes.c_int, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+                               ctypes.c_int], ctypes.c_int),
+    }
+    for function, (argtypes, restype) in signatures.items():
+        getattr(library, function).argtypes = argtypes
+        getattr(library, function).restype = restype
+    return library
+
+def measure_page_cache(db_path: str, article_ids, reads: int, cache_pages: int, seed: int) -> dict:
+    """
+    以與 measure_reads 相同的讀取順序統計頁面快取命中與未命中頁數
+
+    透過 C API 自行開啟連線（sqlite3_open_v2）並讀取 sqlite3_db_status，
+    不依賴 Python sqlite3 模組的內部結構；無法載入 SQLite 函式庫時各項為 None。
+
+    Returns:
+        {"cache_hits", "cache_misses", "cache_hit_rate", "misses_per_read"}
+    """
+    stats = {"cache_hits": None, "cache_misses": None, "cache_hit_rate": None, "misses_per_read": None}
+    library = _load_sqlite_library()
+    if library is None:
+        return stats
+
+    db = ctypes.c_void_p()
+    statement = ctypes.c_void_p()
+    try:
+        if library.sqlite3_open_v2(db_path.encode(), ctypes.byref(db), SQLITE_OPEN_READONLY, None):
+            return stats
+        library.sqlite3_exec(db, f'PRAGMA cache_size = {cache_pages}'.encode(), None, None, None)
+        if library.sqlite3_prepare_v2(db, b'SELECT content FROM blog_posts WHERE id = ?', -1,
+                                      ctypes.byref(statement), None):
+            return stats
+
+        rng = random.Random(seed)
+        for _ in range(reads):
+            library.sqlite3_bind_text(statement, 1, rng.choice(article_ids).encode(), -1, SQLITE_TRANSIENT)
+            if library.sqlite3_step(statement) == SQLITE_ROW:
+                library.sqlite3_column_bytes(statement, 0)  # 讀出整個欄位（含溢位頁）
+            library.sqlite3_reset(statement)
+
+        counts = {}
+        for key, op in (("cache_hits", SQLITE_DBSTATUS_CACHE_HIT), ("cache_misses", SQLITE_DBSTATUS_CACHE_MISS)):
+            current, highwater = ctypes.c_int(), ctypes.c_int()
+            if library.sqlite3_db_status(db, op, ctypes.byref(current), ctypes.byref(highwater), 0):
+                return stats
+            counts[key] = current.value
+    finally:
+        if statement:
+            library.sqlite3_finalize(statement)
+        if db:
+            library.sqlite3_close(db)
+
+    total = counts["cache_hits"] + counts["cache_misses"]
+    stats.update(counts)
+    stats["cache_hit_rate"] = counts["cache_hits"] / total if total else None
+    stats["misses_per_read"] = counts["cache_misses"] / reads
+    return stats
+
+def measure_reads(db_path: str, manager: BlogManager, article_ids, reads: int, cache_pages: int, seed: int) -> dict:
+    """以單一長連線隨機讀取整篇文章（含解壓），統計平均延遲"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(f'PRAGMA cache_size = {cache_pages}')
+    rng = random.Random(seed)
+
+    start = time.perf_counter()
+    for _ in range(reads):
+        row = conn.execute('SELECT * FROM blog_posts WHERE id = ?', (rng.choice(article_ids),)).fetchone()
+        manager.decode_content(row[2])
+    elapsed = time.perf_counter() - start
+    conn.close()
+
+    return {"read_us": elapsed / reads * 1e6}
+
+def database_stats(db_path: str) -> dict:
+    """資料庫大小與內容欄位大小"""
+    conn = sqlite3.connect(db_path)
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    page_count = conn.execute('PRAGMA page_count').fetchone()[0]
+    content_bytes = conn.execute('SELECT SUM(length(CAST(content AS BLOB))) FROM blog_posts').fetchone()[0]
+    conn.close()
+    return {"db_bytes": page_size * page_count, "pages": page_count, "content_bytes": content_bytes}
+
+def main():
+    """主函數 - 執行內容壓縮效能測試"""
+    parser = argparse.ArgumentParser(description="BlogManager 內容壓縮效能測試")
+    parser.add_argument("--posts", type=int, default=50000, help="測試文章數")
+    parser.add_argument("--reads", type=int, default=20000, help="隨機讀取次數")
+    parser.add_argument("--cache-pages", type=int, default=2000, help="SQLite 頁面快取大小（頁）")
+    parser.add_argument("--content-chars", type=int, default=1800, help="每篇文章內容字數")
+    parser.add_argument("--seed", type=int, default=42, help="亂數種子")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    results = {"posts": args.posts, "reads": args.reads, "cache_pages": args.cache_pages}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plain_path = os.path.join(tmp_dir, "plain.db")
+        compressed_path = os.path.join(tmp_dir, "compressed.db")
+
+        BlogManager(plain_path)
+        bulk_insert(plain_path, generate_posts(args.posts, seed=args.seed, content_chars=args.content_chars))
+        shutil.copyfile(plain_path, compressed_path)
+
+        manager = BlogManager(compressed_path)
+        start = time.perf_counter()
+        manager.enable_compression()
+        manager.recode_content(compress=True)
+        conn = sqlite3.connect(compressed_path)
+        conn.execute('VACUUM')
+        conn.close()
+        results["compress_seconds"] = time.perf_counter() - start
+
+        article_ids = [f"bench_{i:07d}" for i in range(args.posts)]
+        for name, db_path in (("plain", plain_path), ("compressed", compressed_path)):
+            results[name] = database_stats(db_path)
+            results[name].update(measure_reads(db_path, manager, article_ids, args.reads, args.cache_pages, args.seed))
+            results[name].update(measure_page_cache(db_path, article_ids, args.reads, args.cache_pages, args.seed))
+
+    plain, compressed = results["plain"], results["compressed"]
+    results["size_ratio"] = compressed["db_bytes"] / plain["db_bytes"]
+
+    print("=== 內容壓縮效能測試 ===")
+    for name in ("plain", "compressed"):
+        stats = results[name]
+        hit_rate = f"{stats['cache_hit_rate']:.1%}" if stats["cache_hit_rate"] is not None else "無法取得"
+        misses = f"{stats['misses_per_read']:.2f}" if stats["misses_per_read"] is not None else "-"
+        print(f"{name:<10} 資料庫 {stats['db_bytes'] / 1048576:8.1f} MB  內容 {stats['content_bytes'] / 1048576:8.1f} MB  "
+              f"快取命中率 {hit_rate}  每次讀取未命中 {misses} 頁  單篇讀取 {stats['read_us']:.1f} µs")
+    print(f"壓縮後大小：{results['size_ratio']:.1%}")
+    print(json.dumps(results, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
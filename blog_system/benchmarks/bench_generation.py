@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+文章生成管線效能測試（離線）
+以 StubBackend 模擬模型延遲，測量每分鐘文章數、各階段的管線額外開銷與並行擴展性
+
+用法：python benchmarks/bench_generation.py [--articles 32] [--latency 0.2] [--tokens-per-second 2000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blog_generator import BlogGenerator
+from llm_backend import StubBackend
+from rate_limiter import RateLimiter
+
+STAGES = ("title", "outline", "content", "summary", "keywords")
+
+def make_generator(backend: StubBackend, cache_path: str = None, concurrent_stages: bool = True,
+                   stream_content: bool = False) -> BlogGenerator:
+    """建立使用替身後端的生成器（速率限制放寬，不影響測量）"""
+    return BlogGenerator(
+        backend=backend,
+        cache_path=cache_path,
+        concurrent_stages=concurrent_stages,
+        stream_content=stream_content,
+        draft_dir=None,
+        rate_limiter=RateLimiter(requests_per_minute=10 ** 9, tokens_per_minute=10 ** 12)
+    )
+
+def measure_stage_overhead(calls: int, cache_dir: str) -> dict:
+    """
+    零延遲後端下各階段單次呼叫的耗時（提示詞組裝、速率限制、快取查詢與解析）
+
+    Returns:
+        {"no_cache": {階段: µs}, "cache_miss": {...}, "cache_hit": {...}}
+    """
+    results = {}
+    outline = json.loads(StubBackend().respond([], "outline"))
+    content = StubBackend().respond([], "content")
+    runners = {
+        "title": lambda g, i: g.generate_seo_optimized_title(f"主題{i}", "投資策略"),
+        "outline": lambda g, i: g.generate_article_outline("投資策略", f"主題{i}"),
+        "content": lambda g, i: g.generate_article_content(outline, "投資策略", {"run": i}),
+        "summary": lambda g, i: g.generate_article_summary(f"{i}{content}"),
+        "keywords": lambda g, i: g.extract_keywords(f"{i}{content}"),
+    }
+
+    for mode in ("no_cache", "cache_miss", "cache_hit"):
+        cache_path = None if mode == "no_cache" else os.path.join(cache_dir, "overhead.db")
+        generator = make_generator(StubBackend(), cache_path, concurrent_stages=False)
+        if mode != "no_cache":
+            generator.cached_stages = set(STAGES)
+        if mode == "cache_miss":
+            generator.response_cache.clear()
+
+        results[mode] = {}
+        for stage in STAGES:
+            start = time.perf_counter()
+            # 取樣階段的快取以文章為範圍，在同一篇文章的工作中呼叫才會命中
+            for i in range(calls):
+                generator._bind_article("overhead", lambda: runners[stage](generator, i))()
+            results[mode][stage] = (time.perf_counter() - start) / calls * 1e6
+
+    return results
+
+def measure_article(backend_args: dict, articles: int) -> dict:
+    """單篇文章的端到端延遲（循序階段、並行階段、並行且串流內容）"""
+    results = {}
+    for name, concurrent, streaming in (("sequential", False, False), ("concurrent", True, False),
+                                        ("streaming", True, True)):
+        generator = make_generator(StubBackend(**backend_args), concurrent_stages=concurrent,
+                                   stream_content=streaming)
+        start = time.perf_counter()
+        for i in range(articles):
+            generator.create_blog_article("投資策略", f"主題{i}")
+        results[name] = (time.perf_counter() - start) / articles
+    return results
+
+def measure_scaling(backend_args: dict, articles: int, levels) -> list:
+    """批次生成在不同並行數下的每分鐘文章數"""
+    rows = []
+    baseline = None
+    for concurrency in levels:
+        backend = StubBackend(**backend_args)
+        generator = make_generator(backend)
+        start = time.perf_counter()
+        produced = generator.generate_batch(articles, max_concurrency=concurrency, save=False)
+        elapsed = time.perf_counter() - start
+
+        per_minute = len(produced) / elapsed * 60
+        baseline = baseline or per_minute
+        rows.append({
+            "concurrency": concurrency,
+            "articles": len(produced),
+            "seconds": elapsed,
+            "articles_per_minute": per_minute,
+            "speedup": per_minute / baseline,
+            "calls": backend.calls
+        })
+    return rows
+
+def main():
+    """主函數 - 執行文章生成管線效能測試"""
+    parser = argparse.ArgumentParser(description="BlogGenerator 離線效能測試")
+    parser.add_argument("--articles", type=int, default=32, help="並行擴展測試的文章數")
+    parser.add_argument("--latency", type=float, default=0.2, help="替身後端每次呼叫的固定延遲（秒）")
+    parser.add_argument("--tokens-per-second", type=float, default=2000, help="替身後端的輸出速度")
+    parser.add_argument("--overhead-calls", type=int, default=200, help="額外開銷測試每階段的呼叫次數")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="並行數（逗號分隔）")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    backend_args = {"first_token_latency": args.latency, "tokens_per_second": args.tokens_per_second}
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        overhead = measure_stage_overhead(args.overhead_calls, tmp_dir)
+    article = measure_article(backend_args, articles=3)
+    scaling = measure_scaling(backend_args, args.articles, levels)
+
+    print("=== 各階段管線額外開銷（零延遲後端，µs／次）===")
+    print(f"{'階段':<10}{'不快取':>12}{'快取未命中':>12}{'快取命中':>12}")
+    for stage in STAGES:
+        print(f"{stage:<10}{overhead['no_cache'][stage]:>12.0f}{overhead['cache_miss'][stage]:>12.0f}"
+              f"{overhead['cache_hit'][stage]:>12.0f}")
+
+    print(f"\n=== 單篇文章延遲（固定延遲 {args.latency}s、{args.tokens_per_second:.0f} tokens/s）===")
+    for name, seconds in article.items():
+        print(f"{name:<12}{seconds:8.2f} 秒")
+
+    print("\n=== 並行擴展性 ===")
+    for row in scaling:
+        print(f"並行 {row['concurrency']:>3}：{row['articles_per_minute']:8.1f} 篇/分鐘  "
+              f"加速 {row['speedup']:5.2f}x  （{row['articles']} 篇，{row['seconds']:.1f} 秒）")
+
+    print(json.dumps({"overhead_us": overhead, "article_seconds": article, "scaling": scaling}, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+讀取快照效能測試
+比較 BlogManager 直接讀取磁碟資料庫與記憶體快照模式的讀取吞吐量
+
+用法：python benchmarks/bench_read_snapshot.py [--posts 2000] [--seconds 3] [--threads 4]
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blog_manager import BlogManager
+from corpus import CATEGORIES, bulk_insert, generate_posts
+
+def build_database(db_path: str, posts: int):
+    """建立測試資料庫"""
+    BlogManager(db_path)
+    bulk_insert(db_path, generate_posts(posts, status_weights={"published": 1}))
+
+def run_reads(manager: BlogManager, article_ids, seconds: float, threads: int) -> float:
+    """以多執行緒混合讀取，回傳每秒操作數"""
+    counts = [0] * threads
+    deadline = time.perf_counter() + seconds
+
+    def worker(index: int):
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            choice = rng.random()
+            if choice < 0.5:
+                manager.get_article(rng.choice(article_ids))
+            elif choice < 0.8:
+                manager.get_articles(limit=10, offset=rng.randrange(0, 100))
+            elif choice < 0.9:
+                manager.get_articles_by_category(rng.choice(CATEGORIES))
+            else:
+                manager.get_popular_tags()
+            counts[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+def main():
+    """主函數 - 執行讀取快照效能測試"""
+    parser = argparse.ArgumentParser(description="BlogManager 讀取快照效能測試")
+    parser.add_argument("--posts", type=int, default=2000, help="測試文章數")
+    parser.add_argument("--seconds", type=float, default=3.0, help="每組測試秒數")
+    parser.add_argument("--threads", type=int, default=4, help="讀取執行緒數")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "blog.db")
+        build_database(db_path, args.posts)
+        article_ids = [f"bench_{i:07d}" for i in range(args.posts)]
+
+        results = {"posts": args.posts, "threads": args.threads}
+
+        disk_manager = BlogManager(db_path)
+        results["disk_ops_per_sec"] = run_reads(disk_manager, article_ids, args.seconds, args.threads)
+
+        snapshot_manager = BlogManager(db_path, snapshot=True)
+        results["snapshot_ops_per_sec"] = run_reads(snapshot_manager, article_ids, args.seconds, args.threads)
+        snapshot_manager.close()
+
+        results["speedup"] = results["snapshot_ops_per_sec"] / results["disk_ops_per_sec"]
+
+    print("=== 讀取快照效能測試 ===")
+    print(f"磁碟讀取：{results['disk_ops_per_sec']:.0f} ops/s")
+    print(f"記憶體快照：{results['snapshot_ops_per_sec']:.0f} ops/s（{results['speedup']:.2f}x）")
+    print(json.dumps(results, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
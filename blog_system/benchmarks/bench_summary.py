@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+摘要效能測試
+比較本機擷取式摘要與 API 摘要的延遲、token 用量與費用，並以關鍵字涵蓋率比較本機摘要與舊的前 150 字備援
+
+用法：python benchmarks/bench_summary.py [--articles 500] [--api-articles 20] [--latency 1.5] [--api-key sk-...]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blog_generator import BlogGenerator
+from corpus import generate_posts
+from extractive_summarizer import ExtractiveSummarizer
+from keyword_extractor import KeywordExtractor
+from llm_backend import OpenAIBackend, StubBackend
+from rate_limiter import RateLimiter
+
+def _percentile(values, fraction: float) -> float:
+    """最近排名法百分位數"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+def keyword_coverage(summary: str, keywords) -> float:
+    """摘要涵蓋的文章關鍵字比例（摘要品質的粗略指標）"""
+    return sum(keyword in summary for keyword in keywords) / len(keywords) if keywords else 0.0
+
+def measure_local(contents, extractor: KeywordExtractor) -> dict:
+    """本機摘要的延遲、長度與關鍵字涵蓋率（對照前 150 字截斷）"""
+    summarizer = ExtractiveSummarizer()
+    latencies, lengths, coverage, baseline = [], [], [], []
+
+    for content in contents:
+        start = time.perf_counter()
+        summary = summarizer.summarize(content)
+        latencies.append(time.perf_counter() - start)
+
+        keywords = extractor.extract(content)
+        lengths.append(len(summary))
+        coverage.append(keyword_coverage(summary, keywords))
+        baseline.append(keyword_coverage(content[:150], keywords))
+
+    return {
+        "articles": len(contents),
+        "latency_ms_p50": _percentile(latencies, 0.5) * 1000,
+        "latency_ms_p95": _percentile(latencies, 0.95) * 1000,
+        "chars_mean": sum(lengths) / len(lengths),
+        "keyword_coverage": sum(coverage) / len(coverage),
+        "truncation_keyword_coverage": sum(baseline) / len(baseline),
+        "tokens": 0,
+        "cost_usd_per_1000": 0.0,
+    }
+
+def measure_api(contents, backend) -> dict:
+    """API 摘要的延遲與 token 用量（以生成器的用量統計計算）"""
+    generator = BlogGenerator(
+        backend=backend,
+        cache_path=None,
+        rate_limiter=RateLimiter(requests_per_minute=10 ** 9, tokens_per_minute=10 ** 12)
+    )
+    for content in contents:
+        generator.generate_article_summary(content)
+
+    stats = generator.metrics.report()["stages"]["summary"]
+    calls = stats["calls"] or 1
+    return {
+        "articles": stats["calls"],
+        "latency_ms_p50": stats["wall_p50"] * 1000,
+        "latency_ms_p95": stats["wall_p95"] * 1000,
+        "prompt_tokens_mean": stats["prompt_tokens"] / calls,
+        "completion_tokens_mean": stats["completion_tokens"] / calls,
+        "tokens": stats["total_tokens"],
+        "cost_usd_per_1000": stats["cost_usd"] / calls * 1000,
+        "estimated_tokens": stats["estimated"] > 0,
+    }
+
+def main():
+    """主函數 - 執行摘要效能測試"""
+    parser = argparse.ArgumentParser(description="本機摘要與 API 摘要效能比較")
+    parser.add_argument("--articles", type=int, default=500, help="本機摘要測試文章數")
+    parser.add_argument("--api-articles", type=int, default=20, help="API 摘要測試文章數")
+    parser.add_argument("--content-chars", type=int, default=1800, help="每篇文章內容字數")
+    parser.add_argument("--latency", type=float, default=1.5, help="替身後端的固定延遲（秒）")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="替身後端的輸出速度")
+    parser.add_argument("--api-key", default=os.environ.get("OPENAI_API_KEY"), help="指定時改用 OpenAI 實際測量")
+    parser.add_argument("--seed", type=int, default=42, help="亂數種子")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    contents = [post.content for post in generate_posts(args.articles, seed=args.seed, content_chars=args.content_chars)]
+
+    extractor = KeywordExtractor()
+    extractor.fit(contents)
+
+    if args.api_key:
+        backend = OpenAIBackend(args.api_key)
+    else:
+        backend = StubBackend(first_token_latency=args.latency, tokens_per_second=args.tokens_per_second)
+
+    results = {
+        "local": measure_local(contents, extractor),
+        "api": measure_api(contents[:args.api_articles], backend),
+        "backend": backend.name,
+    }
+    local, api = results["local"], results["api"]
+
+    print("=== 摘要效能比較 ===")
+    print(f"本機  p50 {local['latency_ms_p50']:8.2f} ms  p95 {local['latency_ms_p95']:8.2f} ms  "
+          f"平均 {local['chars_mean']:.0f} 字  token 0")
+    print(f"API   p50 {api['latency_ms_p50']:8.2f} ms  p95 {api['latency_ms_p95']:8.2f} ms  "
+          f"每篇 {api['prompt_tokens_mean']:.0f} + {api['completion_tokens_mean']:.0f} tokens  "
+          f"每千篇 ${api['cost_usd_per_1000']:.2f}（{backend.name}）")
+    print(f"關鍵字涵蓋率：本機摘要 {local['keyword_coverage']:.0%}，前 150 字截斷 {local['truncation_keyword_coverage']:.0%}")
+    print(json.dumps(results, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+效能測試用語料產生器
+產生擬真的繁體中文黃金投資文章（含標籤與分類），並批次寫入資料庫
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from typing import Iterator, Iterable
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from blog_manager import BlogPost
+
+CATEGORIES = ["投資策略", "市場分析", "實用知識", "歷史文化", "時事評論"]
+
+# 依分類區分的標籤池，另有跨分類的共通標籤
+CATEGORY_TAGS = {
+    "投資策略": ["黃金投資", "定期定額", "資產配置", "黃金ETF", "黃金存摺", "長期持有", "風險管理"],
+    "市場分析": ["黃金價格", "技術分析", "基本面分析", "支撐位", "阻力位", "RSI", "美元指數"],
+    "實用知識": ["黃金鑑定", "黃金回收", "金條", "金幣", "保管箱", "稅務", "購買須知"],
+    "歷史文化": ["金本位", "央行儲備", "黃金歷史", "布列敦森林", "黃金文化", "淘金潮"],
+    "時事評論": ["聯準會", "通膨", "地緣政治", "利率決策", "CPI", "非農就業", "避險需求"],
+}
+COMMON_TAGS = ["避險資產", "投資入門", "2025年預測", "台灣投資人", "貴金屬"]
+
+TITLE_TEMPLATES = [
+    "{topic}完整攻略：{audience}必讀的{n}個重點",
+    "{topic}怎麼看？{year}年最新解析",
+    "從{event}看{topic}：專家深度分析",
+    "{audience}如何掌握{topic}？實戰技巧一次看",
+    "{topic}懶人包：{n}分鐘搞懂關鍵觀念",
+]
+TOPICS = ["黃金投資", "金價走勢", "黃金ETF", "實體黃金", "黃金存摺", "避險配置", "央行購金", "黃金回收"]
+AUDIENCES = ["新手", "上班族", "退休族", "小資族", "進階投資人"]
+EVENTS = ["聯準會升息", "通膨數據", "美元走弱", "地緣衝突", "央行增持", "股市修正"]
+
+SENTENCES = [
+    "黃金長期以來被視為對抗通膨的重要工具，在經濟不確定時期更受投資人青睞。",
+    "聯準會的利率決策會影響美元走勢，進而牽動國際金價的表現。",
+    "對台灣投資人而言，黃金存摺門檻低、操作方便，是入門的常見選擇。",
+    "實體金條與金幣雖然保值，但需要考量保管成本與買賣價差。",
+    "技術面上，金價若有效突破前高，可能開啟新一波上漲趨勢。",
+    "建議投資人採取分批布局的方式，降低單一時間點進場的風險。",
+    "各國央行持續增加黃金儲備，顯示黃金在貨幣體系中仍具重要地位。",
+    "地緣政治緊張升溫時，避險資金往往流入黃金市場，推升短期價格。",
+    "黃金ETF具備高流動性，適合作為投資組合中的資產配置工具。",
+    "購買實體黃金時，應選擇信譽良好的銀樓並索取保證書。",
+    "美國CPI數據高於預期時，市場對抗通膨資產的需求隨之增加。",
+    "長期持有黃金的報酬與股票相比波動較低，但也缺乏股息收入。",
+    "定期定額投資黃金可以平均成本，適合沒有時間盯盤的上班族。",
+    "金價與實質利率呈現負相關，實質利率下降時黃金通常表現較佳。",
+    "回收舊金飾前，可先了解當日牌價與店家的扣重與工資計算方式。",
+    "投資黃金也需要留意匯率風險，新台幣升值會影響以台幣計價的報酬。",
+]
+SECTION_TITLES = ["市場現況", "影響因素", "投資方式比較", "風險評估", "實用建議", "常見問題", "結語"]
+
+def _title(rng: random.Random) -> str:
+    """產生文章標題"""
+    return rng.choice(TITLE_TEMPLATES).format(
+        topic=rng.choice(TOPICS),
+        audience=rng.choice(AUDIENCES),
+        event=rng.choice(EVENTS),
+        year=rng.choice([2023, 2024, 2025]),
+        n=rng.randint(3, 10)
+    )
+
+def _content(rng: random.Random, title: str, target_chars: int) -> str:
+    """產生 Markdown 文章內容"""
+    parts = [f"# {title}\n"]
+    length = 0
+    sections = rng.sample(SECTION_TITLES, k=min(len(SECTION_TITLES), max(3, target_chars // 300)))
+
+    for section in sections:
+        parts.append(f"\n## {section}\n")
+        for _ in range(rng.randint(2, 4)):
+            paragraph = "".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 4)))
+            parts.append(paragraph + "\n")
+            length += len(paragraph)
+        if length >= target_chars:
+            break
+
+    return "\n".join(parts)
+
+def generate_posts(count: int, start: int = 0, seed: int = 42, content_chars: int = 1500,
+                   status_weights: dict = None) -> Iterator[BlogPost]:
+    """
+    產生合成文章
+
+    Args:
+        count: 文章數
+        start: 起始序號（用於產生不重複的 ID 與遞增時間）
+        seed: 亂數種子
+        content_chars: 每篇內容的目標字數
+        status_weights: 狀態權重（預設 published 85%、draft 10%、archived 5%）
+
+    Yields:
+        BlogPost 物件
+    """
+    rng = random.Random(seed + start)
+    statuses, weights = zip(*(status_weights or {"published": 85, "draft": 10, "archived": 5}).items())
+    base = datetime(2020, 1, 1)
+
+    for i in range(start, start + count):
+        category = rng.choice(CATEGORIES)
+        tags = rng.sample(CATEGORY_TAGS[category], 3) + rng.sample(COMMON_TAGS, 1)
+        title = _title(rng)
+        content = _content(rng, title, content_chars)
+        timestamp = (base + timedelta(minutes=10 * i)).isoformat()
+        status = rng.choices(statuses, weights)[0]
+
+        yield BlogPost(
+            id=f"bench_{i:07d}",
+            title=title,
+            content=content,
+            summary=content.split("\n## ", 1)[-1][:120],
+            category=category,
+            tags=tags,
+            author="AI 黃金分析師",
+            status=status,
+            publish_date=timestamp if status == "published" else None,
+            created_at=timestamp,
+            updated_at=timestamp,
+            read_time=max(3, len(content) // 300),
+            views=int(rng.paretovariate(1.2) * 10),
+            likes=rng.randint(0, 50),
+            seo_keywords=tags[:3],
+            featured_image=None
+        )
+
+def bulk_insert(db_path: str, posts: Iterable[BlogPost], batch_size: int = 5000) -> int:
+    """
+    以批次交易寫入文章（略過 add_article 的逐筆連線，供建立大型測試資料庫）
+
+    欄位編碼與 add_article 相同，資料表觸發器也會照常執行。
+
+    Args:
+        db_path: 資料庫檔案路徑
+        posts: 文章序列
+        batch_size: 每個交易的筆數
+
+    Returns:
+        寫入筆數
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    total = 0
+    batch = []
+
+    def flush():
+        cursor.executemany('''
+            INSERT INTO blog_posts (
+                id, title, content, summary, category, tags, author,
+                status, publish_date, created_at, updated_at, read_time,
+                views, likes, seo_keywords, featured_image
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', batch)
+        conn.commit()
+        batch.clear()
+
+    for post in posts:
+        batch.append((
+            post.id, post.title, post.content, post.summary, post.category,
+            json.dumps(post.tags), post.author, post.status,
+            post.publish_date, post.created_at, post.updated_at, post.read_time,
+            post.views, post.likes, json.dumps(post.seo_keywords) if post.seo_keywords else None,
+            post.featured_image
+        ))
+        total += 1
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    conn.close()
+    return total
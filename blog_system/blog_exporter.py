@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+部落格靜態匯出器
+將已發布文章、分類頁與索引頁匯出為靜態 HTML，供靜態主機或 CDN 使用
+"""
+
+import gzip
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+from urllib.parse import quote
+
+from blog_manager import BlogManager
+from blog_renderer import render_markdown
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".export_manifest.json"
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="zh-Hant">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+{meta}
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+def _path_segment(name: str, fallback: str) -> str:
+    """
+    將名稱轉為可安全作為單一路徑片段的字串
+
+    保留中文等一般字元，路徑分隔符號、控制字元與開頭結尾的點改為連字號；
+    名稱有被改寫時加上雜湊後綴，避免「a/b」與「a-b」對應到同一個片段。
+
+    Args:
+        name: 原始名稱
+        fallback: 名稱全被移除時使用的前綴
+
+    Returns:
+        路徑片段
+    """
+    slug = re.sub(r'[\\/\x00-\x1f\x7f<>:"|?*#%]+', '-', name).strip(' .-')
+    if slug != name:
+        slug = f"{slug or fallback}-{hashlib.sha256(name.encode('utf-8')).hexdigest()[:8]}"
+    return slug
+
+def category_slug(category: str) -> str:
+    """分類頁的目錄名稱（也是網址路徑）"""
+    return _path_segment(category, "category")
+
+def post_slug(article_id: str) -> str:
+    """文章頁的檔名（不含副檔名；ID 含路徑字元時改寫並加上雜湊後綴）"""
+    return _path_segment(article_id, "post")
+
+def _page_path(output_dir: str, rel_path: str) -> str:
+    """
+    頁面的絕對路徑（確認仍在輸出目錄內）
+
+    Raises:
+        ValueError: 路徑位於輸出目錄之外
+    """
+    root = os.path.abspath(output_dir)
+    path = os.path.abspath(os.path.join(root, rel_path))
+    if not path.startswith(root + os.sep):
+        raise ValueError(f"頁面路徑不在輸出目錄內：{rel_path}")
+    return path
+
+def _content_hash(data: bytes) -> str:
+    """計算頁面內容雜湊"""
+    return hashlib.sha256(data).hexdigest()
+
+def _write_page(output_dir: str, rel_path: str, data: bytes):
+    """原子寫入頁面及其預先壓縮的 .gz 版本"""
+    path = _page_path(output_dir, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    for target, payload in ((path, data), (path + ".gz", gzip.compress(data, compresslevel=9, mtime=0))):
+        tmp_path = target + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, target)
+
+def _remove_page(output_dir: str, rel_path: str):
+    """移除頁面及其 .gz 版本，並移除因此變空的目錄"""
+    try:
+        path = _page_path(output_dir, rel_path)
+    except ValueError as e:
+        # 舊版匯出紀錄可能留有越界路徑，不刪除輸出目錄外的檔案
+        logger.error(f"略過移除頁面: {e}")
+        return
+    for target in (path, path + ".gz"):
+        if os.path.exists(target):
+            os.remove(target)
+
+    root = os.path.abspath(output_dir)
+    directory = os.path.dirname(path)
+    while directory != root and directory.startswith(root + os.sep):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            break
+        directory = os.path.dirname(directory)
+
+def _render_post_page(job: Dict) -> Dict:
+    """
+    渲染單篇文章頁面並在內容變更時寫入（於子行程執行）
+
+    Args:
+        job: 文章資料、快取 HTML、輸出路徑與舊雜湊
+
+    Returns:
+        {"path": ..., "hash": ..., "written": bool}
+    """
+    post = job["post"]
+    article_html = job["html"]
+    if article_html is None:
+        article_html = render_markdown(post["content"]).html
+
+    tags_html = "".join(f"<li>{html.escape(tag)}</li>" for tag in post["tags"])
+    body = (
+        f'<article>\n'
+        f'<header><h1>{html.escape(post["title"])}</h1>\n'
+        f'<p><a href="{job["url_prefix"]}/category/{quote(category_slug(post["category"] or ""))}/">'
+        f'{html.escape(post["category"] or "")}</a> · '
+        f'<time datetime="{html.escape(post["publish_date"] or "")}">'
+        f'{html.escape((post["publish_date"] or "")[:10])}</time></p></header>\n'
+        f'{article_html}\n'
+        f'<ul class="tags">{tags_html}</ul>\n'
+        f'</article>'
+    )
+    meta = f'<meta name="description" content="{html.escape(post["summary"] or "")}">'
+    data = _PAGE_TEMPLATE.format(title=html.escape(post["title"]), meta=meta, body=body).encode('utf-8')
+
+    page_hash = _content_hash(data)
+    written = page_hash != job["old_hash"] or not os.path.exists(os.path.join(job["output_dir"], job["path"]))
+    if written:
+        _write_page(job["output_dir"], job["path"], data)
+
+    return {"path": job["path"], "hash": page_hash, "written": written}
+
+class BlogExporter:
+    """部落格靜態匯出器"""
+
+    def __init__(self, manager: BlogManager, output_dir: str = "dist/blog",
+                 url_prefix: str = "/blog", page_size: int = 10, workers: int = None):
+        """
+        初始化靜態匯出器
+
+        Args:
+            manager: 部落格管理器
+            output_dir: 輸出目錄
+            url_prefix: 網站上的部落格路徑前綴
+            page_size: 索引頁與分類頁每頁文章數
+            workers: 渲染行程數（預設為 CPU 數量，1 表示不使用子行程）
+        """
+        self.manager = manager
+        self.output_dir = output_dir
+        self.url_prefix = url_prefix.rstrip('/')
+        self.page_size = page_size
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+
+    def export(self, force: bool = False) -> Dict:
+        """
+        增量匯出已發布文章
+
+        以 updated_at 判斷需重新渲染的文章，只重建受影響的分類頁與索引頁，
+        且頁面內容雜湊未變時不覆寫檔案；上次匯出但已不在新紀錄中的頁面
+        （下架的文章、清空的分類、多餘的分頁）一併移除。
+
+        Args:
+            force: 忽略上次的匯出紀錄，全部重新產生
+
+        Returns:
+            匯出統計
+        """
+        stats = {"posts_rendered": 0, "pages_written": 0, "pages_unchanged": 0, "pages_removed": 0}
+
+        try:
+            previous = self._load_manifest()
+            manifest = {"posts": {}, "pages": {}} if force else previous
+            old_posts = manifest["posts"]
+            old_pages = manifest["pages"]
+
+            posts = self._fetch_published_posts()
+            current = {post["id"]: post for post in posts}
+
+            changed_ids = [
+                post_id for post_id, post in current.items()
+                if old_posts.get(post_id, {}).get("updated_at") != post["updated_at"]
+            ]
+            removed_ids = [post_id for post_id in old_posts if post_id not in current]
+
+            if not changed_ids and not removed_ids:
+                logger.info("沒有文章變更，略過匯出")
+                return stats
+
+            # 受影響的分類（含文章變更前後所屬的分類）
+            affected_categories = set()
+            for post_id in changed_ids:
+                affected_categories.add(current[post_id]["category"])
+                if post_id in old_posts:
+                    affected_categories.add(old_posts[post_id].get("category"))
+            for post_id in removed_ids:
+                affected_categories.add(old_posts[post_id].get("category"))
+            affected_categories.discard(None)
+
+            new_pages = dict(old_pages)
+
+            # 1. 文章頁（多行程渲染）
+            for result in self._render_posts(changed_ids, old_pages):
+                new_pages[result["path"]] = result["hash"]
+                stats["posts_rendered"] += 1
+                stats["pages_written" if result["written"] else "pages_unchanged"] += 1
+
+            for post_id in removed_ids:
+                new_pages.pop(self._post_path(post_id), None)
+
+            # 2. 列表頁：首頁索引與受影響的分類（沒有文章的分類不產生頁面）
+            listings = {"": posts}
+            for category in affected_categories:
+                listings[category] = [post for post in posts if post["category"] == category]
+
+            for category, listing in listings.items():
+                prefix = f"category/{category_slug(category)}/" if category else ""
+                page_paths = set()
+                pages = self._render_listing(category, listing) if listing or not category else []
+                for page_number, rel_path, data in pages:
+                    page_paths.add(rel_path)
+                    page_hash = _content_hash(data)
+                    if old_pages.get(rel_path) == page_hash and os.path.exists(os.path.join(self.output_dir, rel_path)):
+                        stats["pages_unchanged"] += 1
+                    else:
+                        _write_page(self.output_dir, rel_path, data)
+                        stats["pages_written"] += 1
+                    new_pages[rel_path] = page_hash
+
+                # 多餘的分頁（分類已清空時為整個分類）不再列入紀錄
+                stale_prefix = prefix if category else "page/"
+                for rel_path in list(new_pages):
+                    if rel_path.startswith(stale_prefix) and rel_path not in page_paths:
+                        new_pages.pop(rel_path)
+
+            # 3. 移除不在新紀錄中的頁面（強制重建時也以上次的紀錄為準）
+            for rel_path in set(previous["pages"]) | set(old_pages):
+                if rel_path not in new_pages:
+                    _remove_page(self.output_dir, rel_path)
+                    stats["pages_removed"] += 1
+
+            manifest = {
+                "posts": {
+                    post_id: {"updated_at": post["updated_at"], "category": post["category"]}
+                    for post_id, post in current.items()
+                },
+                "pages": new_pages
+            }
+            self._save_manifest(manifest)
+
+            logger.info(f"靜態匯出完成：{stats}")
+            return stats
+
+        except Exception as e:
+            logger.error(f"靜態匯出失敗: {e}")
+            return stats
+
+    def _render_posts(self, post_ids: List[str], old_pages: Dict) -> List[Dict]:
+        """渲染變更的文章頁，必要時分散至多個行程"""
+        if not post_ids:
+            return []
+
+        jobs = [
+            {
+                "post": post,
+                "html": cached_html,
+                "path": self._post_path(post["id"]),
+                "old_hash": old_pages.get(self._post_path(post["id"])),
+                "output_dir": self.output_dir,
+                "url_prefix": self.url_prefix
+            }
+            for post, cached_html in self._fetch_post_contents(post_ids)
+        ]
+
+        if self.workers <= 1 or len(jobs) < 2:
+            return [_render_post_page(job) for job in jobs]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(_render_post_page, jobs, chunksize=max(1, len(jobs) // (self.workers * 4))))
+
+    def _render_listing(self, category: Optional[str], posts: List[Dict]):
+        """產生列表頁（首頁或分類頁）的各分頁"""
+        base = f"category/{category_slug(category)}/" if category else ""
+        title = f"{category} - 黃金知識部落格" if category else "黃金知識部落格"
+        total_pages = max(1, -(-len(posts) // self.page_size))
+
+        for page_number in range(1, total_pages + 1):
+            page_posts = posts[(page_number - 1) * self.page_size:page_number * self.page_size]
+            items = "\n".join(
+                f'<li><a href="{self.url_prefix}/{quote(self._post_path(post["id"]))}">{html.escape(post["title"])}</a>'
+                f'<p>{html.escape(post["summary"] or "")}</p></li>'
+                for post in page_posts
+            )
+
+            nav = []
+            listing_url = f"{self.url_prefix}/{quote(base)}"
+            if page_number > 1:
+                prev_url = listing_url if page_number == 2 else f"{listing_url}page/{page_number - 1}/"
+                nav.append(f'<a rel="prev" href="{prev_url}">上一頁</a>')
+            if page_number < total_pages:
+                nav.append(f'<a rel="next" href="{listing_url}page/{page_number + 1}/">下一頁</a>')
+
+            body = f"<h1>{html.escape(title)}</h1>\n<ul>\n{items}\n</ul>\n<nav>{' '.join(nav)}</nav>"
+            data = _PAGE_TEMPLATE.format(title=html.escape(title), meta="", body=body).encode('utf-8')
+            rel_path = f"{base}index.html" if page_number == 1 else f"{base}page/{page_number}/index.html"
+
+            yield page_number, rel_path, data
+
+    def _fetch_published_posts(self) -> List[Dict]:
+        """讀取已發布文章的列表欄位（不含內容）"""
+        conn = self.manager._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT id, title, summary, category, publish_date, updated_at
+            FROM blog_posts
+            WHERE status = 'published'
+            ORDER BY created_at DESC
+        ''')
+        posts = [
+            {
+                "id": row[0],
+                "title": row[1],
+                "summary": row[2],
+                "category": row[3],
+                "publish_date": row[4],
+                "updated_at": row[5]
+            }
+            for row in cursor.fetchall()
+        ]
+
+        conn.close()
+        return posts
+
+    def _fetch_post_contents(self, post_ids: List[str]):
+        """讀取文章內容與仍有效的渲染快取"""
+        conn = self.manager._connect()
+        cursor = conn.cursor()
+
+        for start in range(0, len(post_ids), 500):
+            chunk = post_ids[start:start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f'''
+                SELECT p.id, p.title, p.summary, p.category, p.tags, p.publish_date,
+                       p.content, CASE WHEN r.updated_at = p.updated_at THEN r.html END
+                FROM blog_posts p
+                LEFT JOIN rendered_posts r ON r.article_id = p.id
+                WHERE p.id IN ({placeholders})
+            ''', chunk)
+
+            for row in cursor.fetchall():
+                post = {
+                    "id": row[0],
+                    "title": row[1],
+                    "summary": row[2],
+                    "category": row[3],
+                    "tags": json.loads(row[4]) if row[4] else [],
+                    "publish_date": row[5],
+                    # 有有效的渲染快取時不需要原文，也就不必解壓
+                    "content": self.manager.decode_content(row[6]) if row[7] is None else None
+                }
+                yield post, row[7]
+
+        conn.close()
+
+    def _post_path(self, article_id: str) -> str:
+        """文章頁的相對路徑"""
+        return f"posts/{post_slug(article_id)}.html"
+
+    def _load_manifest(self) -> Dict:
+        """讀取上次匯出紀錄"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return {"posts": manifest.get("posts", {}), "pages": manifest.get("pages", {})}
+        except (OSError, ValueError):
+            return {"posts": {}, "pages": {}}
+
+    def _save_manifest(self, manifest: Dict):
+        """儲存匯出紀錄"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+def main():
+    """主函數 - 匯出靜態部落格"""
+    manager = BlogManager()
+    exporter = BlogExporter(manager)
+
+    print("=== 部落格靜態匯出 ===")
+    stats = exporter.export()
+    print(f"✅ 渲染文章：{stats['posts_rendered']}")
+    print(f"✅ 寫入頁面：{stats['pages_written']}（未變更 {stats['pages_unchanged']}，移除 {stats['pages_removed']}）")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+部落格訂閱與網站地圖產生器
+以串流方式產生 RSS、Atom 與分片的 sitemap，並以 ETag 快取輸出
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from email.utils import format_datetime
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from blog_manager import BlogManager
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 單一 sitemap 檔案的網址上限（sitemaps.org 規範）
+SITEMAP_MAX_URLS = 50000
+
+def _rfc822(timestamp: Optional[str]) -> str:
+    """ISO 時間轉 RSS 使用的 RFC 822 格式"""
+    try:
+        return format_datetime(datetime.fromisoformat(timestamp))
+    except (TypeError, ValueError):
+        return ""
+
+def _rfc3339(timestamp: Optional[str]) -> str:
+    """ISO 時間轉 Atom／sitemap 使用的 RFC 3339 格式"""
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return ""
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return parsed.isoformat(timespec="seconds")
+
+class BlogFeedGenerator:
+    """RSS／Atom／sitemap 產生器"""
+
+    def __init__(self, manager: BlogManager, site_url: str, blog_path: str = "/blog",
+                 title: str = "黃金知識部落格", description: str = "每日黃金投資知識與市場分析",
+                 feed_size: int = 20, sitemap_max_urls: int = SITEMAP_MAX_URLS):
+        """
+        初始化產生器
+
+        Args:
+            manager: 部落格管理器
+            site_url: 網站網址（例如 https://example.com）
+            blog_path: 部落格路徑前綴
+            title: 訂閱標題
+            description: 訂閱描述
+            feed_size: RSS／Atom 的文章數
+            sitemap_max_urls: 每個 sitemap 分片的網址上限
+        """
+        self.manager = manager
+        self.site_url = site_url.rstrip('/')
+        self.blog_url = self.site_url + blog_path.rstrip('/')
+        self.title = title
+        self.description = description
+        self.feed_size = feed_size
+        self.sitemap_max_urls = sitemap_max_urls
+
+        self._cache: Dict[str, Tuple[str, bytes]] = {}
+        self._cache_lock = threading.Lock()
+
+    def get_rss(self, if_none_match: str = None) -> Tuple[str, Optional[Iterator[bytes]]]:
+        """
+        獲取 RSS 2.0 訂閱
+
+        Args:
+            if_none_match: 用戶端的 ETag（If-None-Match 標頭）
+
+        Returns:
+            (ETag, 內容區塊迭代器)；內容未變更時迭代器為 None（對應 HTTP 304）
+        """
+        return self._serve("rss", if_none_match, self._stream_rss)
+
+    def get_atom(self, if_none_match: str = None) -> Tuple[str, Optional[Iterator[bytes]]]:
+        """獲取 Atom 訂閱（回傳值同 get_rss）"""
+        return self._serve("atom", if_none_match, self._stream_atom)
+
+    def get_sitemap_index(self, if_none_match: str = None) -> Tuple[str, Optional[Iterator[bytes]]]:
+        """獲取 sitemap 索引檔（列出所有分片，回傳值同 get_rss）"""
+        return self._serve("sitemap_index", if_none_match, self._stream_sitemap_index)
+
+    def get_sitemap(self, shard: int, if_none_match: str = None) -> Tuple[str, Optional[Iterator[bytes]]]:
+        """
+        獲取單一 sitemap 分片
+
+        Args:
+            shard: 分片編號（從 1 開始）
+            if_none_match: 用戶端的 ETag
+
+        Returns:
+            (ETag, 內容區塊迭代器)
+        """
+        return self._serve(f"sitemap_{shard}", if_none_match, lambda: self._stream_sitemap(shard))
+
+    def sitemap_shard_count(self) -> int:
+        """sitemap 分片數"""
+        conn = sqlite3.connect(self.manager.db_path)
+        total = conn.execute("SELECT COUNT(*) FROM blog_posts WHERE status = 'published'").fetchone()[0]
+        conn.close()
+        return max(1, -(-total // self.sitemap_max_urls))
+
+    def current_etag(self, kind: str) -> str:
+        """
+        計算目前的 ETag
+
+        以最新的 updated_at（索引 MAX 查詢）加上已發布文章數（只掃描 status 索引），
+        讓刪除或下架文章（包含沒有分類的文章）也會改變 ETag。
+        """
+        conn = sqlite3.connect(self.manager.db_path)
+        latest, published = conn.execute('''
+            SELECT
+                (SELECT MAX(updated_at) FROM blog_posts WHERE status = 'published'),
+                (SELECT COUNT(*) FROM blog_posts WHERE status = 'published')
+        ''').fetchone()
+        conn.close()
+
+        key = f"{kind}:{latest}:{published}:{self.blog_url}:{self.feed_size}:{self.sitemap_max_urls}"
+        return '"' + hashlib.sha1(key.encode('utf-8')).hexdigest() + '"'
+
+    def _serve(self, kind: str, if_none_match: Optional[str], stream_factory):
+        """依 ETag 回傳 304、快取內容或新產生的串流"""
+        try:
+            etag = self.current_etag(kind)
+
+            if if_none_match == etag:
+                return etag, None
+
+            with self._cache_lock:
+                cached = self._cache.get(kind)
+            if cached and cached[0] == etag:
+                return etag, iter([cached[1]])
+
+            return etag, self._stream_and_cache(kind, etag, stream_factory())
+
+        except Exception as e:
+            logger.error(f"產生 {kind} 失敗: {e}")
+            raise
+
+    def _stream_and_cache(self, kind: str, etag: str, chunks: Iterator[str]) -> Iterator[bytes]:
+        """邊輸出邊累積，完整輸出後存入快取"""
+        parts = []
+        for chunk in chunks:
+            data = chunk.encode('utf-8')
+            parts.append(data)
+            yield data
+
+        with self._cache_lock:
+            self._cache[kind] = (etag, b"".join(parts))
+
+    def _latest_update(self) -> Optional[str]:
+        """已發布文章的最新更新時間"""
+        conn = sqlite3.connect(self.manager.db_path)
+        latest = conn.execute("SELECT MAX(updated_at) FROM blog_posts WHERE status = 'published'").fetchone()[0]
+        conn.close()
+        return latest
+
+    def _iter_rows(self, sql: str, params: tuple = ()):
+        """逐列讀取查詢結果，不一次載入整個列表"""
+        conn = sqlite3.connect(self.manager.db_path)
+        try:
+            cursor = conn.execute(sql, params)
+            for row in cursor:
+                yield row
+        finally:
+            conn.close()
+
+    def _post_url(self, article_id: str) -> str:
+        """文章網址"""
+        return f"{self.blog_url}/{quote(article_id)}"
+
+    def _stream_rss(self) -> Iterator[str]:
+        """產生 RSS 2.0 內容"""
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>\n'
+        yield f'<title>{escape(self.title)}</title>\n'
+        yield f'<link>{escape(self.blog_url)}</link>\n'
+        yield f'<description>{escape(self.description)}</description>\n'
+        yield '<language>zh-TW</language>\n'
+        yield f'<atom:link href="{escape(self.blog_url)}/rss.xml" rel="self" type="application/rss+xml"/>\n'
+
+        for article_id, title, summary, category, publish_date, created_at in self._iter_rows('''
+            SELECT id, title, summary, category, publish_date, created_at
+            FROM blog_posts WHERE status = 'published'
+            ORDER BY created_at DESC LIMIT ?
+        ''', (self.feed_size,)):
+            url = escape(self._post_url(article_id))
+            yield (
+                f'<item><title>{escape(title)}</title><link>{url}</link>'
+                f'<guid isPermaLink="true">{url}</guid>'
+                f'<description>{escape(summary or "")}</description>'
+                f'<category>{escape(category or "")}</category>'
+                f'<pubDate>{_rfc822(publish_date or created_at)}</pubDate></item>\n'
+            )
+
+        yield '</channel></rss>\n'
+
+    def _stream_atom(self) -> Iterator[str]:
+        """產生 Atom 內容"""
+        latest = self._latest_update()
+
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="zh-TW">\n'
+        yield f'<title>{escape(self.title)}</title>\n'
+        yield f'<subtitle>{escape(self.description)}</subtitle>\n'
+        yield f'<id>{escape(self.blog_url)}/</id>\n'
+        yield f'<link href="{escape(self.blog_url)}"/>\n'
+        yield f'<link rel="self" href="{escape(self.blog_url)}/atom.xml"/>\n'
+        yield f'<updated>{_rfc3339(latest)}</updated>\n'
+
+        for article_id, title, summary, author, publish_date, created_at, updated_at in self._iter_rows('''
+            SELECT id, title, summary, author, publish_date, created_at, updated_at
+            FROM blog_posts WHERE status = 'published'
+            ORDER BY created_at DESC LIMIT ?
+        ''', (self.feed_size,)):
+            url = escape(self._post_url(article_id))
+            yield (
+                f'<entry><title>{escape(title)}</title><link href="{url}"/><id>{url}</id>'
+                f'<published>{_rfc3339(publish_date or created_at)}</published>'
+                f'<updated>{_rfc3339(updated_at or created_at)}</updated>'
+                f'<author><name>{escape(author or "")}</name></author>'
+                f'<summary>{escape(summary or "")}</summary></entry>\n'
+            )
+
+        yield '</feed>\n'
+
+    def _stream_sitemap_index(self) -> Iterator[str]:
+        """產生 sitemap 索引檔"""
+        latest = self._latest_update()
+        lastmod = f'<lastmod>{_rfc3339(latest)}</lastmod>' if latest else ''
+
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        for shard in range(1, self.sitemap_shard_count() + 1):
+            yield f'<sitemap><loc>{escape(self.blog_url)}/sitemap-{shard}.xml</loc>{lastmod}</sitemap>\n'
+        yield '</sitemapindex>\n'
+
+    def _stream_sitemap(self, shard: int) -> Iterator[str]:
+        """產生單一 sitemap 分片（依建立時間排序，舊文章的分片內容保持穩定）"""
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+        for article_id, updated_at in self._iter_rows('''
+            SELECT id, updated_at FROM blog_posts
+            WHERE status = 'published'
+            ORDER BY created_at, id
+            LIMIT ? OFFSET ?
+        ''', (self.sitemap_max_urls, (shard - 1) * self.sitemap_max_urls)):
+            lastmod = f'<lastmod>{_rfc3339(updated_at)}</lastmod>' if updated_at else ''
+            yield f'<url><loc>{escape(self._post_url(article_id))}</loc>{lastmod}</url>\n'
+
+        yield '</urlset>\n'
+
+def main():
+    """主函數 - 產生訂閱與網站地圖"""
+    manager = BlogManager()
+    feeds = BlogFeedGenerator(manager, site_url="https://billygold.com")
+
+    print("=== 訂閱與網站地圖產生器 ===")
+    etag, chunks = feeds.get_rss()
+    print(f"✅ RSS（ETag {etag}）：{len(b''.join(chunks))} bytes")
+
+    _, chunks = feeds.get_rss(if_none_match=etag)
+    print(f"✅ 未變更時回傳 304：{chunks is None}")
+
+    _, chunks = feeds.get_sitemap_index()
+    print(f"✅ sitemap 分片數：{feeds.sitemap_shard_count()}")
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,29 @@ AI 半自動黃金知識部落格生成系統
 import json
 import os
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-import openai
 from pathlib import Path
 import re
 import random
+import heapq
+import threading
+
+from article_sink import ArticleSink, new_article_id
+from blog_manager import BlogManager
+from content_stream import ContentStream
+from extractive_summarizer import ExtractiveSummarizer
+from generation_metrics import ArticleRecord, CallRecord, GenerationMetrics
+from job_store import JobStore
+from keyword_extractor import KeywordExtractor
+from llm_backend import Completion, LLMBackend, OpenAIBackend
+from llm_cache import LLMResponseCache
+from rate_limiter import RateLimiter
+from topic_dedup import TopicDeduplicator
+from stage_graph import Stage, StageGraph
 
 # 設定日誌
 logging.basicConfig(level=logging.INFO)
@@ -40,15 +56,82 @@ class BlogArticle:
 class BlogGenerator:
     """AI 部落格文章生成器"""
     
-    def __init__(self, openai_api_key: str):
+    # 預設使用回應快取的階段（內容生成預設不快取，讓相同大綱仍可重寫；
+    # 取樣階段的回應只在同一篇文章重試或續跑時重用，見 _chat）
+    CACHED_STAGES = ("title", "outline", "summary", "keywords")
+    
+    def __init__(self, openai_api_key: str = None, concurrent_stages: bool = True,
+                 cache_path: Optional[str] = None, cache_ttl: float = 7 * 86400,
+                 cached_stages=CACHED_STAGES, rate_limiter: RateLimiter = None, max_retries: int = 5,
+                 stream_content: bool = False, stream_prefix_chars: int = 1500, draft_dir: str = "data/drafts",
+                 backend: LLMBackend = None, metrics: GenerationMetrics = None,
+                 local_keywords: bool = False, keyword_extractor: KeywordExtractor = None,
+                 local_summary: bool = False, summarizer: ExtractiveSummarizer = None,
+                 dedup_topics: bool = False, deduplicator: TopicDeduplicator = None,
+                 sink: ArticleSink = None, export_json: bool = None,
+                 job_store: JobStore = None, job_attempts: int = 3, manager: BlogManager = None):
         """
         初始化部落格生成器
         
         Args:
-            openai_api_key: OpenAI API 金鑰
+            openai_api_key: OpenAI API 金鑰（未指定 backend 時使用）
+            concurrent_stages: 是否並行執行彼此獨立的生成階段
+            cache_path: LLM 回應快取路徑（預設 None 表示不快取）
+            cache_ttl: 快取有效秒數
+            cached_stages: 使用快取的階段
+            rate_limiter: API 速率限制器（預設 60 RPM／60000 TPM）
+            max_retries: 遇到速率限制時的最大重試次數
+            stream_content: 是否串流生成文章內容（逐段寫入草稿，關鍵字階段提前開始）
+            stream_prefix_chars: 串流時關鍵字階段開始前需要的字數
+            draft_dir: 串流草稿目錄（None 表示不寫草稿）
+            backend: LLM 後端（預設為 OpenAIBackend；離線測試可使用 StubBackend）
+            metrics: 用量統計（預設建立新的 GenerationMetrics）
+            local_keywords: 是否以本機提取器取代關鍵字的 API 呼叫
+            keyword_extractor: 本機關鍵字提取器（local_keywords 時預設以 manager 的文章統計 IDF；
+                也作為 API 失敗時的備援）
+            local_summary: 是否以本機擷取式摘要取代摘要的 API 呼叫
+            summarizer: 本機摘要器（也作為 API 失敗時的備援）
+            dedup_topics: 是否在生成前略過與既有文章重複的主題
+            deduplicator: 主題去重索引（dedup_topics 時預設以 manager 建立）
+            sink: 文章儲存管線（生成的文章直接批次寫入資料庫）
+            export_json: 是否另存 data/blog_<id>.json（預設只在未指定 sink 時匯出）
+            job_store: 生成工作紀錄（保存各階段結果，失敗或重啟後從最後完成的階段續跑）
+            job_attempts: 每篇文章的最多嘗試次數（跨續跑累計，用完即放棄；批次中失敗的文章重新排入佇列）
+            manager: 部落格管理器（local_keywords／dedup_topics 未指定對應元件時必須提供；
+                預設使用 sink 的管理器）
         """
         self.openai_api_key = openai_api_key
-        openai.api_key = openai_api_key
+        self.concurrent_stages = concurrent_stages
+        self.response_cache = LLMResponseCache(cache_path, ttl=cache_ttl) if cache_path else None
+        self.cached_stages = set(cached_stages)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.stream_content = stream_content
+        self.stream_prefix_chars = stream_prefix_chars
+        self.draft_dir = draft_dir
+        self.backend = backend or OpenAIBackend(openai_api_key)
+        self.metrics = metrics or GenerationMetrics()
+        if manager is None and sink is not None:
+            manager = sink.manager
+        if manager is None and ((local_keywords and keyword_extractor is None)
+                                or (dedup_topics and deduplicator is None)):
+            # 不自動開啟工作目錄下的 data/blog.db，避免讀寫到非預期的資料庫
+            raise ValueError("local_keywords／dedup_topics 需要指定 manager（或 keyword_extractor／deduplicator）")
+        
+        self.local_keywords = local_keywords
+        self.keyword_extractor = keyword_extractor
+        if local_keywords and keyword_extractor is None:
+            self.keyword_extractor = KeywordExtractor(manager)
+        self.deduplicator = deduplicator
+        if dedup_topics and deduplicator is None:
+            self.deduplicator = TopicDeduplicator(manager)
+        self.local_summary = local_summary
+        self.summarizer = summarizer or ExtractiveSummarizer()
+        self.sink = sink
+        self.export_json = sink is None if export_json is None else export_json
+        self.job_store = job_store
+        self.job_attempts = job_attempts
+        self._context = threading.local()  # 目前執行緒正在生成的文章 ID
         
         # 文章分類和主題
         self.categories = {
@@ -125,6 +208,115 @@ class BlogGenerator:
         
         logger.info("部落格生成器初始化完成")
     
+    def _chat(self, stage: str, messages: List[Dict], temperature: float, max_tokens: int,
+              model: str = "gpt-3.5-turbo", parse=None, stream: ContentStream = None):
+        """
+        呼叫 Chat Completion（可快取的階段先查詢回應快取）
+        
+        temperature > 0 的取樣回應以目前文章 ID 為快取範圍，只在同一篇文章的重試或續跑時命中，
+        不同文章即使主題與分類相同也會重新生成；不在文章工作中的取樣呼叫不使用快取。
+        
+        Args:
+            stage: 生成階段名稱
+            messages: 對話訊息
+            temperature: 溫度
+            max_tokens: 最大輸出 token 數
+            model: 模型名稱
+            parse: 回應解析函數（解析失敗的回應不寫入快取）
+            stream: 內容串流（可選），回應片段到達時逐段寫入
+            
+        Returns:
+            回應文字或解析結果
+        """
+        params = {"temperature": temperature, "max_tokens": max_tokens}
+        article_id = getattr(self._context, "article_id", None)
+        sampled = temperature > 0
+        use_cache = (self.response_cache is not None and stage in self.cached_stages
+                     and (article_id is not None or not sampled))
+        cache_params = {**params, "article_id": article_id} if sampled else params
+        started = time.perf_counter()
+        call = {"retries": 0}
+        completion = None
+        ok = False
+        
+        try:
+            text = self.response_cache.get(model, messages, cache_params) if use_cache else None
+            cached = text is not None
+            if not cached:
+                completion = self._create_completion(stage, model, messages, params, stream, call)
+                text = completion.text
+            elif stream is not None:
+                stream.write(text)
+            
+            result = parse(text) if parse else text
+            if use_cache and not cached:
+                self.response_cache.put(model, messages, cache_params, text)
+            ok = True
+            return result
+        finally:
+            self._record_call(stage, model, messages, completion, time.perf_counter() - started, call["retries"], ok)
+    
+    def _record_call(self, stage: str, model: str, messages: List[Dict], completion: Optional[Completion],
+                     wall_seconds: float, retries: int, ok: bool):
+        """記錄一次呼叫的用量（後端未回報 token 數時以字數估計；快取命中不計 token）"""
+        prompt_tokens = completion_tokens = 0
+        estimated = False
+        if completion is not None:
+            prompt_tokens = completion.prompt_tokens
+            completion_tokens = completion.completion_tokens
+            if prompt_tokens is None or completion_tokens is None:
+                prompt_tokens = sum(len(message["content"]) for message in messages)
+                completion_tokens = len(completion.text)
+                estimated = True
+        
+        self.metrics.record_call(CallRecord(
+            stage=stage,
+            article_id=getattr(self._context, "article_id", None),
+            model=model,
+            wall_seconds=wall_seconds,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            retries=retries,
+            cached=ok and completion is None,
+            estimated=estimated,
+            ok=ok
+        ))
+    
+    def _create_completion(self, stage: str, model: str, messages: List[Dict], params: Dict,
+                           stream: ContentStream = None, call: Dict = None) -> Completion:
+        """在速率預算內呼叫後端，遇到 429 時退避重試（429 只會在串流開始前發生；重試次數記入 call）"""
+        # 粗估 token 數：中文約每字 1 token，加上最大輸出
+        prompt_tokens = sum(len(message["content"]) for message in messages)
+        estimated_tokens = prompt_tokens + params.get("max_tokens", 0)
+        
+        for attempt in range(self.max_retries + 1):
+            entry = self.rate_limiter.acquire(estimated_tokens)
+            try:
+                if stream is not None:
+                    chunks = self.backend.stream(model, messages, params, stage=stage)
+                else:
+                    completion = self.backend.complete(model, messages, params, stage=stage)
+            except Exception as e:
+                if not self.backend.is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self.rate_limiter.on_rate_limited(self.backend.retry_after(e))
+                if call is not None:
+                    call["retries"] += 1
+                continue
+            
+            if stream is not None:
+                parts = []
+                for piece in chunks:
+                    parts.append(piece)
+                    stream.write(piece)
+                text = "".join(parts)
+                # 串流回應不含用量，以提示詞估計加上實際輸出字數修正
+                self.rate_limiter.settle(entry, prompt_tokens + len(text))
+                return Completion(text)
+            
+            self.rate_limiter.settle(entry, completion.total_tokens)
+            return completion
+    
     def generate_article_outline(self, category: str, topic: str, market_data: Dict = None) -> Dict:
         """
         生成文章大綱
@@ -168,17 +360,17 @@ class BlogGenerator:
             if market_data:
                 prompt += f"\n\n最新市場資料：{json.dumps(market_data, ensure_ascii=False)}"
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            outline = self._chat(
+                "outline",
+                [
                     {"role": "system", "content": "你是專業的黃金投資分析師，擅長撰寫教育性的投資文章。"},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=1000,
+                parse=json.loads
             )
             
-            outline = json.loads(response.choices[0].message.content)
             logger.info(f"成功生成文章大綱：{outline.get('title', topic)}")
             return outline
             
@@ -186,7 +378,8 @@ class BlogGenerator:
             logger.error(f"生成文章大綱失敗: {e}")
             return None
     
-    def generate_article_content(self, outline: Dict, category: str, market_data: Dict = None) -> str:
+    def generate_article_content(self, outline: Dict, category: str, market_data: Dict = None,
+                                 stream: ContentStream = None) -> str:
         """
         根據大綱生成完整文章內容
         
@@ -194,6 +387,7 @@ class BlogGenerator:
             outline: 文章大綱
             category: 文章分類
             market_data: 市場資料（可選）
+            stream: 內容串流（可選），生成中的片段逐段寫入，結束時關閉
             
         Returns:
             完整文章內容
@@ -220,24 +414,52 @@ class BlogGenerator:
 請直接輸出文章內容，不需要額外的格式說明。
 """
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            content = self._chat(
+                "content",
+                [
                     {"role": "system", "content": "你是專業的黃金投資分析師，擅長撰寫教育性的投資文章。"},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.8,
-                max_tokens=3000
+                max_tokens=3000,
+                stream=stream
             )
             
-            content = response.choices[0].message.content
+            if stream is not None:
+                stream.close()
+                logger.info(f"串流生成文章內容，首段延遲 {stream.time_to_first_chunk or 0:.2f} 秒")
             logger.info(f"成功生成文章內容，長度：{len(content)} 字")
             return content
             
         except Exception as e:
+            if stream is not None:
+                stream.close(e)
             logger.error(f"生成文章內容失敗: {e}")
             return None
     
+    def stream_article_content(self, outline: Dict, category: str, market_data: Dict = None,
+                               draft_path: str = None) -> Iterator[str]:
+        """
+        串流生成文章內容（於背景執行緒呼叫 API，片段到達時立即產出）
+        
+        Args:
+            outline: 文章大綱
+            category: 文章分類
+            market_data: 市場資料（可選）
+            draft_path: 草稿檔路徑（可選）
+            
+        Returns:
+            文字片段迭代器
+        """
+        stream = ContentStream(draft_path)
+        threading.Thread(
+            target=self.generate_article_content,
+            args=(outline, category, market_data, stream),
+            name="content-stream",
+            daemon=True
+        ).start()
+        return iter(stream)
+    
     def generate_seo_optimized_title(self, topic: str, category: str) -> str:
         """
         生成 SEO 優化的標題
@@ -266,9 +488,9 @@ class BlogGenerator:
 請直接輸出標題，不需要額外說明。
 """
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            title = self._chat(
+                "title",
+                [
                     {"role": "system", "content": "你是 SEO 專家，擅長撰寫吸引人的標題。"},
                     {"role": "user", "content": prompt}
                 ],
@@ -276,12 +498,13 @@ class BlogGenerator:
                 max_tokens=100
             )
             
-            title = response.choices[0].message.content.strip()
+            title = title.strip()
             logger.info(f"生成 SEO 標題：{title}")
             return title
             
         except Exception as e:
             logger.error(f"生成 SEO 標題失敗: {e}")
+            self._mark_degraded()
             return topic
     
     def extract_keywords(self, content: str) -> List[str]:
@@ -294,6 +517,11 @@ class BlogGenerator:
         Returns:
             關鍵字列表
         """
+        if self.local_keywords:
+            keywords = self.keyword_extractor.extract(content)
+            logger.info(f"本機提取關鍵字：{keywords}")
+            return keywords
+        
         try:
             prompt = f"""
 請從以下黃金投資文章中提取 5-8 個重要的 SEO 關鍵字：
@@ -310,9 +538,9 @@ class BlogGenerator:
 請直接輸出關鍵字，用逗號分隔。
 """
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            reply = self._chat(
+                "keywords",
+                [
                     {"role": "system", "content": "你是 SEO 專家，擅長關鍵字分析。"},
                     {"role": "user", "content": prompt}
                 ],
@@ -320,12 +548,15 @@ class BlogGenerator:
                 max_tokens=200
             )
             
-            keywords = [kw.strip() for kw in response.choices[0].message.content.split(',')]
+            keywords = [kw.strip() for kw in reply.split(',')]
             logger.info(f"提取關鍵字：{keywords}")
             return keywords
             
         except Exception as e:
             logger.error(f"提取關鍵字失敗: {e}")
+            self._mark_degraded()
+            if self.keyword_extractor is not None:
+                return self.keyword_extractor.extract(content)
             return ["黃金投資", "投資策略"]
     
     def generate_article_summary(self, content: str) -> str:
@@ -338,6 +569,11 @@ class BlogGenerator:
         Returns:
             文章摘要
         """
+        if self.local_summary:
+            summary = self.summarizer.summarize(content)
+            logger.info(f"本機生成文章摘要，長度：{len(summary)} 字")
+            return summary
+        
         try:
             prompt = f"""
 請為以下黃金投資文章生成一個簡潔的摘要：
@@ -354,9 +590,9 @@ class BlogGenerator:
 請直接輸出摘要。
 """
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
+            summary = self._chat(
+                "summary",
+                [
                     {"role": "system", "content": "你是內容編輯，擅長撰寫文章摘要。"},
                     {"role": "user", "content": prompt}
                 ],
@@ -364,52 +600,166 @@ class BlogGenerator:
                 max_tokens=200
             )
             
-            summary = response.choices[0].message.content.strip()
+            summary = summary.strip()
             logger.info(f"生成文章摘要，長度：{len(summary)} 字")
             return summary
             
         except Exception as e:
             logger.error(f"生成文章摘要失敗: {e}")
-            return content[:150] + "..."
+            self._mark_degraded()
+            return self.summarizer.summarize(content)
     
-    def create_blog_article(self, category: str, topic: str, market_data: Dict = None) -> Optional[BlogArticle]:
+    def build_article_stages(self, category: str, topic: str, market_data: Dict = None,
+                             stream: ContentStream = None) -> StageGraph:
+        """
+        建立文章生成的階段相依圖
+        
+        標題與大綱互不相依，摘要與關鍵字都只依賴內容，
+        並行時循序輪數由五次降為三次（大綱 → 內容 → 摘要／關鍵字）。
+        提供內容串流時，關鍵字階段只等待前 stream_prefix_chars 字即開始，與內容生成重疊。
+        
+        Args:
+            category: 文章分類
+            topic: 文章主題
+            market_data: 市場資料（可選）
+            stream: 內容串流（可選）
+            
+        Returns:
+            StageGraph 物件
+        """
+        if stream is not None:
+            return StageGraph([
+                Stage("title", lambda: self.generate_seo_optimized_title(topic, category)),
+                Stage("outline", lambda: self.generate_article_outline(category, topic, market_data)),
+                Stage("content", lambda outline: self.generate_article_content(outline, category, market_data, stream),
+                      depends_on=("outline",)),
+                Stage("summary", lambda content: self.generate_article_summary(content), depends_on=("content",)),
+                # 本機提取不需呼叫 API，直接使用完整內容
+                Stage("keywords", lambda content: self.extract_keywords(content), depends_on=("content",))
+                if self.local_keywords else
+                Stage("keywords", lambda outline: self.extract_keywords(stream.wait_for(self.stream_prefix_chars)),
+                      depends_on=("outline",)),
+            ])
+        
+        return StageGraph([
+            Stage("title", lambda: self.generate_seo_optimized_title(topic, category)),
+            Stage("outline", lambda: self.generate_article_outline(category, topic, market_data)),
+            Stage("content", lambda outline: self.generate_article_content(outline, category, market_data),
+                  depends_on=("outline",)),
+            Stage("summary", lambda content: self.generate_article_summary(content), depends_on=("content",)),
+            Stage("keywords", lambda content: self.extract_keywords(content), depends_on=("content",)),
+        ])
+    
+    def _bind_article(self, article_id: str, func):
+        """讓階段函數執行期間的 LLM 呼叫記錄到指定文章（也是取樣回應的快取範圍）"""
+        def bound(**kwargs):
+            previous = getattr(self._context, "article_id", None)
+            self._context.article_id = article_id
+            try:
+                return func(**kwargs)
+            finally:
+                self._context.article_id = previous
+        return bound
+    
+    def _mark_degraded(self):
+        """標記目前執行緒的階段改用備援結果（API 失敗），檢查點不視為已完成"""
+        self._context.degraded = True
+    
+    def _checkpoint_stage(self, job_id: str, name: str, func):
+        """階段成功後將結果寫入工作紀錄（備援結果標記為 degraded，續跑時重新執行）"""
+        def checkpointed(**kwargs):
+            self._context.degraded = False
+            value = func(**kwargs)
+            if value is not None:
+                self.job_store.checkpoint(job_id, name, value, degraded=self._context.degraded)
+            return value
+        return checkpointed
+    
+    def _fail_job(self, job_id: str, error: str):
+        """記錄工作失敗；嘗試次數（跨續跑累計）達到 job_attempts 時放棄，不再續跑"""
+        job = self.job_store.get_job(job_id)
+        if job is not None and job["attempts"] >= self.job_attempts:
+            logger.error(f"工作 {job_id} 已嘗試 {job['attempts']} 次，放棄生成")
+            self.job_store.abandon(job_id, error)
+        else:
+            self.job_store.fail(job_id, error)
+    
+    def create_blog_article(self, category: str, topic: str, market_data: Dict = None,
+                            job_id: str = None) -> Optional[BlogArticle]:
         """
         創建完整的部落格文章
         
+        啟用工作紀錄時，每個完成的階段都會保存；以同一個 job_id 再次呼叫會略過已完成的階段
+        （例如摘要失敗時不必重新生成大綱與內容），已完成的工作直接回傳保存的文章。
+        
         Args:
             category: 文章分類
             topic: 文章主題
             market_data: 市場資料（可選）
+            job_id: 工作 ID（即文章 ID；可選，預設建立新工作）
             
         Returns:
             BlogArticle 物件或 None
         """
+        article_id = job_id or new_article_id()
+        
         try:
-            # 1. 生成 SEO 標題
-            title = self.generate_seo_optimized_title(topic, category)
+            completed = {}
+            if self.job_store is not None:
+                job = self.job_store.get_job(article_id)
+                if job is None:
+                    self.job_store.create_job(article_id, category, topic, market_data)
+                elif job["status"] == "done" and job["article"]:
+                    return BlogArticle(**job["article"])
+                completed = self.job_store.checkpoints(article_id)
+                self.job_store.start(article_id, topic)
+                if completed:
+                    logger.info(f"從檢查點續跑 {article_id}：已完成 {', '.join(completed)}")
             
-            # 2. 生成文章大綱
-            outline = self.generate_article_outline(category, topic, market_data)
-            if not outline:
-                return None
+            stream = None
+            if self.stream_content:
+                draft_path = os.path.join(self.draft_dir, f"{article_id}.md") if self.draft_dir else None
+                stream = ContentStream(draft_path)
+                if "content" in completed:
+                    # 內容已從檢查點恢復，串流直接提供完整內容給等待中的關鍵字階段
+                    stream.write(completed["content"])
+                    stream.close()
             
-            # 3. 生成完整內容
-            content = self.generate_article_content(outline, category, market_data)
-            if not content:
-                return None
+            # 1～5. 標題、大綱、內容、摘要、關鍵字（依相依關係執行）
+            graph = self.build_article_stages(category, topic, market_data, stream)
+            for name, stage in graph.stages.items():
+                if self.job_store is not None:
+                    stage.func = self._checkpoint_stage(article_id, name, stage.func)
+                stage.func = self._bind_article(article_id, stage.func)
             
-            # 4. 生成摘要
-            summary = self.generate_article_summary(content)
+            run = graph.run(max_workers=None if self.concurrent_stages else 1, completed=completed)
+            if stream is not None:
+                stream.close()  # 大綱失敗時內容階段不會執行，仍需關閉草稿檔
+            self.metrics.record_article(ArticleRecord(
+                article_id=article_id,
+                category=category,
+                topic=topic,
+                wall_seconds=run.elapsed,
+                ok=run.ok,
+                stage_seconds=run.durations
+            ))
+            if not run.ok:
+                logger.error(f"文章生成階段失敗：{', '.join(run.failed + run.skipped)}")
+                if self.job_store is not None:
+                    self._fail_job(article_id, f"階段失敗：{', '.join(run.failed + run.skipped)}")
+                return None
             
-            # 5. 提取關鍵字
-            keywords = self.extract_keywords(content)
+            title = run.results["title"]
+            content = run.results["content"]
+            summary = run.results["summary"]
+            keywords = run.results["keywords"]
             
             # 6. 計算閱讀時間（假設每分鐘 300 字）
             read_time = max(3, len(content) // 300)
             
             # 7. 創建文章物件
             article = BlogArticle(
-                id=f"blog_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                id=article_id,
                 title=title,
                 content=content,
                 summary=summary,
@@ -421,16 +771,50 @@ class BlogGenerator:
                 updated_at=datetime.now().isoformat()
             )
             
+            if self.job_store is not None:
+                self.job_store.complete(article_id, asdict(article))
+            
             logger.info(f"成功創建部落格文章：{article.title}")
             return article
             
         except Exception as e:
             logger.error(f"創建部落格文章失敗: {e}")
+            if self.job_store is not None:
+                self._fail_job(article_id, str(e))
+            return None
+    
+    def resume_job(self, job_id: str) -> Optional[BlogArticle]:
+        """
+        從最後完成的階段續跑一篇文章
+        
+        Args:
+            job_id: 工作 ID
+            
+        Returns:
+            BlogArticle 物件或 None
+        """
+        job = self.job_store.get_job(job_id) if self.job_store is not None else None
+        if job is None:
+            logger.error(f"找不到生成工作：{job_id}")
             return None
+        return self.create_blog_article(job["category"], job["topic"], job["market_data"], job_id=job_id)
     
     def save_article(self, article: BlogArticle, filename: str = None):
         """
-        儲存文章到檔案
+        儲存文章（交給儲存管線批次寫入資料庫，並視設定匯出 JSON）
+        
+        Args:
+            article: 文章物件
+            filename: JSON 檔案名稱（可選，指定時一定匯出）
+        """
+        if self.sink is not None:
+            self.sink.add(article)
+        if self.export_json or filename:
+            self.export_article(article, filename)
+    
+    def export_article(self, article: BlogArticle, filename: str = None):
+        """
+        匯出文章為 JSON 檔案
         
         Args:
             article: 文章物件
@@ -452,9 +836,30 @@ class BlogGenerator:
         except Exception as e:
             logger.error(f"儲存文章失敗: {e}")
     
+    def pick_topic(self, category: str, exclude=()) -> Optional[str]:
+        """
+        隨機選擇分類中的主題（啟用去重時略過與既有文章過於相似的主題）
+        
+        Args:
+            category: 文章分類
+            exclude: 不列入考慮的主題
+            
+        Returns:
+            主題；沒有可用主題時回傳 None
+        """
+        candidates = [topic for topic in self.categories[category] if topic not in exclude]
+        random.shuffle(candidates)
+        
+        for topic in candidates:
+            match = self.deduplicator.find_duplicate(topic) if self.deduplicator else None
+            if match is None:
+                return topic
+            logger.info(f"略過重複主題：{topic}（與「{match['title']}」涵蓋率 {match['score']:.2f}）")
+        return None
+    
     def generate_daily_article(self, market_data: Dict = None) -> Optional[BlogArticle]:
         """
-        生成每日文章（隨機選擇主題）
+        生成每日文章（隨機選擇主題；啟用工作紀錄時先續跑先前未完成的單篇文章）
         
         Args:
             market_data: 市場資料（可選）
@@ -463,18 +868,41 @@ class BlogGenerator:
             BlogArticle 物件或 None
         """
         try:
-            # 隨機選擇分類和主題
-            category = random.choice(list(self.categories.keys()))
-            topic = random.choice(self.categories[category])
+            job = None
+            if self.job_store is not None:
+                job = next((
+                    job for job in self.job_store.unfinished_jobs()
+                    if job["batch_id"] is None and job["attempts"] < self.job_attempts
+                ), None)
             
-            logger.info(f"開始生成每日文章：{category} - {topic}")
-            
-            # 創建文章
-            article = self.create_blog_article(category, topic, market_data)
+            if job is not None:
+                logger.info(f"續跑未完成的每日文章：{job['category']} - {job['topic']}")
+                article = self.resume_job(job["id"])
+            else:
+                # 隨機選擇分類和主題（略過與既有文章重複的主題）
+                for category in random.sample(list(self.categories), len(self.categories)):
+                    topic = self.pick_topic(category)
+                    if topic:
+                        break
+                else:
+                    logger.warning("所有主題都與既有文章重複，略過本次生成")
+                    return None
+                
+                logger.info(f"開始生成每日文章：{category} - {topic}")
+                
+                # 創建文章
+                article = self.create_blog_article(category, topic, market_data)
             
             if article:
+                if self.deduplicator:
+                    self.deduplicator.remember(article.id, article.title, article.summary)
                 # 儲存文章
                 self.save_article(article)
+                if self.sink is not None:
+                    self.sink.flush()
+                # 仍在緩衝區（寫入失敗待重試）的文章不標記為已交付，續跑時重新儲存
+                if self.job_store is not None and (self.sink is None or article.id not in self.sink.pending_ids()):
+                    self.job_store.mark_saved([article.id])
                 logger.info(f"每日文章生成完成：{article.title}")
             
             return article
@@ -483,6 +911,168 @@ class BlogGenerator:
             logger.error(f"生成每日文章失敗: {e}")
             return None
 
+    def generate_batch(self, count: int, market_data: Dict = None, weights: Dict[str, float] = None,
+                       max_concurrency: int = 4, save: bool = True, batch_id: str = None) -> List[BlogArticle]:
+        """
+        批次生成文章
+        
+        主題依分類權重加權輪流排入優先佇列（權重 2 的分類出題數約為權重 1 的兩倍，
+        權重 0 表示不出題），主題在輪到時才選定，同一分類的主題不重複直到用完
+        （啟用去重時略過與既有文章或本批次文章重複的主題）。並行數受 max_concurrency 限制，
+        實際 API 呼叫速度由速率限制器依 RPM／TPM 預算調節。
+        
+        啟用工作紀錄時，整批的出題計畫在開始時寫入工作紀錄，失敗的文章從最後完成的階段
+        重新排入佇列（最多 job_attempts 次，跨續跑累計，用完即放棄）；程式中斷後以同一個
+        batch_id 呼叫即可續跑，已完成的文章不會重新生成（count 與 weights 以原計畫為準）。
+        
+        Args:
+            count: 文章數
+            market_data: 市場資料（可選）
+            weights: 分類權重（預設皆為 1）
+            max_concurrency: 同時生成的文章數
+            save: 是否儲存文章
+            batch_id: 批次 ID（啟用工作紀錄時使用；已存在時續跑該批次）
+            
+        Returns:
+            成功生成的 BlogArticle 列表
+        """
+        weights = {category: (weights or {}).get(category, 1.0) for category in self.categories}
+        categories = [category for category, weight in weights.items() if weight > 0]
+        if not categories:
+            return []
+        
+        queue = []
+        issued = {category: 0 for category in categories}
+        used = {category: set() for category in self.categories}
+        jobs = {}  # 佇列序號 -> 工作
+        articles = []
+        
+        existing = self.job_store.batch_jobs(batch_id) if self.job_store is not None and batch_id else []
+        if existing:
+            # 續跑：已完成的文章直接取回，其餘依原本順序重新排入佇列
+            count = len(existing)
+            for job in existing:
+                if job["topic"]:
+                    used[job["category"]].add(job["topic"])
+                if job["status"] == "done":
+                    article = BlogArticle(**job["article"])
+                    articles.append(article)
+                    if save and not job["saved"]:
+                        self.save_article(article)
+                elif job["status"] == "abandoned":
+                    continue
+                elif job["attempts"] >= self.job_attempts:
+                    # 嘗試次數跨續跑累計（含中斷的執行），用完即放棄
+                    self.job_store.abandon(job["id"], job["error"] or "達到最多嘗試次數")
+                else:
+                    jobs[job["seq"]] = job
+                    heapq.heappush(queue, (job["seq"], job["seq"], job["category"]))
+            logger.info(f"續跑批次 {batch_id}：{len(articles)}/{count} 篇已完成")
+        else:
+            for sequence in range(count):
+                # 加權公平排程：下一篇的虛擬完成時間最早的分類先出題
+                category = min(categories, key=lambda c: (issued[c] + 1) / weights[c])
+                issued[category] += 1
+                heapq.heappush(queue, (issued[category] / weights[category], sequence, category))
+            
+            if self.job_store is not None:
+                batch_id = batch_id or f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{random.getrandbits(32):08x}"
+                plan = sorted(queue, key=lambda entry: entry[1])
+                self.job_store.create_jobs([
+                    {"id": new_article_id(), "category": category, "market_data": market_data}
+                    for _, _, category in plan
+                ], batch_id)
+                jobs = {job["seq"]: job for job in self.job_store.batch_jobs(batch_id)}
+                logger.info(f"批次 {batch_id}：共 {count} 篇（中斷後以此 batch_id 續跑）")
+        
+        lock = threading.Lock()
+        
+        def worker():
+            while True:
+                with lock:
+                    if not queue:
+                        return
+                    vtime, sequence, category = heapq.heappop(queue)
+                    job = jobs.get(sequence)
+                    
+                    if job and job["topic"]:
+                        topic = job["topic"]
+                    else:
+                        # 主題在出題時才選定，才能排除本批次已生成或生成中的相似主題；
+                        # 未去重時主題用完可重複
+                        exclude = used[category] if len(used[category]) < len(self.categories[category]) else set()
+                        topic = self.pick_topic(category, exclude)
+                        if topic is None:
+                            logger.warning(f"分類 {category} 沒有可生成的主題，略過")
+                            if job:
+                                # 沒有主題的工作無法執行，放棄以免批次永遠未完成
+                                self.job_store.abandon(job["id"], f"分類 {category} 沒有可生成的主題")
+                            continue
+                        used[category].add(topic)
+                        if job:
+                            job["topic"] = topic
+                    reservation = f"batch_topic_{sequence}"
+                    if self.deduplicator:
+                        self.deduplicator.remember(reservation, topic)
+                
+                if job:
+                    job["attempts"] += 1
+                    article = self.create_blog_article(category, topic, job["market_data"], job_id=job["id"])
+                else:
+                    article = self.create_blog_article(category, topic, market_data)
+                if self.deduplicator:
+                    self.deduplicator.forget(reservation)
+                    if article:
+                        self.deduplicator.remember(article.id, article.title, article.summary)
+                if article:
+                    if save:
+                        self.save_article(article)
+                    with lock:
+                        articles.append(article)
+                elif job and job["attempts"] < self.job_attempts:
+                    # 已完成的階段保存在工作紀錄中，重試只執行失敗的階段
+                    logger.info(f"重新排入失敗的文章：{topic}（第 {job['attempts']} 次失敗）")
+                    with lock:
+                        heapq.heappush(queue, (vtime, sequence, category))
+        
+        start = datetime.now()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(max_concurrency)]:
+                future.result()
+        if save and self.sink is not None:
+            self.sink.flush()
+        if self.job_store is not None:
+            unsaved = self.sink.pending_ids() if save and self.sink is not None else set()
+            self.job_store.mark_saved([article.id for article in articles if article.id not in unsaved])
+        
+        elapsed = (datetime.now() - start).total_seconds()
+        logger.info(
+            f"批次生成完成：{len(articles)}/{count} 篇，耗時 {elapsed:.1f} 秒，"
+            f"速率限制 {self.rate_limiter.throttled} 次"
+        )
+        return articles
+    
+    def resume_batches(self, max_concurrency: int = 4, save: bool = True) -> List[BlogArticle]:
+        """
+        續跑工作紀錄中所有未完成的批次（程式重啟後呼叫）
+        
+        Args:
+            max_concurrency: 同時生成的文章數
+            save: 是否儲存文章
+            
+        Returns:
+            各批次成功生成的 BlogArticle 列表
+        """
+        if self.job_store is None:
+            return []
+        
+        articles = []
+        for batch in self.job_store.unfinished_batches():
+            articles.extend(self.generate_batch(
+                batch["jobs"], max_concurrency=max_concurrency, save=save, batch_id=batch["batch_id"]
+            ))
+        return articles
+
 def main():
     """主函數 - 測試部落格生成器"""
     # 請替換為您的 OpenAI API Key
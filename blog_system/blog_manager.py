@@ -8,16 +8,63 @@ import json
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Callable
+from dataclasses import dataclass, asdict, fields
 import sqlite3
 from pathlib import Path
 import re
+import threading
+
+from blog_renderer import RENDERER_VERSION, RenderedContent, render_markdown
+from content_codec import ContentCodec, train_dictionary
+from sql_tracing import QueryTracer, TracedConnection
 
 # 設定日誌
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 分類／標籤統計的增量維護 SQL（由觸發器套用於 NEW 或 OLD 列）
+_STATS_INCREMENT_SQL = """
+    INSERT INTO categories (name, count, created_at)
+    SELECT {row}.category, 1, strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    WHERE {row}.category IS NOT NULL
+    ON CONFLICT(name) DO UPDATE SET count = count + 1;
+
+    INSERT INTO category_stats (name, status, count)
+    SELECT {row}.category, COALESCE({row}.status, 'draft'), 1
+    WHERE {row}.category IS NOT NULL
+    ON CONFLICT(name, status) DO UPDATE SET count = count + 1;
+
+    INSERT INTO tags (name, count, created_at)
+    SELECT DISTINCT value, 1, strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    FROM json_each(CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END)
+    WHERE true
+    ON CONFLICT(name) DO UPDATE SET count = count + 1;
+
+    INSERT INTO tag_stats (name, status, count)
+    SELECT DISTINCT value, COALESCE({row}.status, 'draft'), 1
+    FROM json_each(CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END)
+    WHERE true
+    ON CONFLICT(name, status) DO UPDATE SET count = count + 1;
+"""
+
+_STATS_DECREMENT_SQL = """
+    UPDATE categories SET count = count - 1 WHERE name = {row}.category;
+
+    UPDATE category_stats SET count = count - 1
+    WHERE name = {row}.category AND status = COALESCE({row}.status, 'draft');
+    DELETE FROM category_stats WHERE name = {row}.category AND count <= 0;
+
+    UPDATE tags SET count = count - 1
+    WHERE name IN (SELECT value FROM json_each(CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END));
+    DELETE FROM tags WHERE count <= 0;
+
+    UPDATE tag_stats SET count = count - 1
+    WHERE status = COALESCE({row}.status, 'draft')
+    AND name IN (SELECT value FROM json_each(CASE WHEN json_valid({row}.tags) THEN {row}.tags ELSE '[]' END));
+    DELETE FROM tag_stats WHERE count <= 0;
+"""
+
 @dataclass
 class BlogPost:
     """部落格文章資料結構"""
@@ -37,29 +84,568 @@ class BlogPost:
     likes: int = 0
     seo_keywords: List[str] = None
     featured_image: str = None
+    scheduled_at: Optional[str] = None  # 排程發布時間
+
+class _StoredBlogPost(BlogPost):
+    """
+    自資料庫讀出的文章
+    
+    壓縮內容保留原始 BLOB，第一次存取 content 時才解壓；
+    列表與搜尋結果多半只用到標題與摘要，不必為每一列解壓。
+    """
+    
+    def __init__(self, *args, decode: Callable = None, **kwargs):
+        self._decode = decode
+        super().__init__(*args, **kwargs)
+    
+    @property
+    def content(self) -> Optional[str]:
+        value = self._content
+        if isinstance(value, bytes):
+            value = self._content = self._decode(value)
+        return value
+    
+    @content.setter
+    def content(self, value):
+        self._content = value
+    
+    def __eq__(self, other):
+        # 與一般 BlogPost 比較欄位值（dataclass 預設要求類別相同）
+        if not isinstance(other, BlogPost):
+            return NotImplemented
+        return all(getattr(self, field.name) == getattr(other, field.name) for field in fields(BlogPost))
+    
+    def __reduce__(self):
+        # 序列化（如跨程序傳遞）時先解壓，還原為一般 BlogPost
+        return (BlogPost, tuple(getattr(self, field.name) for field in fields(BlogPost)))
+
+# 以整批文章（暫存表）調整分類／標籤統計，用於不經觸發器的冷熱分區搬移
+_STATS_DELTA_SQL = [
+    """
+    INSERT INTO categories (name, count, created_at)
+    SELECT category, {sign}COUNT(*), strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    FROM {source} WHERE category IS NOT NULL GROUP BY category
+    ON CONFLICT(name) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO category_stats (name, status, count)
+    SELECT category, COALESCE(status, 'draft'), {sign}COUNT(*)
+    FROM {source} WHERE category IS NOT NULL GROUP BY category, COALESCE(status, 'draft')
+    ON CONFLICT(name, status) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO tags (name, count, created_at)
+    SELECT j.value, {sign}COUNT(DISTINCT p.id), strftime('%Y-%m-%dT%H:%M:%S', 'now', 'localtime')
+    FROM {source} p, json_each(CASE WHEN json_valid(p.tags) THEN p.tags ELSE '[]' END) j
+    GROUP BY j.value
+    ON CONFLICT(name) DO UPDATE SET count = count + excluded.count
+    """,
+    """
+    INSERT INTO tag_stats (name, status, count)
+    SELECT j.value, COALESCE(p.status, 'draft'), {sign}COUNT(DISTINCT p.id)
+    FROM {source} p, json_each(CASE WHEN json_valid(p.tags) THEN p.tags ELSE '[]' END) j
+    GROUP BY j.value, COALESCE(p.status, 'draft')
+    ON CONFLICT(name, status) DO UPDATE SET count = count + excluded.count
+    """,
+    "DELETE FROM category_stats WHERE count <= 0",
+    "DELETE FROM tags WHERE count <= 0",
+    "DELETE FROM tag_stats WHERE count <= 0",
+]
+
+def _local_naive(value: datetime) -> datetime:
+    """帶時區的時間換算為本地時間並去除時區（資料庫中的時間一律為本地時間字串，以字串比較）"""
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+class _SnapshotConnection(TracedConnection):
+    """記憶體快照連線（由 BlogManager 共用，讀取後不關閉）"""
 
 class BlogManager:
     """部落格管理系統"""
     
-    def __init__(self, db_path: str = "data/blog.db"):
+    def __init__(self, db_path: str = "data/blog.db", snapshot: bool = False,
+                 snapshot_interval: float = 5.0, archive_path: str = None,
+                 compress_content: bool = False):
         """
         初始化部落格管理器
         
         Args:
             db_path: 資料庫檔案路徑
+            snapshot: 是否啟用記憶體讀取快照（讀取改由記憶體副本提供）
+            snapshot_interval: 快照刷新間隔（秒），資料庫有寫入時（含其他連線或程序）才刷新；
+                0 表示每次經由本管理器寫入後立即刷新（不定時檢查外部寫入；瀏覽與按讚計數不觸發刷新）
+            archive_path: 封存文章冷資料庫路徑（可選，啟用後可將封存文章移出主資料表）
+            compress_content: 是否壓縮新寫入的文章內容
         """
         self.db_path = db_path
+        self.archive_path = archive_path
+        self._archive_columns = None
+        self.change_listeners = []
+        self.engagement_listeners = []
+        self.tracer = None
+        self.snapshot_interval = snapshot_interval
+        self._snapshot = None
+        self._snapshot_dirty = False
+        self._snapshot_watch = None
+        self._snapshot_version = None
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_stop = threading.Event()
+        self._snapshot_thread = None
+        self.codec = ContentCodec()
+        self._compress_content = False
+        
         self.init_database()
+        self._load_content_codec()
+        if archive_path:
+            self.init_archive()
+        if compress_content:
+            self.enable_compression()
         self.initialize_default_articles()
+        
+        if snapshot:
+            self.enable_snapshot()
+        
         logger.info("部落格管理器初始化完成")
     
+    def enable_tracing(self, tracer: QueryTracer = None, slow_query_ms: float = 50.0) -> QueryTracer:
+        """
+        啟用 SQL 追蹤
+        
+        之後開啟的連線會量測每個敘述的執行時間並依正規化 SQL 彙整，
+        超過門檻的查詢連同 EXPLAIN QUERY PLAN 寫入日誌，並統計每秒開啟的連線數。
+        
+        Args:
+            tracer: 既有的追蹤器（可選，多個管理器可共用）
+            slow_query_ms: 慢查詢門檻（毫秒）
+            
+        Returns:
+            QueryTracer 物件
+        """
+        self.tracer = tracer or QueryTracer(slow_query_ms=slow_query_ms)
+        if self._snapshot is not None:
+            self.tracer.attach(self._snapshot)
+        logger.info("SQL 追蹤已啟用")
+        return self.tracer
+    
+    def disable_tracing(self):
+        """停用 SQL 追蹤"""
+        if self._snapshot is not None:
+            self._snapshot.tracer = None
+            self._snapshot.set_trace_callback(None)
+        self.tracer = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """開啟磁碟資料庫連線（啟用追蹤時掛上追蹤器；冷資料庫於需要時才以 _use_archive 掛載）"""
+        if self.tracer is None:
+            conn = sqlite3.connect(self.db_path)
+        else:
+            conn = sqlite3.connect(self.db_path, factory=TracedConnection)
+            self.tracer.attach(conn)
+        
+        conn.create_function("blog_content", 1, self.decode_content, deterministic=True)
+        return conn
+    
+    def enable_compression(self, retrain: bool = False, sample_size: int = 500, level: int = 9) -> int:
+        """
+        啟用文章內容壓縮
+        
+        之後寫入的內容以 zlib 搭配預設字典壓縮後存成 BLOB，讀取時才解壓；
+        字典從既有文章抽樣訓練並存入 content_dictionaries，舊字典保留供解壓舊資料。
+        
+        Args:
+            retrain: 即使已有字典也重新訓練
+            sample_size: 訓練字典的文章抽樣數
+            level: zlib 壓縮等級
+            
+        Returns:
+            使用中的字典編號
+        """
+        try:
+            if retrain or not self.codec.dictionaries:
+                conn = self._connect()
+                cursor = conn.cursor()
+                
+                cursor.execute('SELECT content FROM blog_posts ORDER BY created_at DESC LIMIT ?', (sample_size,))
+                dictionary = train_dictionary(self.decode_content(row[0]) for row in cursor.fetchall())
+                cursor.execute(
+                    'INSERT INTO content_dictionaries (dictionary, created_at) VALUES (?, ?)',
+                    (dictionary, datetime.now().isoformat())
+                )
+                conn.commit()
+                conn.close()
+                
+                self._load_content_codec()
+                logger.info(f"內容壓縮字典訓練完成：{len(dictionary)} bytes")
+            
+            self.codec.level = level
+            self._compress_content = True
+            return self.codec.dictionary_id
+            
+        except Exception as e:
+            logger.error(f"啟用內容壓縮失敗: {e}")
+            return 0
+    
+    def disable_compression(self):
+        """停止壓縮新寫入的內容（已壓縮的內容仍可正常讀取）"""
+        self._compress_content = False
+    
+    def recode_content(self, compress: bool = True, batch_size: int = 500) -> int:
+        """
+        以目前設定重新編碼既有文章內容
+        
+        compress=True 時壓縮尚未壓縮（或使用舊字典）的文章，False 時全部解壓回 TEXT
+        （例如需要讓直接讀取資料表的外部程式讀到原文）。updated_at 不變，渲染快取仍然有效。
+        
+        Args:
+            compress: 壓縮或解壓
+            batch_size: 每個交易處理的文章數
+            
+        Returns:
+            重新編碼的文章數
+        """
+        if compress and not self.codec.dictionaries:
+            self.enable_compression()
+        
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            total = 0
+            last_id = ""
+            
+            while True:
+                cursor.execute(
+                    'SELECT id, content FROM blog_posts WHERE id > ? ORDER BY id LIMIT ?',
+                    (last_id, batch_size)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                
+                updates = []
+                for article_id, value in rows:
+                    content = self.decode_content(value)
+                    encoded = self.codec.encode(content) if compress else content
+                    if encoded != value:
+                        updates.append((encoded, article_id))
+                
+                cursor.executemany('UPDATE blog_posts SET content = ? WHERE id = ?', updates)
+                conn.commit()
+                total += len(updates)
+            
+            conn.close()
+            
+            if total:
+                self._mark_snapshot_dirty()
+            logger.info(f"已重新編碼 {total} 篇文章內容")
+            return total
+            
+        except Exception as e:
+            logger.error(f"重新編碼文章內容失敗: {e}")
+            return 0
+    
+    def decode_content(self, value) -> Optional[str]:
+        """將資料庫中的內容（TEXT 或壓縮 BLOB）還原為原文"""
+        try:
+            return self.codec.decode(value)
+        except KeyError:
+            # 其他行程新訓練的字典
+            self._load_content_codec()
+            return self.codec.decode(value)
+    
+    def _encode_content(self, content: Optional[str]):
+        """依壓縮設定編碼要寫入的內容"""
+        return self.codec.encode(content) if self._compress_content else content
+    
+    def _load_content_codec(self):
+        """載入所有壓縮字典（最新的字典用於壓縮）"""
+        try:
+            conn = self._connect()
+            dictionaries = dict(conn.execute('SELECT id, dictionary FROM content_dictionaries').fetchall())
+            conn.close()
+            
+            self.codec.dictionaries = dictionaries
+            self.codec.dictionary_id = max(dictionaries, default=0)
+            
+        except Exception as e:
+            logger.error(f"載入壓縮字典失敗: {e}")
+    
+    def init_archive(self):
+        """
+        初始化封存冷資料庫
+        
+        冷資料庫以 archive 名稱掛載，blog_posts 結構與主資料表相同；
+        另建立暫存檢視 all_blog_posts 合併冷熱兩邊，供跨分區讀取。
+        """
+        try:
+            os.makedirs(os.path.dirname(self.archive_path) or ".", exist_ok=True)
+            
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+            cursor.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = 'blog_posts'")
+            create_sql = cursor.fetchone()[0]
+            cursor.execute(create_sql.replace("CREATE TABLE blog_posts", "CREATE TABLE IF NOT EXISTS archive.blog_posts", 1))
+            
+            # 主資料表後來新增的欄位同步補到冷資料表
+            cursor.execute('PRAGMA main.table_info(blog_posts)')
+            main_columns = [(row[1], row[2], row[4]) for row in cursor.fetchall()]
+            cursor.execute('PRAGMA archive.table_info(blog_posts)')
+            archive_columns = {row[1] for row in cursor.fetchall()}
+            for name, column_type, default in main_columns:
+                if name not in archive_columns:
+                    default_clause = f" DEFAULT {default}" if default is not None else ""
+                    cursor.execute(f'ALTER TABLE archive.blog_posts ADD COLUMN {name} {column_type}{default_clause}')
+            
+            cursor.execute('CREATE INDEX IF NOT EXISTS archive.idx_archive_posts_created ON blog_posts(created_at)')
+            
+            conn.commit()
+            conn.close()
+            
+            self._archive_columns = ", ".join(name for name, _, _ in main_columns)
+            logger.info(f"封存冷資料庫初始化完成：{self.archive_path}")
+            
+        except Exception as e:
+            logger.error(f"封存冷資料庫初始化失敗: {e}")
+    
+    def partition_archived(self, vacuum: bool = False) -> int:
+        """
+        將 status='archived' 的文章移至冷資料庫
+        
+        搬移在單一交易中完成；主資料表的刪除觸發器會扣除統計，
+        再以同一批文章補回，分類與標籤統計維持不變。
+        
+        Args:
+            vacuum: 搬移後是否 VACUUM 主資料庫以回收空間
+            
+        Returns:
+            搬移的文章數
+        """
+        if not self._archive_columns:
+            logger.error("尚未設定封存冷資料庫")
+            return 0
+        
+        try:
+            conn = self._connect()
+            self._use_archive(conn)
+            cursor = conn.cursor()
+            columns = self._archive_columns
+            
+            self._stage_posts(cursor, f"SELECT {columns} FROM main.blog_posts WHERE status = 'archived'")
+            cursor.execute('SELECT COUNT(*) FROM temp.moved_posts')
+            moved = cursor.fetchone()[0]
+            
+            if moved:
+                cursor.execute(f'INSERT INTO archive.blog_posts ({columns}) SELECT {columns} FROM temp.moved_posts')
+                cursor.execute('DELETE FROM main.blog_posts WHERE id IN (SELECT id FROM temp.moved_posts)')
+                cursor.execute('DELETE FROM main.rendered_posts WHERE article_id IN (SELECT id FROM temp.moved_posts)')
+                self._apply_stats_delta(cursor, "temp.moved_posts", 1)
+            
+            conn.commit()
+            
+            if moved and vacuum:
+                cursor.execute('VACUUM main')
+            conn.close()
+            
+            if moved:
+                self._mark_snapshot_dirty()
+            logger.info(f"已將 {moved} 篇封存文章移至冷資料庫")
+            return moved
+            
+        except Exception as e:
+            logger.error(f"封存分區搬移失敗: {e}")
+            return 0
+    
+    def _use_archive(self, conn: sqlite3.Connection) -> bool:
+        """
+        在連線上掛載冷資料庫（已掛載時略過）
+        
+        熱資料的讀寫不需要冷資料庫，只在主資料表找不到文章或需要跨分區查詢時才掛載。
+        ATTACH 不能在交易中執行，連線上尚未提交的寫入會先提交。
+        
+        Args:
+            conn: 資料庫連線
+            
+        Returns:
+            是否已啟用封存分區（未啟用時不掛載）
+        """
+        if not self._archive_columns:
+            return False
+        
+        if not any(row[1] == "archive" for row in conn.execute('PRAGMA database_list')):
+            if conn.in_transaction:
+                conn.commit()
+            self._attach_archive(conn)
+        return True
+    
+    def _attach_archive(self, conn: sqlite3.Connection):
+        """在連線上掛載冷資料庫並建立跨分區檢視"""
+        conn.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+        conn.execute(f'''
+            CREATE TEMP VIEW IF NOT EXISTS all_blog_posts AS
+            SELECT {self._archive_columns} FROM main.blog_posts
+            UNION ALL
+            SELECT {self._archive_columns} FROM archive.blog_posts
+        ''')
+    
+    def _stage_posts(self, cursor, select_sql: str, params: tuple = ()):
+        """將要搬移的文章暫存到 temp.moved_posts"""
+        cursor.execute(f'CREATE TEMP TABLE IF NOT EXISTS moved_posts AS SELECT {self._archive_columns} FROM main.blog_posts WHERE 0')
+        cursor.execute('DELETE FROM temp.moved_posts')
+        cursor.execute(f'INSERT INTO temp.moved_posts {select_sql}', params)
+    
+    def _apply_stats_delta(self, cursor, source: str, sign: int):
+        """以整批文章增減分類與標籤統計"""
+        for sql in _STATS_DELTA_SQL:
+            cursor.execute(sql.format(source=source, sign="" if sign > 0 else "-"))
+    
+    def _restore_from_archive(self, cursor, article_id: str) -> bool:
+        """將冷資料庫中的文章移回主資料表（統計維持不變）"""
+        columns = self._archive_columns
+        self._stage_posts(cursor, f"SELECT {columns} FROM archive.blog_posts WHERE id = ?", (article_id,))
+        cursor.execute('SELECT COUNT(*) FROM temp.moved_posts')
+        if cursor.fetchone()[0] == 0:
+            return False
+        
+        cursor.execute(f'INSERT INTO main.blog_posts ({columns}) SELECT {columns} FROM temp.moved_posts')
+        self._apply_stats_delta(cursor, "temp.moved_posts", -1)
+        cursor.execute('DELETE FROM archive.blog_posts WHERE id = ?', (article_id,))
+        return True
+    
+    def enable_snapshot(self):
+        """
+        啟用記憶體讀取快照
+        
+        以 SQLite backup API 將資料庫複製到記憶體，讀取方法改由副本提供；
+        寫入仍寫入磁碟資料庫，之後依 snapshot_interval 刷新副本。
+        """
+        self.refresh_snapshot(force=True)
+        
+        if self.snapshot_interval > 0 and self._snapshot_thread is None:
+            self._snapshot_stop.clear()
+            self._snapshot_thread = threading.Thread(
+                target=self._snapshot_refresh_loop, name="blog-snapshot", daemon=True
+            )
+            self._snapshot_thread.start()
+        
+        logger.info("記憶體讀取快照已啟用")
+    
+    def disable_snapshot(self):
+        """停用記憶體讀取快照，讀取回到磁碟資料庫"""
+        self._snapshot_stop.set()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        with self._snapshot_lock:
+            self._snapshot = None
+            if self._snapshot_watch is not None:
+                self._snapshot_watch.close()
+                self._snapshot_watch = None
+            self._snapshot_version = None
+    
+    def refresh_snapshot(self, force: bool = False) -> bool:
+        """
+        刷新記憶體快照
+        
+        先將磁碟資料庫完整備份到新的記憶體資料庫，再一次替換參照，
+        進行中的讀取會繼續使用舊副本，不會讀到半途的資料。
+        是否有寫入以 PRAGMA data_version 判斷，其他連線或程序（Node 伺服器、生成管線、
+        其他管理器）的寫入也會觸發刷新。
+        
+        Args:
+            force: 即使沒有寫入也刷新
+            
+        Returns:
+            是否成功
+        """
+        with self._snapshot_lock:
+            version = self._read_data_version()
+            if (not force and not self._snapshot_dirty
+                    and version is not None and version == self._snapshot_version):
+                return True
+            
+            try:
+                self._snapshot_dirty = False
+                # 先記下版本再備份，備份期間的寫入會在下次檢查時再刷新一次
+                self._snapshot_version = version
+                
+                source = sqlite3.connect(self.db_path)
+                snapshot = sqlite3.connect(":memory:", check_same_thread=False, factory=_SnapshotConnection)
+                source.backup(snapshot)
+                source.close()
+                
+                if self.tracer is not None:
+                    self.tracer.attach(snapshot)
+                snapshot.create_function("blog_content", 1, self.decode_content, deterministic=True)
+                if self._archive_columns:
+                    self._attach_archive(snapshot)
+                
+                self._snapshot = snapshot
+                return True
+                
+            except Exception as e:
+                self._snapshot_dirty = True
+                logger.error(f"刷新記憶體快照失敗: {e}")
+                return False
+    
+    def _read_data_version(self) -> Optional[int]:
+        """
+        讀取磁碟資料庫的 data_version（呼叫端須持有快照鎖）
+        
+        data_version 只在同一條連線上比較才有意義，因此保留一條專用的監看連線；
+        任何其他連線提交寫入後數值都會改變。
+        
+        Returns:
+            目前的 data_version；讀取失敗時回傳 None（視為有變更）
+        """
+        try:
+            if self._snapshot_watch is None:
+                self._snapshot_watch = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._snapshot_watch.execute('PRAGMA data_version').fetchone()[0]
+        except Exception as e:
+            logger.error(f"讀取資料庫版本失敗: {e}")
+            if self._snapshot_watch is not None:
+                self._snapshot_watch.close()
+                self._snapshot_watch = None
+            return None
+    
+    def close(self):
+        """釋放背景資源（停止快照刷新執行緒）"""
+        self.disable_snapshot()
+    
+    def _snapshot_refresh_loop(self):
+        """背景定時檢查資料庫版本，有寫入時刷新快照"""
+        while not self._snapshot_stop.wait(self.snapshot_interval):
+            self.refresh_snapshot()
+    
+    def _mark_snapshot_dirty(self):
+        """標記快照過期，立即或於下次定時刷新"""
+        if self._snapshot is None:
+            return
+        
+        self._snapshot_dirty = True
+        if self.snapshot_interval <= 0:
+            self.refresh_snapshot()
+    
+    def _get_read_connection(self) -> sqlite3.Connection:
+        """取得讀取用連線（啟用快照時為共用的記憶體副本）"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        return self._connect()
+    
+    def _release_read_connection(self, conn: sqlite3.Connection):
+        """歸還讀取用連線"""
+        if not isinstance(conn, _SnapshotConnection):
+            conn.close()
+    
     def init_database(self):
         """初始化資料庫"""
         try:
             # 確保目錄存在
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
             
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # 創建文章表
@@ -104,9 +690,120 @@ class BlogManager:
                 )
             ''')
             
+            # 舊版資料庫的分類表缺少 count 欄位
+            cursor.execute('PRAGMA table_info(categories)')
+            if 'count' not in [column[1] for column in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE categories ADD COLUMN count INTEGER DEFAULT 0')
+            
+            # 排程發布時間（新增於資料表末端，維持既有欄位順序）
+            cursor.execute('PRAGMA table_info(blog_posts)')
+            if 'scheduled_at' not in [column[1] for column in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE blog_posts ADD COLUMN scheduled_at TEXT')
+            
+            # 各狀態的分類／標籤統計表
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'category_stats'")
+            needs_backfill = cursor.fetchone() is None
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS category_stats (
+                    name TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    PRIMARY KEY (name, status)
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS tag_stats (
+                    name TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    PRIMARY KEY (name, status)
+                )
+            ''')
+            # 渲染快取表（以文章 ID 與 updated_at 為鍵）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rendered_posts (
+                    article_id TEXT PRIMARY KEY,
+                    updated_at TEXT,
+                    html TEXT NOT NULL,
+                    toc TEXT,
+                    read_time INTEGER,
+                    rendered_at TEXT
+                )
+            ''')
+            
+            # 渲染器版本改變時（如連結安全規則）清除渲染快取，版本記錄在 user_version
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] < RENDERER_VERSION:
+                cursor.execute('DELETE FROM rendered_posts')
+                cursor.execute(f'PRAGMA user_version = {RENDERER_VERSION}')
+            
+            # 內容壓縮字典表（壓縮資料開頭記錄字典編號）
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS content_dictionaries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dictionary BLOB NOT NULL,
+                    created_at TEXT
+                )
+            ''')
+            
+            # 列表排序與最新更新時間查詢用索引
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_blog_posts_status_created ON blog_posts(status, created_at)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_blog_posts_status_updated ON blog_posts(status, updated_at)')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_blog_posts_scheduled ON blog_posts(scheduled_at)
+                WHERE scheduled_at IS NOT NULL
+            ''')
+            
+            # 舊版保存了帶時區的排程時間，換算為本地時間才能與現在時間比較
+            cursor.execute('SELECT id, scheduled_at FROM blog_posts WHERE scheduled_at IS NOT NULL')
+            for article_id, scheduled_at in cursor.fetchall():
+                try:
+                    publish_at = datetime.fromisoformat(scheduled_at)
+                except ValueError:
+                    continue
+                if publish_at.tzinfo:
+                    cursor.execute('UPDATE blog_posts SET scheduled_at = ? WHERE id = ?',
+                                   (_local_naive(publish_at).isoformat(), article_id))
+            
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_categories_count ON categories(count DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_count ON tags(count DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_category_stats_status ON category_stats(status, count DESC)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tag_stats_status ON tag_stats(status, count DESC)')
+            
+            # 以觸發器增量維護統計，新增、更新、刪除文章時自動同步
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_blog_posts_stats_insert
+                AFTER INSERT ON blog_posts
+                BEGIN
+                    {_STATS_INCREMENT_SQL.format(row='NEW')}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_blog_posts_stats_delete
+                AFTER DELETE ON blog_posts
+                BEGIN
+                    {_STATS_DECREMENT_SQL.format(row='OLD')}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS trg_blog_posts_stats_update
+                AFTER UPDATE OF category, tags, status ON blog_posts
+                WHEN OLD.category IS NOT NEW.category
+                    OR OLD.tags IS NOT NEW.tags
+                    OR OLD.status IS NOT NEW.status
+                BEGIN
+                    {_STATS_DECREMENT_SQL.format(row='OLD')}
+                    {_STATS_INCREMENT_SQL.format(row='NEW')}
+                END
+            ''')
+            
             conn.commit()
             conn.close()
             
+            if needs_backfill:
+                self.rebuild_statistics()
+            
             logger.info("資料庫初始化完成")
             
         except Exception as e:
@@ -123,39 +820,111 @@ class BlogManager:
             是否成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute('''
-                INSERT INTO blog_posts (
-                    id, title, content, summary, category, tags, author,
-                    status, publish_date, created_at, updated_at, read_time,
-                    seo_keywords, featured_image
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                article.id, article.title, article.content, article.summary,
-                article.category, json.dumps(article.tags), article.author,
-                article.status, article.publish_date, article.created_at,
-                article.updated_at, article.read_time,
-                json.dumps(article.seo_keywords) if article.seo_keywords else None,
-                article.featured_image
-            ))
-            
-            # 更新分類和標籤統計
-            self._update_category_count(article.category)
-            for tag in article.tags:
-                self._update_tag_count(tag)
+            self._insert_post(cursor, article)
             
             conn.commit()
             conn.close()
             
             logger.info(f"文章新增成功：{article.title}")
+            self._notify_change(article.id, "add")
             return True
             
         except Exception as e:
             logger.error(f"新增文章失敗: {e}")
             return False
     
+    def add_articles(self, articles: List[BlogPost]) -> Optional[List[str]]:
+        """
+        批次新增文章
+        
+        整批在同一個交易中寫入，ID 已存在的文章略過；單篇文章的資料錯誤（如欄位約束、渲染失敗）
+        只回復該篇並記錄，其餘文章照常寫入。資料庫鎖定等暫時性錯誤（OperationalError）時整批回復，
+        呼叫端可稍後重試。下游快取（讀取快照等）在整批完成後只失效一次。
+        
+        Args:
+            articles: 文章物件列表
+            
+        Returns:
+            已新增的文章 ID 列表；交易失敗時回傳 None
+        """
+        if not articles:
+            return []
+        
+        conn = None
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
+            
+            added = []
+            rejected = 0
+            for article in articles:
+                cursor.execute('SAVEPOINT insert_post')
+                try:
+                    if self._insert_post(cursor, article, skip_existing=True):
+                        added.append(article.id)
+                except sqlite3.OperationalError:
+                    raise
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO insert_post')
+                    rejected += 1
+                    logger.error(f"文章寫入失敗，已略過：{article.id}（{e}）")
+                cursor.execute('RELEASE insert_post')
+            
+            conn.commit()
+            
+            skipped = len(articles) - len(added) - rejected
+            if skipped:
+                logger.warning(f"略過 {skipped} 篇 ID 已存在的文章")
+            logger.info(f"批次新增 {len(added)} 篇文章")
+            self._notify_changes(added, "add")
+            return added
+            
+        except Exception as e:
+            if conn is not None:
+                conn.rollback()
+            logger.error(f"批次新增文章失敗: {e}")
+            return None
+        
+        finally:
+            if conn is not None:
+                conn.close()
+    
+    def _insert_post(self, cursor, article: BlogPost, skip_existing: bool = False) -> bool:
+        """
+        寫入文章與渲染快取（分類和標籤統計由觸發器同步更新）
+        
+        Args:
+            cursor: 資料庫游標
+            article: 文章物件
+            skip_existing: ID 已存在時略過（否則拋出 IntegrityError）
+            
+        Returns:
+            是否寫入
+        """
+        cursor.execute('''
+            INSERT INTO blog_posts (
+                id, title, content, summary, category, tags, author,
+                status, publish_date, created_at, updated_at, read_time,
+                seo_keywords, featured_image, scheduled_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''' + (" ON CONFLICT(id) DO NOTHING" if skip_existing else ""), (
+            article.id, article.title, self._encode_content(article.content), article.summary,
+            article.category, json.dumps(article.tags), article.author,
+            article.status, article.publish_date, article.created_at,
+            article.updated_at, article.read_time,
+            json.dumps(article.seo_keywords) if article.seo_keywords else None,
+            article.featured_image, article.scheduled_at
+        ))
+        if not cursor.rowcount:
+            return False
+        
+        self._store_rendered_content(cursor, article.id, article.updated_at, article.content)
+        return True
+    
     def get_article(self, article_id: str) -> Optional[BlogPost]:
         """
         獲取單篇文章
@@ -167,13 +936,18 @@ class BlogManager:
             BlogPost 物件或 None
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             
-            cursor.execute('SELECT * FROM blog_posts WHERE id = ?', (article_id,))
+            cursor.execute('SELECT * FROM main.blog_posts WHERE id = ?', (article_id,))
             row = cursor.fetchone()
             
-            conn.close()
+            # 主資料表找不到時再查冷資料庫
+            if not row and self._use_archive(conn):
+                cursor.execute(f'SELECT {self._archive_columns} FROM archive.blog_posts WHERE id = ?', (article_id,))
+                row = cursor.fetchone()
+            
+            self._release_read_connection(conn)
             
             if row:
                 return self._row_to_blog_post(row)
@@ -184,6 +958,62 @@ class BlogManager:
             logger.error(f"獲取文章失敗: {e}")
             return None
     
+    def get_rendered_content(self, article_id: str) -> Optional[RenderedContent]:
+        """
+        獲取文章的渲染結果（HTML、目錄、閱讀時間）
+        
+        快取以 updated_at 判斷是否過期，過期或尚未渲染時才重新渲染並寫回；
+        已移至冷資料庫的文章直接渲染，不寫入快取（分區搬移時已清除其快取）。
+        
+        Args:
+            article_id: 文章 ID
+            
+        Returns:
+            RenderedContent 物件或 None
+        """
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT p.updated_at, r.updated_at, r.html, r.toc, r.read_time
+                FROM blog_posts p
+                LEFT JOIN rendered_posts r ON r.article_id = p.id
+                WHERE p.id = ?
+            ''', (article_id,))
+            row = cursor.fetchone()
+            
+            if not row:
+                content = None
+                if self._use_archive(conn):
+                    cursor.execute('SELECT content FROM archive.blog_posts WHERE id = ?', (article_id,))
+                    archived = cursor.fetchone()
+                    content = archived[0] if archived else None
+                conn.close()
+                return render_markdown(self.decode_content(content)) if content is not None else None
+            
+            if row[2] is not None and row[1] == row[0]:
+                conn.close()
+                return RenderedContent(
+                    html=row[2],
+                    toc=json.loads(row[3]) if row[3] else [],
+                    read_time=row[4]
+                )
+            
+            # 快取未命中：渲染後寫回
+            cursor.execute('SELECT updated_at, content FROM blog_posts WHERE id = ?', (article_id,))
+            updated_at, content = cursor.fetchone()
+            rendered = self._store_rendered_content(cursor, article_id, updated_at, self.decode_content(content))
+            
+            conn.commit()
+            conn.close()
+            
+            return rendered
+            
+        except Exception as e:
+            logger.error(f"獲取文章渲染結果失敗: {e}")
+            return None
+    
     def get_articles(self, status: str = "published", limit: int = 10, offset: int = 0) -> List[BlogPost]:
         """
         獲取文章列表
@@ -197,25 +1027,28 @@ class BlogManager:
             BlogPost 列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             
+            # 封存文章可能已移至冷資料庫，需跨分區查詢
+            source = "all_blog_posts" if status in ("all", "archived") and self._use_archive(conn) else "blog_posts"
+            
             if status == "all":
-                cursor.execute('''
-                    SELECT * FROM blog_posts 
+                cursor.execute(f'''
+                    SELECT * FROM {source} 
                     ORDER BY created_at DESC 
                     LIMIT ? OFFSET ?
                 ''', (limit, offset))
             else:
-                cursor.execute('''
-                    SELECT * FROM blog_posts 
+                cursor.execute(f'''
+                    SELECT * FROM {source} 
                     WHERE status = ? 
                     ORDER BY created_at DESC 
                     LIMIT ? OFFSET ?
                 ''', (status, limit, offset))
             
             rows = cursor.fetchall()
-            conn.close()
+            self._release_read_connection(conn)
             
             articles = [self._row_to_blog_post(row) for row in rows]
             logger.info(f"獲取 {len(articles)} 篇文章")
@@ -237,19 +1070,26 @@ class BlogManager:
             BlogPost 列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             
+            # 依 (status, created_at) 索引由新到舊掃描，湊滿 limit 篇即停止；
+            # CASE 依序求值，標題或標籤已符合的列不解壓，壓縮內容（BLOB）才呼叫解壓函數
+            pattern = f'%{keyword}%'
             cursor.execute('''
                 SELECT * FROM blog_posts 
-                WHERE (title LIKE ? OR content LIKE ? OR tags LIKE ?)
-                AND status = 'published'
+                WHERE status = 'published'
+                AND CASE
+                    WHEN title LIKE ?1 OR tags LIKE ?1 THEN 1
+                    WHEN typeof(content) = 'blob' THEN blog_content(content) LIKE ?1
+                    ELSE content LIKE ?1
+                END
                 ORDER BY created_at DESC 
-                LIMIT ?
-            ''', (f'%{keyword}%', f'%{keyword}%', f'%{keyword}%', limit))
+                LIMIT ?2
+            ''', (pattern, limit))
             
             rows = cursor.fetchall()
-            conn.close()
+            self._release_read_connection(conn)
             
             articles = [self._row_to_blog_post(row) for row in rows]
             logger.info(f"搜尋到 {len(articles)} 篇相關文章")
@@ -271,7 +1111,7 @@ class BlogManager:
             BlogPost 列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -282,7 +1122,7 @@ class BlogManager:
             ''', (category, limit))
             
             rows = cursor.fetchall()
-            conn.close()
+            self._release_read_connection(conn)
             
             articles = [self._row_to_blog_post(row) for row in rows]
             logger.info(f"獲取分類 '{category}' 的 {len(articles)} 篇文章")
@@ -304,23 +1144,36 @@ class BlogManager:
             是否成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
+            # 狀態改變時取消排程（已發布或封存的文章不應再被排程發布）
+            if "status" in updates and "scheduled_at" not in updates:
+                updates = {**updates, "scheduled_at": None}
+            
             # 構建更新語句
             set_clause = ", ".join([f"{key} = ?" for key in updates.keys()])
             set_clause += ", updated_at = ?"
             
-            values = list(updates.values())
+            values = [
+                self._encode_content(value) if key == "content" else value
+                for key, value in updates.items()
+            ]
             values.append(datetime.now().isoformat())
             values.append(article_id)
             
-            cursor.execute(f'UPDATE blog_posts SET {set_clause} WHERE id = ?', values)
+            cursor.execute(f'UPDATE main.blog_posts SET {set_clause} WHERE id = ?', values)
+            
+            # 冷資料庫中的文章先移回主資料表再更新（仍為封存狀態者會在下次分區時移回）
+            if cursor.rowcount == 0 and self._use_archive(conn):
+                if self._restore_from_archive(cursor, article_id):
+                    cursor.execute(f'UPDATE main.blog_posts SET {set_clause} WHERE id = ?', values)
             
             conn.commit()
             conn.close()
             
             logger.info(f"文章更新成功：{article_id}")
+            self._notify_change(article_id, "update")
             return True
             
         except Exception as e:
@@ -338,15 +1191,24 @@ class BlogManager:
             是否成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute('DELETE FROM blog_posts WHERE id = ?', (article_id,))
+            cursor.execute('DELETE FROM main.blog_posts WHERE id = ?', (article_id,))
+            deleted = cursor.rowcount
+            cursor.execute('DELETE FROM rendered_posts WHERE article_id = ?', (article_id,))
+            
+            # 冷資料庫中的文章不經觸發器，需自行扣除統計
+            if deleted == 0 and self._use_archive(conn):
+                self._stage_posts(cursor, f"SELECT {self._archive_columns} FROM archive.blog_posts WHERE id = ?", (article_id,))
+                self._apply_stats_delta(cursor, "temp.moved_posts", -1)
+                cursor.execute('DELETE FROM archive.blog_posts WHERE id = ?', (article_id,))
             
             conn.commit()
             conn.close()
             
             logger.info(f"文章刪除成功：{article_id}")
+            self._notify_change(article_id, "delete")
             return True
             
         except Exception as e:
@@ -369,6 +1231,104 @@ class BlogManager:
         }
         return self.update_article(article_id, updates)
     
+    def schedule_article(self, article_id: str, publish_at) -> bool:
+        """
+        排程發布文章
+        
+        文章維持原狀態，到期後由 publish_due_articles（通常由 PublishScheduler 呼叫）批次發布；
+        只有草稿（draft／scheduled）會被發布，之後改變狀態即取消排程。
+        
+        Args:
+            article_id: 文章 ID
+            publish_at: 發布時間（datetime 或 ISO 格式字串；帶時區者換算為本地時間保存）
+            
+        Returns:
+            是否成功（文章不存在或已發布／封存時回傳 False）
+        """
+        article = self.get_article(article_id)
+        if article is None or article.status not in ("draft", "scheduled"):
+            logger.warning(f"無法排程文章 {article_id}：只有草稿可以排程發布")
+            return False
+        
+        if isinstance(publish_at, str):
+            publish_at = datetime.fromisoformat(publish_at)
+        return self.update_article(article_id, {"scheduled_at": _local_naive(publish_at).isoformat()})
+    
+    def unschedule_article(self, article_id: str) -> bool:
+        """取消排程發布"""
+        return self.update_article(article_id, {"scheduled_at": None})
+    
+    def get_scheduled_articles(self) -> List[Dict]:
+        """
+        獲取所有排程中的文章
+        
+        Returns:
+            [{"id": ..., "scheduled_at": ...}]，依排程時間排序
+        """
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, scheduled_at FROM blog_posts
+                WHERE scheduled_at IS NOT NULL AND status IN ('draft', 'scheduled')
+                ORDER BY scheduled_at
+            ''')
+            rows = cursor.fetchall()
+            conn.close()
+            
+            return [{"id": row[0], "scheduled_at": row[1]} for row in rows]
+            
+        except Exception as e:
+            logger.error(f"獲取排程文章失敗: {e}")
+            return []
+    
+    def publish_due_articles(self, now: datetime = None) -> List[str]:
+        """
+        發布所有已到期的排程文章
+        
+        所有到期文章在同一個交易中發布，下游快取（讀取快照等）在整批完成後只失效一次。
+        
+        Args:
+            now: 目前時間（預設為現在；帶時區者換算為本地時間）
+            
+        Returns:
+            已發布的文章 ID 列表
+        """
+        now = _local_naive(now or datetime.now()).isoformat()
+        
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            # 發布只改變狀態，渲染快取沿用（更新其 updated_at 以免被視為過期）
+            cursor.execute('''
+                UPDATE rendered_posts SET updated_at = ?
+                WHERE article_id IN (
+                    SELECT id FROM blog_posts WHERE scheduled_at <= ? AND status IN ('draft', 'scheduled')
+                )
+                AND updated_at = (SELECT updated_at FROM blog_posts WHERE id = rendered_posts.article_id)
+            ''', (now, now))
+            cursor.execute('''
+                UPDATE blog_posts
+                SET status = 'published', publish_date = scheduled_at, scheduled_at = NULL, updated_at = ?
+                WHERE scheduled_at <= ? AND status IN ('draft', 'scheduled')
+                RETURNING id
+            ''', (now, now))
+            published = [row[0] for row in cursor.fetchall()]
+            
+            conn.commit()
+            conn.close()
+            
+            if published:
+                logger.info(f"排程發布 {len(published)} 篇文章")
+                self._notify_changes(published, "update")
+            return published
+            
+        except Exception as e:
+            logger.error(f"排程發布失敗: {e}")
+            return []
+    
     def archive_article(self, article_id: str) -> bool:
         """
         封存文章
@@ -393,35 +1353,92 @@ class BlogManager:
             是否成功
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute('UPDATE blog_posts SET views = views + 1 WHERE id = ?', (article_id,))
+            cursor.execute('UPDATE main.blog_posts SET views = views + 1 WHERE id = ?', (article_id,))
+            if cursor.rowcount == 0 and self._use_archive(conn):
+                cursor.execute('UPDATE archive.blog_posts SET views = views + 1 WHERE id = ?', (article_id,))
+            updated = cursor.rowcount > 0
             
             conn.commit()
             conn.close()
             
+            # 計數是最頻繁的寫入，不觸發快照刷新（每次刷新都要備份整個資料庫）；
+            # 快照中的計數於下次定時或因其他寫入刷新時更新
+            if updated:
+                self._notify_engagement(article_id, "view")
+            
             return True
             
         except Exception as e:
             logger.error(f"增加瀏覽次數失敗: {e}")
             return False
     
-    def get_categories(self) -> List[Dict]:
+    def increment_likes(self, article_id: str) -> bool:
+        """
+        增加文章按讚次數
+        
+        Args:
+            article_id: 文章 ID
+            
+        Returns:
+            是否成功
+        """
+        try:
+            conn = self._connect()
+            cursor = conn.cursor()
+            
+            cursor.execute('UPDATE main.blog_posts SET likes = likes + 1 WHERE id = ?', (article_id,))
+            if cursor.rowcount == 0 and self._use_archive(conn):
+                cursor.execute('UPDATE archive.blog_posts SET likes = likes + 1 WHERE id = ?', (article_id,))
+            updated = cursor.rowcount > 0
+            
+            conn.commit()
+            conn.close()
+            
+            # 計數是最頻繁的寫入，不觸發快照刷新（每次刷新都要備份整個資料庫）；
+            # 快照中的計數於下次定時或因其他寫入刷新時更新
+            if updated:
+                self._notify_engagement(article_id, "like")
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"增加按讚次數失敗: {e}")
+            return False
+    
+    def get_categories(self, status: str = None) -> List[Dict]:
         """
         獲取所有分類
         
+        Args:
+            status: 只計算指定狀態的文章（可選，預設為全部狀態）
+            
         Returns:
             分類列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             
-            cursor.execute('SELECT name, description, count FROM categories ORDER BY count DESC')
+            if status:
+                cursor.execute('''
+                    SELECT s.name, c.description, s.count
+                    FROM category_stats s
+                    LEFT JOIN categories c ON c.name = s.name
+                    WHERE s.status = ?
+                    ORDER BY s.count DESC
+                ''', (status,))
+            else:
+                cursor.execute('''
+                    SELECT name, description, count FROM categories
+                    WHERE count > 0
+                    ORDER BY count DESC
+                ''')
             rows = cursor.fetchall()
             
-            conn.close()
+            self._release_read_connection(conn)
             
             categories = []
             for row in rows:
@@ -437,24 +1454,32 @@ class BlogManager:
             logger.error(f"獲取分類失敗: {e}")
             return []
     
-    def get_popular_tags(self, limit: int = 20) -> List[Dict]:
+    def get_popular_tags(self, limit: int = 20, status: str = None) -> List[Dict]:
         """
         獲取熱門標籤
         
         Args:
             limit: 限制數量
+            status: 只計算指定狀態的文章（可選，預設為全部狀態）
             
         Returns:
             標籤列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_read_connection()
             cursor = conn.cursor()
             
-            cursor.execute('SELECT name, count FROM tags ORDER BY count DESC LIMIT ?', (limit,))
+            if status:
+                cursor.execute('''
+                    SELECT name, count FROM tag_stats
+                    WHERE status = ?
+                    ORDER BY count DESC LIMIT ?
+                ''', (status, limit))
+            else:
+                cursor.execute('SELECT name, count FROM tags ORDER BY count DESC LIMIT ?', (limit,))
             rows = cursor.fetchall()
             
-            conn.close()
+            self._release_read_connection(conn)
             
             tags = []
             for row in rows:
@@ -469,9 +1494,118 @@ class BlogManager:
             logger.error(f"獲取熱門標籤失敗: {e}")
             return []
     
+    def rebuild_statistics(self) -> bool:
+        """
+        從 blog_posts 全量重建分類和標籤統計
+        
+        平時統計由觸發器增量維護，此方法僅用於舊資料庫的初次回填或修復。
+        
+        Returns:
+            是否成功
+        """
+        try:
+            conn = self._connect()
+            # 啟用封存分區時，統計涵蓋冷資料庫中的文章
+            source = "all_blog_posts" if self._use_archive(conn) else "blog_posts"
+            cursor = conn.cursor()
+            now = datetime.now().isoformat()
+            tags_json = "CASE WHEN json_valid(p.tags) THEN p.tags ELSE '[]' END"
+            
+            cursor.execute('UPDATE categories SET count = 0')
+            cursor.execute(f'''
+                INSERT INTO categories (name, count, created_at)
+                SELECT category, COUNT(*), ? FROM {source}
+                WHERE category IS NOT NULL
+                GROUP BY category
+                ON CONFLICT(name) DO UPDATE SET count = excluded.count
+            ''', (now,))
+            
+            cursor.execute('DELETE FROM category_stats')
+            cursor.execute(f'''
+                INSERT INTO category_stats (name, status, count)
+                SELECT category, COALESCE(status, 'draft'), COUNT(*) FROM {source}
+                WHERE category IS NOT NULL
+                GROUP BY category, COALESCE(status, 'draft')
+            ''')
+            
+            cursor.execute('UPDATE tags SET count = 0')
+            cursor.execute(f'''
+                INSERT INTO tags (name, count, created_at)
+                SELECT j.value, COUNT(DISTINCT p.id), ?
+                FROM {source} p, json_each({tags_json}) j
+                GROUP BY j.value
+                ON CONFLICT(name) DO UPDATE SET count = excluded.count
+            ''', (now,))
+            cursor.execute('DELETE FROM tags WHERE count <= 0')
+            
+            cursor.execute('DELETE FROM tag_stats')
+            cursor.execute(f'''
+                INSERT INTO tag_stats (name, status, count)
+                SELECT j.value, COALESCE(p.status, 'draft'), COUNT(DISTINCT p.id)
+                FROM {source} p, json_each({tags_json}) j
+                GROUP BY j.value, COALESCE(p.status, 'draft')
+            ''')
+            
+            conn.commit()
+            conn.close()
+            
+            logger.info("分類和標籤統計重建完成")
+            return True
+            
+        except Exception as e:
+            logger.error(f"重建統計失敗: {e}")
+            return False
+    
+    def add_change_listener(self, listener: Callable[[str, str], None]):
+        """
+        註冊文章變更監聽器
+        
+        新增、更新、刪除文章成功後會呼叫 listener(article_id, action)，
+        action 為 "add"、"update" 或 "delete"，供衍生索引與快取同步使用。
+        
+        Args:
+            listener: 監聽函數
+        """
+        self.change_listeners.append(listener)
+    
+    def add_engagement_listener(self, listener: Callable[[str, str], None]):
+        """
+        註冊互動事件監聽器
+        
+        瀏覽或按讚後會呼叫 listener(article_id, kind)，kind 為 "view" 或 "like"；
+        與變更監聽器分開，避免高頻的瀏覽事件觸發索引重建。
+        
+        Args:
+            listener: 監聽函數
+        """
+        self.engagement_listeners.append(listener)
+    
+    def _notify_engagement(self, article_id: str, kind: str):
+        """通知互動事件監聽器"""
+        for listener in self.engagement_listeners:
+            try:
+                listener(article_id, kind)
+            except Exception as e:
+                logger.error(f"互動事件監聽器執行失敗: {e}")
+    
+    def _notify_change(self, article_id: str, action: str):
+        """通知文章變更監聽器"""
+        self._notify_changes([article_id], action)
+    
+    def _notify_changes(self, article_ids: List[str], action: str):
+        """通知一批文章的變更（快照只標記一次）"""
+        self._mark_snapshot_dirty()
+        for article_id in article_ids:
+            for listener in self.change_listeners:
+                try:
+                    listener(article_id, action)
+                except Exception as e:
+                    logger.error(f"文章變更監聽器執行失敗: {e}")
+    
     def _row_to_blog_post(self, row) -> BlogPost:
-        """將資料庫行轉換為 BlogPost 物件"""
-        return BlogPost(
+        """將資料庫行轉換為 BlogPost 物件（內容延後解壓）"""
+        return _StoredBlogPost(
+            decode=self.decode_content,
             id=row[0],
             title=row[1],
             content=row[2],
@@ -487,48 +1621,31 @@ class BlogManager:
             views=row[12],
             likes=row[13],
             seo_keywords=json.loads(row[14]) if row[14] else [],
-            featured_image=row[15]
+            featured_image=row[15],
+            scheduled_at=row[16] if len(row) > 16 else None
         )
     
-    def _update_category_count(self, category: str):
-        """更新分類統計"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO categories (name, count, created_at)
-                VALUES (?, (SELECT COUNT(*) FROM blog_posts WHERE category = ?), ?)
-            ''', (category, category, datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            logger.error(f"更新分類統計失敗: {e}")
+    def _store_rendered_content(self, cursor, article_id: str, updated_at: str, content: str) -> RenderedContent:
+        """渲染文章並寫入渲染快取"""
+        rendered = render_markdown(content)
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO rendered_posts (
+                article_id, updated_at, html, toc, read_time, rendered_at
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        ''', (
+            article_id, updated_at, rendered.html,
+            json.dumps(rendered.toc, ensure_ascii=False),
+            rendered.read_time, datetime.now().isoformat()
+        ))
+        
+        return rendered
     
-    def _update_tag_count(self, tag: str):
-        """更新標籤統計"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO tags (name, count, created_at)
-                VALUES (?, (SELECT COUNT(*) FROM blog_posts WHERE tags LIKE ?), ?)
-            ''', (tag, f'%{tag}%', datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            logger.error(f"更新標籤統計失敗: {e}")
-
     def initialize_default_articles(self):
         """
         若資料庫為空，自動補上預設文章
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         cursor.execute('SELECT COUNT(*) FROM blog_posts')
         count = cursor.fetchone()[0]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+部落格文章渲染器
+將 Markdown 文章內容轉換為 HTML，並產生目錄與閱讀時間
+"""
+
+import html
+import re
+from dataclasses import dataclass
+from typing import List, Dict
+
+# 每分鐘閱讀字數（與 BlogGenerator 的估算一致）
+WORDS_PER_MINUTE = 300
+
+# 列入目錄的標題層級
+TOC_LEVELS = (2, 3)
+
+# 渲染器版本（輸出格式或安全規則改變時遞增，讓既有的渲染快取失效）
+RENDERER_VERSION = 2
+
+# 連結允許的協定（其餘如 javascript:、data: 只輸出連結文字）
+SAFE_URL_SCHEMES = ("http", "https", "mailto")
+
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_UL_RE = re.compile(r'^\s*[-*+]\s+(.*)$')
+_OL_RE = re.compile(r'^\s*\d+[.)]\s+(.*)$')
+_HR_RE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+_FENCE_RE = re.compile(r'^\s*```(\w*)\s*$')
+_QUOTE_RE = re.compile(r'^\s*>\s?(.*)$')
+_SCHEME_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9+.-]*):')
+
+@dataclass
+class RenderedContent:
+    """渲染結果資料結構"""
+    html: str  # 文章 HTML
+    toc: List[Dict]  # 目錄：[{"level": 2, "title": ..., "anchor": ...}]
+    read_time: int  # 閱讀時間（分鐘）
+
+def _safe_url(url: str) -> str:
+    """
+    檢查連結網址（只允許 http、https、mailto 與相對路徑、錨點）
+
+    Args:
+        url: 已跳脫 HTML 的網址
+
+    Returns:
+        可放入 href 屬性的網址；不允許的協定回傳空字串
+    """
+    if "\x00" in url:
+        # 網址中含有行內程式碼的佔位符，還原後會把未跳脫引號的內容帶進屬性
+        return ""
+    url = html.unescape(url)
+    # 瀏覽器會忽略協定中的控制字元（如 "java\tscript:"），判斷前先移除
+    scheme = _SCHEME_RE.match(re.sub(r'[\x00-\x20\x7f]', '', url))
+    if scheme and scheme.group(1).lower() not in SAFE_URL_SCHEMES:
+        return ""
+    return html.escape(url, quote=True)
+
+def _render_link(match) -> str:
+    """渲染連結（連結文字已跳脫，不安全的網址只保留文字）"""
+    url = _safe_url(match.group(2))
+    if not url:
+        return match.group(1)
+    return f'<a href="{url}">{match.group(1)}</a>'
+
+def _render_inline(text: str) -> str:
+    """渲染行內語法（程式碼、連結、粗體、斜體）"""
+    text = html.escape(text, quote=False)
+
+    # 先抽出行內程式碼，避免內容被其他規則處理
+    codes = []
+
+    def _stash_code(match):
+        codes.append(f"<code>{match.group(1)}</code>")
+        return f"\x00{len(codes) - 1}\x00"
+
+    text = re.sub(r'`([^`]+)`', _stash_code, text)
+    text = re.sub(r'\[([^\]]+)\]\(([^)\s]+)\)', _render_link, text)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'__(.+?)__', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<!\*)\*(?!\s)(.+?)(?<!\s)\*(?!\*)', r'<em>\1</em>', text)
+
+    return re.sub(r'\x00(\d+)\x00', lambda m: codes[int(m.group(1))], text)
+
+def _slugify(title: str, used: Dict[str, int]) -> str:
+    """產生標題錨點（保留中文字元，重複時加上序號）"""
+    slug = re.sub(r'[^\w\s-]', '', title).strip().lower()
+    slug = re.sub(r'[\s_]+', '-', slug) or "section"
+
+    if slug in used:
+        used[slug] += 1
+        return f"{slug}-{used[slug]}"
+
+    used[slug] = 0
+    return slug
+
+def estimate_read_time(text: str) -> int:
+    """
+    估算閱讀時間
+
+    Args:
+        text: 文章內容
+
+    Returns:
+        閱讀時間（分鐘，最少 3 分鐘）
+    """
+    return max(3, len(text) // WORDS_PER_MINUTE)
+
+def render_markdown(content: str) -> RenderedContent:
+    """
+    將 Markdown 內容渲染為 HTML
+
+    支援標題、段落、清單、引用、分隔線與程式碼區塊，
+    涵蓋 BlogGenerator 產生的文章格式。
+
+    Args:
+        content: Markdown 文章內容
+
+    Returns:
+        RenderedContent 物件
+    """
+    output = []
+    toc = []
+    used_anchors = {}
+    paragraph = []
+    list_tag = None
+    quote = []
+    code_lines = None
+    code_lang = ""
+
+    def flush_paragraph():
+        if paragraph:
+            output.append(f"<p>{_render_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    def flush_list():
+        nonlocal list_tag
+        if list_tag:
+            output.append(f"</{list_tag}>")
+            list_tag = None
+
+    def flush_quote():
+        if quote:
+            output.append(f"<blockquote><p>{_render_inline(' '.join(quote))}</p></blockquote>")
+            quote.clear()
+
+    def flush_all():
+        flush_paragraph()
+        flush_list()
+        flush_quote()
+
+    for line in (content or "").splitlines():
+        # 程式碼區塊
+        fence = _FENCE_RE.match(line)
+        if code_lines is not None:
+            if fence:
+                lang_attr = f' class="language-{code_lang}"' if code_lang else ""
+                code_html = html.escape("\n".join(code_lines), quote=False)
+                output.append(f"<pre><code{lang_attr}>{code_html}</code></pre>")
+                code_lines = None
+            else:
+                code_lines.append(line)
+            continue
+        if fence:
+            flush_all()
+            code_lines = []
+            code_lang = fence.group(1)
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            flush_all()
+            continue
+
+        heading = _HEADING_RE.match(stripped)
+        if heading:
+            flush_all()
+            level = len(heading.group(1))
+            title = heading.group(2)
+            anchor = _slugify(title, used_anchors)
+            output.append(f'<h{level} id="{anchor}">{_render_inline(title)}</h{level}>')
+            if level in TOC_LEVELS:
+                toc.append({"level": level, "title": title, "anchor": anchor})
+            continue
+
+        if _HR_RE.match(stripped):
+            flush_all()
+            output.append("<hr>")
+            continue
+
+        quote_match = _QUOTE_RE.match(line)
+        if quote_match:
+            flush_paragraph()
+            flush_list()
+            quote.append(quote_match.group(1).strip())
+            continue
+
+        ul_match = _UL_RE.match(line)
+        ol_match = None if ul_match else _OL_RE.match(line)
+        if ul_match or ol_match:
+            flush_paragraph()
+            flush_quote()
+            tag = "ul" if ul_match else "ol"
+            if list_tag != tag:
+                flush_list()
+                output.append(f"<{tag}>")
+                list_tag = tag
+            item = (ul_match or ol_match).group(1)
+            output.append(f"<li>{_render_inline(item)}</li>")
+            continue
+
+        flush_list()
+        flush_quote()
+        paragraph.append(stripped)
+
+    # 未閉合的程式碼區塊仍照樣輸出
+    if code_lines is not None:
+        output.append(f"<pre><code>{html.escape(chr(10).join(code_lines), quote=False)}</code></pre>")
+    flush_all()
+
+    plain_text = re.sub(r'[#>*`_\-\s]', '', content or "")
+
+    return RenderedContent(
+        html="\n".join(output),
+        toc=toc,
+        read_time=estimate_read_time(plain_text)
+    )
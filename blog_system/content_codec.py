@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+文章內容壓縮
+以 zlib 搭配預設字典（由既有文章訓練的常用片段）壓縮 Markdown 內容
+"""
+
+import re
+import struct
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, Optional, Union
+
+# zlib 預設字典上限（壓縮視窗大小）
+MAX_DICTIONARY_SIZE = 32 * 1024
+
+# 壓縮格式：2 bytes 字典編號（0 表示不使用字典）+ zlib 資料
+_HEADER = struct.Struct(">H")
+
+# 沒有訓練樣本時使用的領域詞彙
+SEED_VOCABULARY = [
+    "黃金", "金價", "投資", "投資人", "市場", "價格", "通膨", "美元", "利率", "聯準會", "央行",
+    "避險", "資產配置", "黃金ETF", "黃金存摺", "實體黃金", "金條", "金幣", "風險", "報酬",
+    "長期", "短期", "建議", "分析", "趨勢", "技術分析", "基本面", "支撐", "阻力", "台灣",
+    "投資策略", "市場分析", "實用知識", "歷史文化", "時事評論",
+    "\n\n## ", "\n\n### ", "\n- ", "**", "。\n\n", "，", "。", "：", "、",
+]
+
+# 訓練時以句子為單位切分
+_SENTENCE_RE = re.compile(r'[^。！？\n]+[。！？]?')
+
+def train_dictionary(samples: Iterable[str], size: int = MAX_DICTIONARY_SIZE,
+                     min_count: int = 2) -> bytes:
+    """
+    從文章樣本訓練壓縮字典
+
+    統計重複出現的句子、段落標題與領域詞彙，依「出現次數 × 長度」挑選；
+    zlib 對越靠近字典尾端的片段編碼越短，因此價值最高的片段放在最後。
+
+    Args:
+        samples: 文章內容樣本
+        size: 字典大小上限（bytes）
+        min_count: 片段至少出現的次數
+
+    Returns:
+        字典內容
+    """
+    counts = Counter()
+    for text in samples:
+        for line in (text or "").split("\n"):
+            if line.startswith("#"):
+                counts["\n" + line + "\n"] += 1
+        for sentence in _SENTENCE_RE.findall(text or ""):
+            sentence = sentence.strip()
+            if len(sentence) >= 4:
+                counts[sentence] += 1
+
+    segments = [segment for segment, count in counts.items() if count >= min_count]
+    segments.sort(key=lambda segment: counts[segment] * len(segment.encode('utf-8')), reverse=True)
+
+    chosen = []
+    used = 0
+    for segment in SEED_VOCABULARY + segments:
+        data = segment.encode('utf-8')
+        if used + len(data) > size:
+            continue
+        chosen.append(data)
+        used += len(data)
+
+    # 價值最高的片段放在尾端
+    chosen.reverse()
+    return b"".join(chosen)
+
+class ContentCodec:
+    """文章內容編碼器（壓縮結果以 BLOB 儲存，未壓縮內容維持 TEXT）"""
+
+    def __init__(self, dictionaries: Dict[int, bytes] = None, dictionary_id: int = 0,
+                 level: int = 9, min_size: int = 256):
+        """
+        初始化編碼器
+
+        Args:
+            dictionaries: 字典編號對應的字典內容（解壓舊資料也需要舊字典）
+            dictionary_id: 壓縮時使用的字典編號（0 表示不使用字典）
+            level: zlib 壓縮等級
+            min_size: 小於此長度（bytes）的內容不壓縮
+        """
+        self.dictionaries = dict(dictionaries or {})
+        self.dictionary_id = dictionary_id
+        self.level = level
+        self.min_size = min_size
+
+    def encode(self, content: Optional[str]) -> Union[str, bytes, None]:
+        """
+        壓縮內容
+
+        Args:
+            content: 原始內容
+
+        Returns:
+            壓縮後的 bytes；內容過短或壓縮無效益時回傳原字串
+        """
+        if content is None:
+            return None
+
+        data = content.encode('utf-8')
+        if len(data) < self.min_size:
+            return content
+
+        if self.dictionary_id:
+            compressor = zlib.compressobj(self.level, zdict=self.dictionaries[self.dictionary_id])
+        else:
+            compressor = zlib.compressobj(self.level)
+        compressed = _HEADER.pack(self.dictionary_id) + compressor.compress(data) + compressor.flush()
+
+        return compressed if len(compressed) < len(data) else content
+
+    def decode(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """
+        解壓內容（字串原樣回傳）
+
+        Args:
+            value: 資料庫中的內容
+
+        Returns:
+            原始內容
+        """
+        if not isinstance(value, (bytes, memoryview)):
+            return value
+
+        value = bytes(value)
+        (dictionary_id,) = _HEADER.unpack_from(value)
+        if dictionary_id:
+            decompressor = zlib.decompressobj(zdict=self.dictionaries[dictionary_id])
+        else:
+            decompressor = zlib.decompressobj()
+        return (decompressor.decompress(value[_HEADER.size:]) + decompressor.flush()).decode('utf-8')
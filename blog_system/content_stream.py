@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+串流文章內容
+生成中的文章內容逐段寫入緩衝區與草稿檔，後續階段可訂閱或等待足夠的文字後提前開始
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Iterator, Optional
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ContentStream:
+    """
+    只增不減的文字串流（單一寫入者、多個讀取者）
+
+    每個訂閱者各自記錄讀取位置，可從頭迭代所有片段；
+    wait_for 讓只需要開頭文字的階段（例如關鍵字）不必等待整篇完成。
+    """
+
+    def __init__(self, draft_path: str = None):
+        """
+        初始化串流
+
+        Args:
+            draft_path: 草稿檔路徑（可選），片段到達時立即附加寫入
+        """
+        self.draft_path = draft_path
+        self.started_at = time.perf_counter()
+        self.first_chunk_at = None
+        self.finished_at = None
+        self.error = None
+
+        self._chunks = []
+        self._length = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._draft = None
+
+        if draft_path:
+            os.makedirs(os.path.dirname(draft_path) or ".", exist_ok=True)
+            self._draft = open(draft_path, "w", encoding="utf-8")
+
+    @property
+    def text(self) -> str:
+        """目前已收到的文字"""
+        with self._condition:
+            return "".join(self._chunks)
+
+    @property
+    def closed(self) -> bool:
+        """是否已結束（完成或失敗）"""
+        return self._closed
+
+    @property
+    def time_to_first_chunk(self) -> Optional[float]:
+        """從建立到第一個片段的秒數"""
+        if self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.started_at
+
+    def write(self, chunk: str):
+        """
+        附加一個片段並通知訂閱者
+
+        Args:
+            chunk: 文字片段
+        """
+        if not chunk:
+            return
+
+        with self._condition:
+            if self._closed:
+                raise ValueError("串流已結束")
+            if self.first_chunk_at is None:
+                self.first_chunk_at = time.perf_counter()
+
+            self._chunks.append(chunk)
+            self._length += len(chunk)
+            if self._draft:
+                self._draft.write(chunk)
+                self._draft.flush()
+            self._condition.notify_all()
+
+    def close(self, error: Exception = None):
+        """
+        結束串流
+
+        Args:
+            error: 生成失敗時的例外（訂閱者會收到 RuntimeError）
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self.error = error
+            self.finished_at = time.perf_counter()
+            if self._draft:
+                self._draft.close()
+                self._draft = None
+            self._condition.notify_all()
+
+    def wait_for(self, min_chars: int, timeout: float = None) -> str:
+        """
+        等待至少 min_chars 字（或串流結束）後回傳目前的文字
+
+        Args:
+            min_chars: 需要的字數
+            timeout: 最長等待秒數
+
+        Returns:
+            目前已收到的文字
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._length >= min_chars or self._closed, timeout):
+                raise TimeoutError(f"等待串流內容逾時（已收到 {self._length} 字）")
+            if self.error and self._length < min_chars:
+                raise RuntimeError(f"串流生成失敗: {self.error}")
+            return "".join(self._chunks)
+
+    def result(self, timeout: float = None) -> str:
+        """
+        等待串流結束並回傳完整文字
+
+        Args:
+            timeout: 最長等待秒數
+
+        Returns:
+            完整文字
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._closed, timeout):
+                raise TimeoutError("等待串流結束逾時")
+            if self.error:
+                raise RuntimeError(f"串流生成失敗: {self.error}")
+            return "".join(self._chunks)
+
+    def __iter__(self) -> Iterator[str]:
+        """從頭依序迭代所有片段，直到串流結束"""
+        index = 0
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: len(self._chunks) > index or self._closed)
+                chunks = self._chunks[index:]
+                index += len(chunks)
+                finished = self._closed and index == len(self._chunks)
+                error = self.error
+
+            yield from chunks
+            if finished:
+                if error:
+                    raise RuntimeError(f"串流生成失敗: {error}")
+                return
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+本機摘要
+以句子中心性（TF-IDF 餘弦相似度）挑選代表句，組成 100～150 字的擷取式摘要
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from typing import List, Tuple
+
+from blog_manager import BlogManager
+from text_analysis import term_frequencies, tfidf_vector
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 句末標點（保留在句中）
+_SENTENCE_RE = re.compile(r'[^。！？!?\n]+[。！？!?]*')
+# 句末標點
+_TERMINALS = "。！？!?"
+# 行首的 Markdown 標題、清單與引用符號
+_LINE_PREFIX_RE = re.compile(r'^\s*(?:#{1,6}\s|[-*+]\s|\d+[.)]\s|>\s?)')
+
+def split_sentences(text: str) -> List[str]:
+    """
+    將文章切成句子（略過 Markdown 標題行，移除清單符號與粗體標記）
+
+    Args:
+        text: 文章內容
+
+    Returns:
+        句子列表（依原文順序）
+    """
+    sentences = []
+    for line in (text or "").splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        line = _LINE_PREFIX_RE.sub("", line).replace("**", "").strip()
+        sentences.extend(sentence.strip() for sentence in _SENTENCE_RE.findall(line) if sentence.strip())
+    return sentences
+
+class ExtractiveSummarizer:
+    """
+    擷取式摘要
+
+    每個句子以字元 bigram 的 TF-IDF 向量表示，中心性為與其他句子的相似度總和
+    （越能代表全文的句子越高），加上開頭句子的位置加權；
+    依分數挑選並懲罰與已選句子重複的內容，最後依原文順序組合。
+    """
+
+    def __init__(self, min_chars: int = 100, max_chars: int = 150, min_sentence_chars: int = 8,
+                 lead_weight: float = 0.3, redundancy: float = 0.7):
+        """
+        初始化摘要器
+
+        Args:
+            min_chars: 摘要最少字數（不足時繼續加入句子）
+            max_chars: 摘要最多字數
+            min_sentence_chars: 短於此字數的句子不列入候選
+            lead_weight: 開頭句子的位置加權
+            redundancy: 與已選句子相似度的懲罰係數
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.min_sentence_chars = min_sentence_chars
+        self.lead_weight = lead_weight
+        self.redundancy = redundancy
+
+    def summarize(self, text: str, max_chars: int = None) -> str:
+        """
+        產生摘要
+
+        Args:
+            text: 文章內容
+            max_chars: 摘要最多字數（預設為 max_chars）
+
+        Returns:
+            摘要文字
+        """
+        max_chars = max_chars or self.max_chars
+        # 重複的句子只保留第一次出現；完整句子足夠時略過清單中沒有句點的片段
+        sentences = list(dict.fromkeys(s for s in split_sentences(text) if len(s) >= self.min_sentence_chars))
+        complete = [s for s in sentences if s[-1] in _TERMINALS]
+        if len(complete) >= 3:
+            sentences = complete
+        sentences = [s if s[-1] in _TERMINALS else s + "。" for s in sentences]
+        if not sentences:
+            return (text or "").strip()[:max_chars]
+
+        scores, vectors = self._score(sentences)
+        chosen: List[int] = []
+        length = 0
+
+        while length < self.min_chars:
+            best, best_score = None, -math.inf
+            for index, score in enumerate(scores):
+                if index in chosen or length + len(sentences[index]) > max_chars:
+                    continue
+                overlap = max((_cosine(vectors[index], vectors[other]) for other in chosen), default=0.0)
+                adjusted = score - self.redundancy * overlap * score
+                if adjusted > best_score:
+                    best, best_score = index, adjusted
+            if best is None:
+                break
+            chosen.append(best)
+            length += len(sentences[best])
+
+        if not chosen:
+            # 最重要的句子本身超過上限時截斷
+            top = max(range(len(sentences)), key=lambda i: scores[i])
+            return sentences[top][:max_chars - 1] + "…"
+
+        return "".join(sentences[index] for index in sorted(chosen))
+
+    def _score(self, sentences: List[str]) -> Tuple[List[float], List[dict]]:
+        """句子中心性 × 位置加權"""
+        counts = [term_frequencies([(sentence, 1)]) for sentence in sentences]
+        document_frequencies = Counter()
+        for sentence_counts in counts:
+            document_frequencies.update(sentence_counts.keys())
+        vectors = [tfidf_vector(c, document_frequencies, len(sentences)) for c in counts]
+
+        scores = []
+        for i, vector in enumerate(vectors):
+            centrality = sum(_cosine(vector, other) for j, other in enumerate(vectors) if j != i)
+            position = 1.0 + self.lead_weight / (1 + i)
+            scores.append(centrality * position)
+        return scores, vectors
+
+def _cosine(a: dict, b: dict) -> float:
+    """兩個 L2 正規化稀疏向量的餘弦相似度"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+def main():
+    """主函數 - 為既有文章產生本機摘要"""
+    manager = BlogManager()
+    summarizer = ExtractiveSummarizer()
+
+    print("=== 本機摘要 ===")
+    for article in manager.get_articles(limit=5):
+        print(f"{article.title}\n  {summarizer.summarize(article.content)}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+文章生成用量統計
+記錄每次 LLM 呼叫的耗時、token 數與重試次數，依階段與文章彙總並匯出 JSON
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 每 1000 token 的美元價格（輸入, 輸出），可依實際方案覆寫
+DEFAULT_PRICES = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+}
+
+@dataclass
+class CallRecord:
+    """單次 LLM 呼叫"""
+    stage: str  # 生成階段
+    article_id: Optional[str]  # 所屬文章（單獨呼叫時為 None）
+    model: str  # 模型名稱
+    wall_seconds: float  # 呼叫耗時（含速率限制等待與重試）
+    prompt_tokens: int  # 提示詞 token 數
+    completion_tokens: int  # 輸出 token 數
+    retries: int = 0  # 429 重試次數
+    cached: bool = False  # 是否命中回應快取（不計 token）
+    estimated: bool = False  # token 數是否為字數估計（後端未回報用量時）
+    ok: bool = True  # 是否成功
+    timestamp: float = field(default_factory=time.time)
+
+@dataclass
+class ArticleRecord:
+    """單篇文章"""
+    article_id: str
+    category: str
+    topic: str
+    wall_seconds: float  # 端到端耗時
+    ok: bool
+    stage_seconds: Dict[str, float] = field(default_factory=dict)  # 各階段執行秒數
+    timestamp: float = field(default_factory=time.time)
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """最近排名法百分位數"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class GenerationMetrics:
+    """生成用量統計（執行緒安全，保留最近 max_records 筆紀錄）"""
+
+    def __init__(self, prices: Dict[str, Tuple[float, float]] = None, max_records: int = 100000):
+        """
+        初始化統計
+
+        Args:
+            prices: 模型 -> (輸入, 輸出) 每 1000 token 美元價格
+            max_records: 保留的呼叫與文章紀錄上限
+        """
+        self.prices = DEFAULT_PRICES if prices is None else prices
+        self._calls = deque(maxlen=max_records)
+        self._articles = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record_call(self, record: CallRecord):
+        """記錄一次 LLM 呼叫"""
+        with self._lock:
+            self._calls.append(record)
+
+    def record_article(self, record: ArticleRecord):
+        """記錄一篇文章的生成結果"""
+        with self._lock:
+            self._articles.append(record)
+
+    def reset(self):
+        """清除所有紀錄"""
+        with self._lock:
+            self._calls.clear()
+            self._articles.clear()
+
+    def cost(self, record: CallRecord) -> float:
+        """單次呼叫的估計費用（美元）"""
+        input_price, output_price = self.prices.get(record.model, (0.0, 0.0))
+        return (record.prompt_tokens * input_price + record.completion_tokens * output_price) / 1000
+
+    def report(self) -> Dict:
+        """
+        彙總報告
+
+        Returns:
+            含總計、各階段（呼叫數、快取命中、失敗、重試、token、費用占比、耗時百分位數）
+            與文章層級（篇數、成功率、耗時、平均 token）的字典
+        """
+        with self._lock:
+            calls = list(self._calls)
+            articles = list(self._articles)
+
+        totals = self._aggregate(calls)
+        stages = {}
+        for stage in dict.fromkeys(record.stage for record in calls):
+            stats = self._aggregate([record for record in calls if record.stage == stage])
+            stats["token_share"] = stats["total_tokens"] / totals["total_tokens"] if totals["total_tokens"] else 0.0
+            stats["cost_share"] = stats["cost_usd"] / totals["cost_usd"] if totals["cost_usd"] else 0.0
+            stages[stage] = stats
+
+        tokens_by_article = {}
+        for record in calls:
+            if record.article_id is not None:
+                tokens_by_article[record.article_id] = (
+                    tokens_by_article.get(record.article_id, 0) + record.prompt_tokens + record.completion_tokens
+                )
+        durations = [record.wall_seconds for record in articles]
+        succeeded = [record for record in articles if record.ok]
+
+        return {
+            "totals": totals,
+            "stages": stages,
+            "articles": {
+                "count": len(articles),
+                "ok": len(succeeded),
+                "wall_mean": sum(durations) / len(durations) if durations else 0.0,
+                "wall_p50": _percentile(durations, 0.5),
+                "wall_p95": _percentile(durations, 0.95),
+                "tokens_mean": (
+                    sum(tokens_by_article.get(record.article_id, 0) for record in succeeded) / len(succeeded)
+                    if succeeded else 0.0
+                ),
+            }
+        }
+
+    def article_report(self, article_id: str) -> Dict:
+        """
+        單篇文章的各階段用量
+
+        Args:
+            article_id: 文章 ID
+
+        Returns:
+            {"article": 文章紀錄或 None, "stages": {階段: 彙總}}
+        """
+        with self._lock:
+            calls = [record for record in self._calls if record.article_id == article_id]
+            article = next((record for record in reversed(self._articles) if record.article_id == article_id), None)
+
+        return {
+            "article": asdict(article) if article else None,
+            "stages": {
+                stage: self._aggregate([record for record in calls if record.stage == stage])
+                for stage in dict.fromkeys(record.stage for record in calls)
+            }
+        }
+
+    def export_json(self, path: str, include_records: bool = True):
+        """
+        匯出報告（與原始紀錄）為 JSON
+
+        Args:
+            path: 輸出檔案路徑
+            include_records: 是否包含每次呼叫與每篇文章的紀錄
+        """
+        data = {"generated_at": time.time(), "report": self.report()}
+        if include_records:
+            with self._lock:
+                data["calls"] = [asdict(record) for record in self._calls]
+                data["articles"] = [asdict(record) for record in self._articles]
+
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            logger.info(f"生成用量已匯出至 {path}")
+        except Exception as e:
+            logger.error(f"匯出生成用量失敗: {e}")
+
+    def _aggregate(self, calls: List[CallRecord]) -> Dict:
+        """彙總一組呼叫紀錄"""
+        durations = [record.wall_seconds for record in calls]
+        prompt_tokens = sum(record.prompt_tokens for record in calls)
+        completion_tokens = sum(record.completion_tokens for record in calls)
+        return {
+            "calls": len(calls),
+            "cached": sum(record.cached for record in calls),
+            "failed": sum(not record.ok for record in calls),
+            "retries": sum(record.retries for record in calls),
+            "estimated": sum(record.estimated for record in calls),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cost_usd": sum(self.cost(record) for record in calls),
+            "wall_total": sum(durations),
+            "wall_mean": sum(durations) / len(durations) if durations else 0.0,
+            "wall_p50": _percentile(durations, 0.5),
+            "wall_p95": _percentile(durations, 0.95),
+        }
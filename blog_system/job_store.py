@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+文章生成工作紀錄
+以 SQLite 保存每篇文章的生成工作與各階段結果，失敗或程式重啟後從最後完成的階段續跑
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class JobStore:
+    """
+    生成工作與階段檢查點
+
+    每篇文章一筆工作（工作 ID 即文章 ID，續跑時沿用），每個完成的階段寫入一筆檢查點；
+    以備援結果完成的階段（API 失敗時的替代值）標記為 degraded，續跑時重新執行。
+    工作狀態為 pending（尚未開始）、running、failed（可續跑）、abandoned（達到嘗試上限或無法執行，
+    不再續跑）或 done（文章已生成）；嘗試次數跨續跑累計。
+    批次生成的所有工作在開始時一次建立（主題可在執行時才決定），重啟後依批次 ID 找回未完成的工作。
+    """
+
+    def __init__(self, db_path: str = "data/jobs.db"):
+        """
+        初始化工作紀錄
+
+        Args:
+            db_path: 資料庫檔案路徑
+        """
+        self.db_path = db_path
+        self.init_database()
+
+    def init_database(self):
+        """初始化資料表"""
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS generation_jobs (
+                    id TEXT PRIMARY KEY,
+                    batch_id TEXT,
+                    seq INTEGER NOT NULL DEFAULT 0,
+                    category TEXT NOT NULL,
+                    topic TEXT,
+                    market_data TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    article TEXT,
+                    saved INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS generation_checkpoints (
+                    job_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    duration REAL,
+                    created_at REAL NOT NULL,
+                    degraded INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (job_id, stage)
+                )
+            ''')
+            cursor.execute('PRAGMA table_info(generation_checkpoints)')
+            if 'degraded' not in [column[1] for column in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE generation_checkpoints ADD COLUMN degraded INTEGER NOT NULL DEFAULT 0')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_generation_jobs_batch ON generation_jobs(batch_id, seq)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_generation_jobs_status ON generation_jobs(status)')
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"工作紀錄初始化失敗: {e}")
+
+    def create_jobs(self, jobs: List[Dict], batch_id: str = None):
+        """
+        建立工作
+
+        Args:
+            jobs: [{"id", "category", "topic"（可為 None）, "market_data"（可選）}]
+            batch_id: 批次 ID（可選）
+        """
+        now = time.time()
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany('''
+            INSERT INTO generation_jobs (id, batch_id, seq, category, topic, market_data, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (job["id"], batch_id, seq, job["category"], job.get("topic"),
+             json.dumps(job.get("market_data"), ensure_ascii=False), now, now)
+            for seq, job in enumerate(jobs)
+        ])
+        conn.commit()
+        conn.close()
+
+    def create_job(self, job_id: str, category: str, topic: str, market_data: Dict = None):
+        """建立單篇文章的工作"""
+        self.create_jobs([{"id": job_id, "category": category, "topic": topic, "market_data": market_data}])
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        讀取工作
+
+        Returns:
+            工作字典（含 market_data 與 article 的解碼結果）；不存在時回傳 None
+        """
+        rows = self._select('WHERE id = ?', (job_id,))
+        return rows[0] if rows else None
+
+    def batch_jobs(self, batch_id: str) -> List[Dict]:
+        """批次中的所有工作（依建立順序）"""
+        return self._select('WHERE batch_id = ? ORDER BY seq', (batch_id,))
+
+    def unfinished_jobs(self, batch_id: str = None) -> List[Dict]:
+        """尚未完成的工作（可限定批次；不含已放棄的工作）"""
+        if batch_id is None:
+            return self._select("WHERE status NOT IN ('done', 'abandoned') ORDER BY created_at, seq")
+        return self._select("WHERE batch_id = ? AND status NOT IN ('done', 'abandoned') ORDER BY seq", (batch_id,))
+
+    def unfinished_batches(self) -> List[Dict]:
+        """
+        有未完成（或已完成但尚未交付）工作的批次；只剩已放棄工作的批次視為結束
+
+        Returns:
+            [{"batch_id", "jobs", "done", "created_at"}]，依建立時間排序
+        """
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('''
+            SELECT batch_id, COUNT(*), SUM(status = 'done'), MIN(created_at)
+            FROM generation_jobs WHERE batch_id IS NOT NULL
+            GROUP BY batch_id HAVING SUM(status != 'abandoned' AND (status != 'done' OR saved = 0)) > 0
+            ORDER BY MIN(created_at)
+        ''').fetchall()
+        conn.close()
+        return [{"batch_id": row[0], "jobs": row[1], "done": row[2], "created_at": row[3]} for row in rows]
+
+    def start(self, job_id: str, topic: str = None):
+        """
+        標記工作開始執行
+
+        Args:
+            job_id: 工作 ID
+            topic: 執行時才決定的主題（可選）
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE generation_jobs
+            SET status = 'running', topic = COALESCE(?, topic), attempts = attempts + 1, updated_at = ?
+            WHERE id = ?
+        ''', (topic, time.time(), job_id))
+        conn.commit()
+        conn.close()
+
+    def checkpoint(self, job_id: str, stage: str, result: Any, duration: float = None, degraded: bool = False):
+        """
+        保存階段結果（須可 JSON 序列化）
+
+        Args:
+            job_id: 工作 ID
+            stage: 階段名稱
+            result: 階段結果
+            duration: 執行秒數
+            degraded: 是否為備援結果（續跑時不沿用）
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('''
+                INSERT OR REPLACE INTO generation_checkpoints (job_id, stage, result, duration, created_at, degraded)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (job_id, stage, json.dumps(result, ensure_ascii=False), duration, time.time(), int(degraded)))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"保存階段檢查點失敗: {e}")
+
+    def checkpoints(self, job_id: str, include_degraded: bool = False) -> Dict[str, Any]:
+        """
+        讀取已完成的階段結果
+
+        Args:
+            job_id: 工作 ID
+            include_degraded: 是否包含備援結果（預設不含，續跑時重新執行這些階段）
+
+        Returns:
+            階段名稱 -> 結果
+        """
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('''
+            SELECT stage, result FROM generation_checkpoints WHERE job_id = ? AND (degraded = 0 OR ?)
+        ''', (job_id, int(include_degraded))).fetchall()
+        conn.close()
+        return {stage: json.loads(result) for stage, result in rows}
+
+    def fail(self, job_id: str, error: str):
+        """標記工作失敗（保留檢查點供續跑）"""
+        self._set_status(job_id, "failed", error=error)
+
+    def abandon(self, job_id: str, error: str = None):
+        """
+        標記工作放棄（達到嘗試上限或無法執行），之後不再續跑，批次也不再因它而視為未完成
+
+        Args:
+            job_id: 工作 ID
+            error: 放棄原因（未指定時保留原本的錯誤訊息）
+        """
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE generation_jobs SET status = 'abandoned', error = COALESCE(?, error), updated_at = ?
+            WHERE id = ?
+        ''', (error, time.time(), job_id))
+        conn.commit()
+        conn.close()
+
+    def complete(self, job_id: str, article: Dict):
+        """
+        標記工作完成並保存文章（檢查點已不需要，一併刪除）
+
+        Args:
+            job_id: 工作 ID
+            article: 文章字典
+        """
+        self._set_status(job_id, "done", article=json.dumps(article, ensure_ascii=False))
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('DELETE FROM generation_checkpoints WHERE job_id = ?', (job_id,))
+        conn.commit()
+        conn.close()
+
+    def mark_saved(self, job_ids: List[str]):
+        """標記文章已交付（已寫入儲存端或回傳給呼叫端，續跑時不再重新儲存）"""
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany('UPDATE generation_jobs SET saved = 1 WHERE id = ?', [(job_id,) for job_id in job_ids])
+        conn.commit()
+        conn.close()
+
+    def prune(self, max_age: float = 30 * 86400) -> int:
+        """
+        刪除已完成且已儲存、或已放棄的舊工作
+
+        Args:
+            max_age: 保留秒數
+
+        Returns:
+            刪除的工作數
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.execute('''
+            DELETE FROM generation_jobs
+            WHERE ((status = 'done' AND saved = 1) OR status = 'abandoned') AND updated_at < ?
+        ''', (time.time() - max_age,))
+        count = cursor.rowcount
+        conn.execute('DELETE FROM generation_checkpoints WHERE job_id NOT IN (SELECT id FROM generation_jobs)')
+        conn.commit()
+        conn.close()
+        return count
+
+    def _set_status(self, job_id: str, status: str, error: str = None, article: str = None):
+        """更新工作狀態"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            UPDATE generation_jobs SET status = ?, error = ?, article = COALESCE(?, article), updated_at = ?
+            WHERE id = ?
+        ''', (status, error, article, time.time(), job_id))
+        conn.commit()
+        conn.close()
+
+    def _select(self, where: str, params: tuple = ()) -> List[Dict]:
+        """查詢工作並解碼 JSON 欄位"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(f'SELECT * FROM generation_jobs {where}', params).fetchall()
+        conn.close()
+
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job["market_data"] = json.loads(job["market_data"]) if job["market_data"] else None
+            job["article"] = json.loads(job["article"]) if job["article"] else None
+            jobs.append(job)
+        return jobs
+
+def main():
+    """主函數 - 列出未完成的生成批次"""
+    store = JobStore()
+
+    print("=== 未完成的生成批次 ===")
+    for batch in store.unfinished_batches():
+        print(f"{batch['batch_id']}：{batch['done']}/{batch['jobs']} 篇完成")
+    for job in store.unfinished_jobs():
+        stages = ", ".join(store.checkpoints(job["id"])) or "無"
+        print(f"{job['id']} {job['category']} - {job['topic']}：{job['status']}（已完成階段：{stages}）")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+本機關鍵字提取
+以字元 n-gram 的 TF-IDF 從繁體中文文章提取 SEO 關鍵字，IDF 由既有文章語料統計
+"""
+
+import json
+import logging
+import math
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable, List, Set
+
+from blog_manager import BlogManager
+from text_analysis import cjk_runs, idf, latin_words
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 出現在候選詞開頭或結尾時，幾乎必定是跨詞的片段（虛詞、代詞、量詞等）
+_BOUNDARY_CHARS = set("的了是在和與及或也都而並於就其這那之被把讓很更但若則即我你他們此亦一個些有不可要等以為將對從到如")
+# 出現在候選詞中間時表示跨越兩個詞（如「技術面與基本面」切出的「術面與基」）
+_JOINER_CHARS = set("的與和及或並")
+
+class KeywordExtractor:
+    """
+    字元 n-gram TF-IDF 關鍵字提取器
+
+    候選詞為 2～max_n 字的中文 n-gram、英文字詞與語料中既有的標籤／SEO 關鍵字；
+    幾乎總是緊鄰同一個字的 n-gram 視為更長片段的一部分而捨棄，
+    依 TF-IDF 與長度排序後，略過與已選關鍵字重疊的候選詞。
+    """
+
+    def __init__(self, manager: BlogManager = None, min_n: int = 2, max_n: int = 4,
+                 sample_size: int = 2000, lexicon_boost: float = 1.5, title_boost: float = 1.5,
+                 extra_terms: Iterable[str] = ()):
+        """
+        初始化提取器
+
+        Args:
+            manager: 部落格管理器（提供 IDF 語料與既有標籤；None 表示不使用語料）
+            min_n: 中文 n-gram 最短字數
+            max_n: 中文 n-gram 最長字數
+            sample_size: 統計 IDF 的文章數上限（超過時隨機抽樣）
+            lexicon_boost: 既有標籤／關鍵字的加權
+            title_boost: 同時出現在標題的加權
+            extra_terms: 額外加入詞庫的詞
+        """
+        self.manager = manager
+        self.min_n = min_n
+        self.max_n = max_n
+        self.sample_size = sample_size
+        self.lexicon_boost = lexicon_boost
+        self.title_boost = title_boost
+
+        self.document_frequencies: Dict[str, int] = {}
+        self.total_documents = 0
+        self.lexicon: Set[str] = set(extra_terms)
+
+        if manager is not None:
+            self.fit_corpus()
+
+    def fit_corpus(self) -> bool:
+        """
+        從 blog_posts 統計文件頻率並收集既有標籤與 SEO 關鍵字
+
+        Returns:
+            是否成功
+        """
+        try:
+            conn = sqlite3.connect(self.manager.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT title, summary, content, tags, seo_keywords FROM blog_posts
+                ORDER BY random() LIMIT ?
+            ''', (self.sample_size,))
+            rows = cursor.fetchall()
+            conn.close()
+
+            lexicon = set()
+            documents = []
+            for title, summary, content, tags, seo_keywords in rows:
+                for field in (tags, seo_keywords):
+                    lexicon.update(term.strip() for term in (json.loads(field) if field else []) if term.strip())
+                documents.append(" ".join([title or "", summary or "", self.manager.decode_content(content) or ""]))
+
+            self.lexicon.update(lexicon)
+            self.fit(documents)
+            logger.info(f"關鍵字 IDF 統計完成：{self.total_documents} 篇文章，詞庫 {len(self.lexicon)} 個詞")
+            return True
+
+        except Exception as e:
+            logger.error(f"統計關鍵字 IDF 失敗: {e}")
+            return False
+
+    def fit(self, documents: List[str]):
+        """
+        以文件列表統計文件頻率（只出現在一篇的詞不保存，IDF 與未出現幾乎相同）
+
+        Args:
+            documents: 文件文字列表
+        """
+        counts = Counter()
+        for document in documents:
+            terms = self._ngrams(document)
+            terms.update(word.lower() for word in latin_words(document))
+            # 超過 n-gram 長度或中英混合的詞庫詞，以子字串判斷是否出現
+            terms.update(term for term in self.lexicon if term not in terms and term in document)
+            counts.update(terms)
+
+        self.document_frequencies = {term: df for term, df in counts.items() if df > 1}
+        self.total_documents = len(documents)
+
+    def extract(self, text: str, top_k: int = 8, title: str = None) -> List[str]:
+        """
+        提取關鍵字
+
+        Args:
+            text: 文章內容
+            top_k: 關鍵字數
+            title: 標題（可選，內文中的候選詞同時出現在標題時加權）
+
+        Returns:
+            依重要性排序的關鍵字列表
+        """
+        counts = Counter()
+        left: Dict[str, Counter] = {}
+        right: Dict[str, Counter] = {}
+        for run in cjk_runs(text):
+            for n in range(self.min_n, self.max_n + 1):
+                for start in range(len(run) - n + 1):
+                    gram = run[start:start + n]
+                    counts[gram] += 1
+                    left.setdefault(gram, Counter())[run[start - 1] if start > 0 else None] += 1
+                    right.setdefault(gram, Counter())[run[start + n] if start + n < len(run) else None] += 1
+
+        candidates = {
+            gram: count for gram, count in counts.items()
+            if count >= 2 and gram[0] not in _BOUNDARY_CHARS and gram[-1] not in _BOUNDARY_CHARS
+            and not _JOINER_CHARS.intersection(gram[1:-1])
+            and not self._embedded(gram, count, left[gram], right[gram])
+        }
+        for word, count in Counter(latin_words(text)).items():
+            if len(word) >= 2:
+                candidates[word] = count
+        for term in self.lexicon:
+            count = text.count(term)
+            if count:
+                candidates[term] = count
+
+        scores = {term: self._score(term, count) for term, count in candidates.items()}
+        if title:
+            for term in scores:
+                if term in title:
+                    scores[term] *= self.title_boost
+        keywords = []
+        for term in sorted(scores, key=lambda t: (-scores[t], t)):
+            if any(self._overlaps(term, chosen) for chosen in keywords):
+                continue
+            keywords.append(term)
+            if len(keywords) >= top_k:
+                break
+        return keywords
+
+    def _score(self, term: str, count: int) -> float:
+        """TF-IDF × 長度加權（長尾詞優先）× 詞庫加權"""
+        document_frequency = self.document_frequencies.get(term.lower() if term.isascii() else term, 0)
+        weight = (1.0 + math.log(count)) * idf(document_frequency, self.total_documents)
+        weight *= 1.0 + 0.2 * (len(term) - 2) if not term.isascii() else 1.0
+        if term in self.lexicon:
+            weight *= self.lexicon_boost
+        return weight
+
+    def _embedded(self, gram: str, count: int, left: Counter, right: Counter) -> bool:
+        """n-gram 是否幾乎總是接在同一個字旁（是更長片段的一部分，由較長的候選詞代表或整段捨棄）"""
+        if gram in self.lexicon:
+            return False
+        for neighbors in (left, right):
+            neighbor, frequency = neighbors.most_common(1)[0]
+            if neighbor is not None and frequency >= 0.8 * count:
+                return True
+        return False
+
+    @staticmethod
+    def _overlaps(term: str, chosen: str) -> bool:
+        """
+        候選詞與已選關鍵字是否為同一片段：候選詞是其子字串、兩者只差一字（錯位切出的 n-gram），
+        或三字以上的候選詞與其首尾只重疊一字（如「基本面」之後的「面分析」）
+        """
+        if term in chosen:
+            return True
+        if len(term) >= 3 and (term[0] == chosen[-1] or term[-1] == chosen[0]):
+            return True
+        shorter = min(len(term), len(chosen))
+        if shorter < 3:
+            return False
+        return _longest_common_substring(term, chosen) >= shorter - 1
+
+    def _ngrams(self, text: str) -> Set[str]:
+        """文字中所有不重複的中文 n-gram"""
+        grams = set()
+        for run in cjk_runs(text):
+            for n in range(self.min_n, self.max_n + 1):
+                grams.update(run[start:start + n] for start in range(len(run) - n + 1))
+        return grams
+
+def _longest_common_substring(a: str, b: str) -> int:
+    """最長共同子字串長度（短字串用動態規劃即可）"""
+    best = 0
+    previous = [0] * (len(b) + 1)
+    for i in range(1, len(a) + 1):
+        current = [0] * (len(b) + 1)
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                current[j] = previous[j - 1] + 1
+                best = max(best, current[j])
+        previous = current
+    return best
+
+def main():
+    """主函數 - 從既有文章提取關鍵字"""
+    manager = BlogManager()
+    extractor = KeywordExtractor(manager)
+
+    print("=== 本機關鍵字提取 ===")
+    for article in manager.get_articles(limit=5):
+        print(f"{article.title}：{', '.join(extractor.extract(article.content, title=article.title))}")
+
+if __name__ == "__main__":
+    main()
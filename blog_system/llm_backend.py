@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+LLM 後端
+BlogGenerator 透過後端介面呼叫模型：OpenAI 實作供正式使用，
+本機替身回傳固定格式的內容並模擬延遲，供離線測試與吞吐量基準測試
+"""
+
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Completion:
+    """一次呼叫的回應"""
+    text: str  # 回應文字
+    prompt_tokens: Optional[int] = None  # 提示詞 token 數（後端未提供時為 None）
+    completion_tokens: Optional[int] = None  # 輸出 token 數
+    total_tokens: Optional[int] = None  # 總 token 數
+
+class LLMBackend:
+    """後端介面"""
+
+    name = "base"
+
+    def complete(self, model: str, messages: List[Dict], params: Dict, stage: str = None) -> Completion:
+        """
+        呼叫模型並等待完整回應
+
+        Args:
+            model: 模型名稱
+            messages: 對話訊息
+            params: 其他參數（temperature、max_tokens 等）
+            stage: 生成階段名稱（僅供替身或記錄使用）
+
+        Returns:
+            Completion 物件
+        """
+        raise NotImplementedError
+
+    def stream(self, model: str, messages: List[Dict], params: Dict, stage: str = None) -> Iterator[str]:
+        """
+        串流呼叫模型（預設退化為一次回傳完整內容）
+
+        Returns:
+            文字片段迭代器
+        """
+        return iter([self.complete(model, messages, params, stage).text])
+
+    def is_rate_limit_error(self, error: Exception) -> bool:
+        """是否為速率限制錯誤（HTTP 429）"""
+        return getattr(error, "http_status", None) == 429 or getattr(error, "status_code", None) == 429
+
+    def retry_after(self, error: Exception) -> Optional[float]:
+        """從錯誤的回應標頭取得 Retry-After 秒數"""
+        headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            return float(headers.get("retry-after") or headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+class OpenAIBackend(LLMBackend):
+    """OpenAI Chat Completions（支援 openai 1.x 用戶端與舊版 ChatCompletion 介面）"""
+
+    name = "openai"
+
+    def __init__(self, api_key: str):
+        """
+        初始化 OpenAI 後端（此時才載入 openai 套件）
+
+        Args:
+            api_key: OpenAI API 金鑰
+        """
+        import openai
+
+        self._openai = openai
+        if hasattr(openai, "OpenAI"):
+            self._client = openai.OpenAI(api_key=api_key)
+        else:
+            openai.api_key = api_key
+            self._client = None
+
+    def complete(self, model: str, messages: List[Dict], params: Dict, stage: str = None) -> Completion:
+        """呼叫 Chat Completions"""
+        response = self._create(model=model, messages=messages, **params)
+        usage = getattr(response, "usage", None)
+        return Completion(
+            text=response.choices[0].message.content,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+            total_tokens=getattr(usage, "total_tokens", None)
+        )
+
+    def stream(self, model: str, messages: List[Dict], params: Dict, stage: str = None) -> Iterator[str]:
+        """串流呼叫 Chat Completions，逐一產出增量文字"""
+        # 先建立連線再回傳產生器，讓 429 在開始讀取前就拋出
+        response = self._create(model=model, messages=messages, stream=True, **params)
+        return self._deltas(response)
+
+    def is_rate_limit_error(self, error: Exception) -> bool:
+        """是否為速率限制錯誤（同時辨識新舊版的 RateLimitError）"""
+        for namespace in (self._openai, getattr(self._openai, "error", None)):
+            rate_limit_error = getattr(namespace, "RateLimitError", None)
+            if isinstance(rate_limit_error, type) and isinstance(error, rate_limit_error):
+                return True
+        return super().is_rate_limit_error(error)
+
+    def _create(self, **kwargs):
+        """依套件版本呼叫對應的 API"""
+        if self._client is not None:
+            return self._client.chat.completions.create(**kwargs)
+        return self._openai.ChatCompletion.create(**kwargs)
+
+    @staticmethod
+    def _deltas(response) -> Iterator[str]:
+        """讀取串流回應的增量片段"""
+        for chunk in response:
+            if not chunk.choices:
+                continue
+            piece = getattr(chunk.choices[0].delta, "content", None)
+            if piece:
+                yield piece
+
+# 替身回應使用的詞彙
+_STUB_TERMS = ["黃金", "投資", "金價", "避險", "通膨", "央行", "美元", "利率", "黃金ETF", "資產配置"]
+
+class StubBackend(LLMBackend):
+    """
+    本機替身後端
+
+    依階段回傳固定格式的內容（同一請求永遠得到相同回應），
+    延遲為固定的首個 token 延遲加上依輸出長度計算的生成時間。
+    """
+
+    name = "stub"
+
+    def __init__(self, first_token_latency: float = 0.0, tokens_per_second: float = 0.0,
+                 stage_latencies: Dict[str, float] = None, content_chars: int = 1800,
+                 chunk_chars: int = 20):
+        """
+        初始化替身後端
+
+        Args:
+            first_token_latency: 每次呼叫的固定延遲（秒）
+            tokens_per_second: 模擬的輸出速度（0 表示不模擬生成時間）
+            stage_latencies: 覆寫特定階段的固定延遲
+            content_chars: 文章內容的字數
+            chunk_chars: 串流時每個片段的字數
+        """
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.stage_latencies = stage_latencies or {}
+        self.content_chars = content_chars
+        self.chunk_chars = chunk_chars
+
+        self.calls = 0
+        self.stage_calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def complete(self, model: str, messages: List[Dict], params: Dict, stage: str = None) -> Completion:
+        """回傳替身內容（延遲後一次回傳）"""
+        text = self.respond(messages, stage)
+        self._record(stage)
+        time.sleep(self._latency(stage) + self._generation_time(text))
+        return self._completion(messages, text)
+
+    def stream(self, model: str, messages: List[Dict], params: Dict, stage: str = None) -> Iterator[str]:
+        """回傳替身內容（首個片段前等待固定延遲，之後依輸出速度產出）"""
+        text = self.respond(messages, stage)
+        self._record(stage)
+        time.sleep(self._latency(stage))
+
+        def chunks():
+            for start in range(0, len(text), self.chunk_chars):
+                piece = text[start:start + self.chunk_chars]
+                time.sleep(self._generation_time(piece))
+                yield piece
+        return chunks()
+
+    def respond(self, messages: List[Dict], stage: str = None) -> str:
+        """
+        產生替身回應（以訊息雜湊為亂數種子，結果可重現）
+
+        Args:
+            messages: 對話訊息
+            stage: 生成階段名稱
+
+        Returns:
+            回應文字
+        """
+        digest = hashlib.sha256(json.dumps(messages, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+        rng = random.Random(digest)
+        terms = rng.sample(_STUB_TERMS, 5)
+
+        if stage == "title":
+            return f"{terms[0]}與{terms[1]}：2025 年{terms[2]}完整指南"
+        if stage == "outline":
+            return json.dumps({
+                "title": f"{terms[0]}{terms[1]}入門",
+                "sections": [
+                    {"heading": f"{term}的基本概念", "points": [f"{term}重點一", f"{term}重點二"]}
+                    for term in terms[:3]
+                ],
+                "key_points": terms[:3],
+                "practical_tips": [f"定期檢視{terms[3]}", f"留意{terms[4]}的變化"],
+                "summary": f"{terms[3]}與{terms[4]}的長期觀點"
+            }, ensure_ascii=False)
+        if stage == "summary":
+            return f"本文介紹{terms[0]}、{terms[1]}與{terms[2]}的關係，並說明台灣投資者如何運用{terms[3]}進行{terms[4]}。"
+        if stage == "keywords":
+            return ", ".join(terms)
+
+        paragraphs = []
+        length = 0
+        while length < self.content_chars:
+            a, b = rng.sample(_STUB_TERMS, 2)
+            paragraph = f"{a}與{b}的走勢密切相關，投資人應留意{rng.choice(_STUB_TERMS)}的變化並分散風險。"
+            paragraphs.append(paragraph)
+            length += len(paragraph)
+        return "\n\n".join(paragraphs)
+
+    def _latency(self, stage: Optional[str]) -> float:
+        """固定延遲"""
+        return self.stage_latencies.get(stage, self.first_token_latency)
+
+    def _generation_time(self, text: str) -> float:
+        """依輸出長度計算生成時間（中文約每字 1 token）"""
+        return len(text) / self.tokens_per_second if self.tokens_per_second else 0.0
+
+    def _record(self, stage: Optional[str]):
+        """記錄呼叫次數"""
+        with self._lock:
+            self.calls += 1
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+
+    @staticmethod
+    def _completion(messages: List[Dict], text: str) -> Completion:
+        """以字數估計 token 用量"""
+        prompt_tokens = sum(len(message["content"]) for message in messages)
+        return Completion(text, prompt_tokens, len(text), prompt_tokens + len(text))
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+LLM 回應快取
+以 (模型, 訊息, 參數) 的雜湊為鍵保存回應，重跑或部分重試時不再重複呼叫 API
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def cache_key(model: str, messages: List[Dict], params: Dict) -> str:
+    """
+    計算快取鍵
+
+    Args:
+        model: 模型名稱
+        messages: 對話訊息
+        params: 其他參數（temperature、max_tokens 等）
+
+    Returns:
+        SHA-256 十六進位字串
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class LLMResponseCache:
+    """持久化的 LLM 回應快取（SQLite，含 TTL 與容量上限）"""
+
+    def __init__(self, db_path: str = "data/llm_cache.db", ttl: float = 7 * 86400,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """
+        初始化快取
+
+        Args:
+            db_path: 快取資料庫路徑
+            ttl: 回應的有效秒數
+            max_bytes: 快取內容總大小上限，超過時淘汰最久未使用的項目
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.init_database()
+
+    def init_database(self):
+        """初始化快取資料表"""
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used)')
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"LLM 快取初始化失敗: {e}")
+
+    def get(self, model: str, messages: List[Dict], params: Dict) -> Optional[str]:
+        """
+        讀取快取的回應
+
+        Returns:
+            回應文字；未命中或已過期時回傳 None
+        """
+        key = cache_key(model, messages, params)
+        now = time.time()
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('SELECT response, created_at FROM llm_responses WHERE key = ?', (key,))
+            row = cursor.fetchone()
+
+            if row and now - row[1] <= self.ttl:
+                cursor.execute('UPDATE llm_responses SET last_used = ? WHERE key = ?', (now, key))
+                conn.commit()
+                conn.close()
+                with self._lock:
+                    self.hits += 1
+                return row[0]
+
+            if row:
+                cursor.execute('DELETE FROM llm_responses WHERE key = ?', (key,))
+                conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"讀取 LLM 快取失敗: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model: str, messages: List[Dict], params: Dict, response: str):
+        """
+        寫入回應並在超過容量時淘汰
+
+        Args:
+            model: 模型名稱
+            messages: 對話訊息
+            params: 其他參數
+            response: 回應文字
+        """
+        key = cache_key(model, messages, params)
+        now = time.time()
+        size = len(response.encode("utf-8"))
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT OR REPLACE INTO llm_responses (key, model, response, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (key, model, response, size, now, now))
+            self._evict(cursor, now)
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"寫入 LLM 快取失敗: {e}")
+
+    def clear(self):
+        """清除所有快取"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('DELETE FROM llm_responses')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"清除 LLM 快取失敗: {e}")
+
+    def stats(self) -> Dict:
+        """快取統計（項目數、總大小、命中率）"""
+        conn = sqlite3.connect(self.db_path)
+        entries, total_bytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses').fetchone()
+        conn.close()
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _evict(self, cursor, now: float):
+        """刪除過期項目，總大小超過上限時依最久未使用淘汰"""
+        cursor.execute('DELETE FROM llm_responses WHERE created_at < ?', (now - self.ttl,))
+
+        cursor.execute('SELECT COALESCE(SUM(size), 0) FROM llm_responses')
+        excess = cursor.fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+
+        cursor.execute('SELECT key, size FROM llm_responses ORDER BY last_used')
+        victims = []
+        for key, size in cursor.fetchall():
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+        cursor.executemany('DELETE FROM llm_responses WHERE key = ?', victims)
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+爬取 → 生成 → 發布管線
+以階段相依圖串接 Kitco 爬蟲、文章生成器與部落格管理器：抓取金價與新聞、整理市場資料、
+選題生成文章、寫入資料庫後發布；輸入未變的階段直接沿用上次的輸出
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from article_sink import ArticleSink
+from blog_generator import BlogArticle, BlogGenerator
+from blog_manager import BlogManager
+from llm_backend import StubBackend
+from stage_graph import Stage, StageGraph, StageGraphResult
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 爬蟲位於專案根目錄的 scrapers/（需要 requests 與 bs4，乾跑模式不載入）
+_SCRAPERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scrapers")
+
+# 各階段輸出的快取秒數（未列出的階段不快取；寫入與發布有副作用，每次都執行但本身可重複執行）
+DEFAULT_CACHE_TTL = {
+    "price": 5 * 60,
+    "news": 30 * 60,
+    "analysis": 60 * 60,
+    "topic": 24 * 3600,
+    "article": 24 * 3600,
+}
+
+# 金價單日漲跌超過此百分比時，優先從市場分析與時事評論選題
+VOLATILE_CHANGE_PERCENT = 1.0
+
+def _as_dict(value: Any) -> Any:
+    """dataclass（GoldPrice、NewsArticle）轉為可 JSON 序列化的字典"""
+    if is_dataclass(value):
+        return asdict(value)
+    if isinstance(value, list):
+        return [_as_dict(item) for item in value]
+    return value
+
+class StubScraper:
+    """離線替身爬蟲（乾跑模式使用，回傳固定的金價與新聞）"""
+
+    def __init__(self, price: float = 2350.50, change: float = 15.20):
+        self.price = price
+        self.change = change
+        self.calls = 0
+
+    def get_gold_price(self) -> Dict:
+        self.calls += 1
+        return {
+            "symbol": "XAUUSD",
+            "price": self.price,
+            "change": self.change,
+            "change_percent": round(self.change / (self.price - self.change) * 100, 2),
+            "high": self.price,
+            "low": self.price - abs(self.change),
+            "open_price": self.price - self.change,
+            "timestamp": datetime.now().isoformat(),
+            "source": "stub"
+        }
+
+    def get_news_articles(self, limit: int = 10) -> List[Dict]:
+        self.calls += 1
+        headlines = ["聯準會維持利率不變", "美國通膨數據低於預期", "央行持續增持黃金儲備", "美元指數走弱", "中東局勢升溫"]
+        return [
+            {"title": title, "content": f"{title}，市場關注後續對金價的影響。", "url": f"stub://news/{i}", "source": "stub"}
+            for i, title in enumerate(headlines[:limit])
+        ]
+
+    def get_market_analysis(self, limit: int = 5) -> List[Dict]:
+        self.calls += 1
+        titles = ["金價技術面突破前高", "避險需求支撐金價"]
+        return [
+            {"title": title, "content": f"{title}。", "url": f"stub://analysis/{i}", "category": "市場分析", "source": "stub"}
+            for i, title in enumerate(titles[:limit])
+        ]
+
+class StageOutputCache:
+    """階段輸出快取（以階段名稱與輸入的雜湊為鍵，各階段有各自的有效秒數）"""
+
+    def __init__(self, db_path: str = "data/pipeline_cache.db", max_ttl: float = 7 * 86400):
+        """
+        初始化快取
+
+        Args:
+            db_path: 快取資料庫路徑
+            max_ttl: 項目保留的最長秒數
+        """
+        self.db_path = db_path
+        self.max_ttl = max_ttl
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS stage_outputs (
+                    key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    output TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            ''')
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"管線快取初始化失敗: {e}")
+
+    @staticmethod
+    def key(stage: str, inputs: Dict) -> str:
+        """快取鍵：階段名稱與輸入的 SHA-256"""
+        payload = json.dumps({"stage": stage, "inputs": inputs}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, stage: str, inputs: Dict, ttl: float) -> Optional[Any]:
+        """
+        讀取未過期的輸出
+
+        Returns:
+            輸出；未命中或已過期時回傳 None
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            row = conn.execute(
+                'SELECT output FROM stage_outputs WHERE key = ? AND created_at >= ?',
+                (self.key(stage, inputs), time.time() - ttl)
+            ).fetchone()
+            conn.close()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            logger.error(f"讀取管線快取失敗: {e}")
+            return None
+
+    def put(self, stage: str, inputs: Dict, output: Any):
+        """寫入輸出（並清除超過最長有效秒數的項目）"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(
+                'INSERT OR REPLACE INTO stage_outputs (key, stage, output, created_at) VALUES (?, ?, ?, ?)',
+                (self.key(stage, inputs), stage, json.dumps(output, ensure_ascii=False), time.time())
+            )
+            conn.execute('DELETE FROM stage_outputs WHERE created_at < ?', (time.time() - self.max_ttl,))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"寫入管線快取失敗: {e}")
+
+@dataclass
+class PipelineResult(StageGraphResult):
+    """管線執行結果"""
+    cached: List[str] = field(default_factory=list)  # 沿用快取輸出的階段
+
+    @property
+    def article_id(self) -> Optional[str]:
+        """寫入的文章 ID"""
+        return self.results.get("store")
+
+class PublishPipeline:
+    """
+    爬取 → 生成 → 發布
+
+    price、news、analysis 三個爬取階段彼此獨立並行執行，market_data 整理後依序選題（topic）、
+    生成（article）、寫入（store）與發布（publish）。爬取、選題與生成的輸出依輸入雜湊快取，
+    輸入未變時重跑管線不會重複抓取或呼叫 API；寫入與發布可重複執行（文章 ID 已存在或已發布時略過）。
+    """
+
+    def __init__(self, generator: BlogGenerator = None, manager: BlogManager = None, scraper=None,
+                 cache_path: Optional[str] = "data/pipeline_cache.db", cache_ttl: Dict[str, float] = None,
+                 publish: bool = True, news_limit: int = 5, analysis_limit: int = 3,
+                 scraper_delay: float = 2.0, dry_run: bool = False):
+        """
+        初始化管線
+
+        Args:
+            generator: 文章生成器（預設以 OPENAI_API_KEY 建立；乾跑時使用離線替身後端）
+            manager: 部落格管理器（預設為 data/blog.db；乾跑時使用暫存資料庫）
+            scraper: 爬蟲（需提供 get_gold_price、get_news_articles、get_market_analysis；
+                預設為 KitcoScraper，乾跑時為 StubScraper）
+            cache_path: 階段輸出快取路徑（None 表示不快取；乾跑時放在暫存目錄）
+            cache_ttl: 覆寫各階段的快取秒數
+            publish: 是否發布（False 時文章保留為草稿）
+            news_limit: 抓取的新聞數
+            analysis_limit: 抓取的市場分析數
+            scraper_delay: 爬蟲請求間隔（秒）
+            dry_run: 乾跑模式（未指定的元件改用離線替身與暫存資料庫，不連線、不寫入正式資料庫）
+        """
+        self.dry_run = dry_run
+        self.publish = publish
+        self.news_limit = news_limit
+        self.analysis_limit = analysis_limit
+        self.cache_ttl = {**DEFAULT_CACHE_TTL, **(cache_ttl or {})}
+
+        if dry_run:
+            self._workdir = tempfile.mkdtemp(prefix="publish_pipeline_")
+            manager = manager or BlogManager(os.path.join(self._workdir, "blog.db"))
+            generator = generator or BlogGenerator(backend=StubBackend(), cache_path=None, export_json=False,
+                                                   manager=manager)
+            scraper = scraper or StubScraper()
+            if cache_path:
+                cache_path = os.path.join(self._workdir, os.path.basename(cache_path))
+            logger.info(f"乾跑模式：暫存目錄 {self._workdir}")
+
+        self.manager = manager or BlogManager()
+        self.generator = generator or BlogGenerator(os.environ.get("OPENAI_API_KEY"), manager=self.manager)
+        self.scraper = scraper or self._default_scraper(scraper_delay)
+        self.cache = StageOutputCache(cache_path, max_ttl=max(self.cache_ttl.values())) if cache_path else None
+        self.sink = ArticleSink(self.manager, batch_size=1)
+
+    @staticmethod
+    def _default_scraper(delay: float):
+        """載入 Kitco 爬蟲"""
+        if _SCRAPERS_DIR not in sys.path:
+            sys.path.insert(0, _SCRAPERS_DIR)
+        from kitco_scraper import KitcoScraper
+        return KitcoScraper(delay=delay)
+
+    def build_stages(self, cached: List[str]) -> StageGraph:
+        """
+        建立管線的階段相依圖
+
+        Args:
+            cached: 沿用快取輸出的階段會加入此列表
+
+        Returns:
+            StageGraph 物件
+        """
+        return StageGraph([
+            # 單一來源失敗時以其餘資料繼續
+            Stage("price", self._cached("price", cached, lambda: _as_dict(self.scraper.get_gold_price())),
+                  required=False),
+            Stage("news", self._cached("news", cached,
+                                       lambda: _as_dict(self.scraper.get_news_articles(limit=self.news_limit))),
+                  required=False),
+            Stage("analysis", self._cached("analysis", cached,
+                                           lambda: _as_dict(self.scraper.get_market_analysis(limit=self.analysis_limit))),
+                  required=False),
+            Stage("market_data", self.derive_market_data, depends_on=("price", "news", "analysis")),
+            Stage("topic", self._cached("topic", cached, self.choose_topic), depends_on=("market_data",)),
+            Stage("article", self._cached("article", cached, self.generate_article), depends_on=("market_data", "topic")),
+            Stage("store", self.store_article, depends_on=("article",)),
+            Stage("publish", self.publish_article, depends_on=("store",)),
+        ])
+
+    def run(self, max_workers: Optional[int] = None) -> PipelineResult:
+        """
+        執行管線
+
+        Args:
+            max_workers: 最大並行數（1 表示逐一執行）
+
+        Returns:
+            PipelineResult 物件
+        """
+        cached: List[str] = []
+        run = self.build_stages(cached).run(max_workers=max_workers)
+        result = PipelineResult(**vars(run), cached=cached)
+
+        if result.ok:
+            logger.info(
+                f"管線完成：{result.article_id}（{'已發布' if self.publish else '草稿'}），"
+                f"耗時 {result.elapsed:.1f} 秒，沿用快取：{', '.join(cached) or '無'}"
+            )
+        else:
+            logger.error(f"管線失敗：{', '.join(result.failed + result.skipped)}")
+        return result
+
+    def derive_market_data(self, price: Optional[Dict], news: Optional[List[Dict]],
+                           analysis: Optional[List[Dict]]) -> Dict:
+        """
+        整理生成器使用的市場資料
+
+        Args:
+            price: 金價（GoldPrice 字典）
+            news: 新聞列表
+            analysis: 市場分析列表
+
+        Returns:
+            {"current_price", "change", "change_percent", "market_sentiment", "key_events", "analysis"}
+            （缺少的來源不列入）
+        """
+        market_data = {}
+        if price:
+            change_percent = price.get("change_percent") or 0.0
+            market_data.update({
+                "current_price": round(price["price"], 2),
+                "change": round(price.get("change") or 0.0, 2),
+                "change_percent": round(change_percent, 2),
+                "market_sentiment": "樂觀" if change_percent >= 0.5 else "悲觀" if change_percent <= -0.5 else "中性",
+            })
+        if news:
+            market_data["key_events"] = [article["title"] for article in news if article.get("title")]
+        if analysis:
+            market_data["analysis"] = [article["title"] for article in analysis if article.get("title")]
+        return market_data
+
+    def choose_topic(self, market_data: Dict) -> Optional[Dict]:
+        """
+        依市場資料選題（金價大幅波動時優先市場分析與時事評論）
+
+        Returns:
+            {"category", "topic"}；所有主題都重複時回傳 None
+        """
+        categories = random.sample(list(self.generator.categories), len(self.generator.categories))
+        if abs(market_data.get("change_percent", 0.0)) >= VOLATILE_CHANGE_PERCENT:
+            categories.sort(key=lambda category: category not in ("市場分析", "時事評論"))
+
+        for category in categories:
+            topic = self.generator.pick_topic(category)
+            if topic:
+                return {"category": category, "topic": topic}
+        logger.warning("所有主題都與既有文章重複")
+        return None
+
+    def generate_article(self, market_data: Dict, topic: Dict) -> Optional[Dict]:
+        """生成文章"""
+        article = self.generator.create_blog_article(topic["category"], topic["topic"], market_data or None)
+        return asdict(article) if article else None
+
+    def store_article(self, article: Dict) -> Optional[str]:
+        """寫入資料庫（文章 ID 已存在時略過，視為成功）"""
+        self.sink.add(BlogArticle(**article))
+        self.sink.flush()
+        if self.sink.pending():
+            return None
+        return article["id"]
+
+    def publish_article(self, store: str) -> bool:
+        """發布文章（已發布時不更新發布日期）"""
+        if not self.publish:
+            return True
+        existing = self.manager.get_article(store)
+        if existing and existing.status == "published":
+            return True
+        # 回傳 None 讓階段視為失敗
+        return True if self.manager.publish_article(store) else None
+
+    def _cached(self, stage: str, cached: List[str], func: Callable) -> Callable:
+        """以輸入為鍵快取階段輸出（None 或空結果表示失敗，不寫入快取）"""
+        if self.cache is None or stage not in self.cache_ttl:
+            return func
+
+        def wrapper(**inputs):
+            output = self.cache.get(stage, inputs, self.cache_ttl[stage])
+            if output is not None:
+                cached.append(stage)
+                return output
+            output = func(**inputs)
+            if output:
+                self.cache.put(stage, inputs, output)
+            return output
+        return wrapper
+
+def main():
+    """主函數 - 執行爬取、生成與發布"""
+    parser = argparse.ArgumentParser(description="爬取 → 生成 → 發布管線")
+    parser.add_argument("--dry-run", action="store_true", help="使用離線替身與暫存資料庫")
+    parser.add_argument("--draft", action="store_true", help="只寫入草稿，不發布")
+    parser.add_argument("--news", type=int, default=5, help="抓取的新聞數")
+    args = parser.parse_args()
+
+    pipeline = PublishPipeline(dry_run=args.dry_run, publish=not args.draft, news_limit=args.news)
+
+    print("=== 爬取 → 生成 → 發布 ===")
+    result = pipeline.run()
+    for name in pipeline.build_stages([]).order:
+        if name in result.cached:
+            status = "快取"
+        elif name in result.failed:
+            status = "失敗"
+        elif name in result.skipped:
+            status = "略過"
+        else:
+            status = f"{result.durations.get(name, 0.0):.2f} 秒"
+        print(f"{name:12s}{status}")
+
+    if result.ok:
+        print(f"\n✅ 文章 {result.article_id}：{result.results['article']['title']}")
+    else:
+        print("\n❌ 管線失敗")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+排程發布器
+以最小堆積維護排程時間，背景執行緒睡到下一篇到期時才醒來批次發布
+"""
+
+import heapq
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from blog_manager import BlogManager
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def _timestamp(value: str) -> float:
+    """ISO 時間轉為 epoch 秒數"""
+    return datetime.fromisoformat(value).timestamp()
+
+class PublishScheduler:
+    """排程發布器（不需輪詢整個資料表）"""
+
+    def __init__(self, manager: BlogManager, retry_delay: float = 30.0):
+        """
+        初始化排程器
+
+        Args:
+            manager: 部落格管理器
+            retry_delay: 到期文章未能發布（資料庫鎖定等）時的重試間隔秒數
+        """
+        self.manager = manager
+        self.retry_delay = retry_delay
+
+        # 堆積中的項目可能已被改期或取消，以 _scheduled 為準（延遲刪除）
+        self._heap: List[tuple] = []
+        self._scheduled: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+        self._load()
+        manager.add_change_listener(self.on_article_changed)
+
+    def start(self):
+        """啟動背景排程執行緒"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="publish-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"排程發布器已啟動，共 {len(self._scheduled)} 篇待發布")
+
+    def stop(self):
+        """停止背景排程執行緒"""
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def next_due(self) -> Optional[datetime]:
+        """下一篇文章的發布時間"""
+        with self._condition:
+            self._discard_stale()
+            return datetime.fromtimestamp(self._heap[0][0]) if self._heap else None
+
+    def pending_count(self) -> int:
+        """待發布文章數"""
+        with self._condition:
+            return len(self._scheduled)
+
+    def run_pending(self) -> List[str]:
+        """
+        立即發布所有已到期的文章
+
+        Returns:
+            已發布的文章 ID 列表
+        """
+        now = time.time()
+        popped = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                due, article_id = heapq.heappop(self._heap)
+                if self._scheduled.get(article_id) == due:
+                    del self._scheduled[article_id]
+                    popped.append(article_id)
+
+        # 以資料庫為準發布所有到期文章（包含其他行程排程的文章）
+        published = self.manager.publish_due_articles(datetime.fromtimestamp(now))
+
+        # 已出堆積卻未發布、資料庫中仍在排程的文章放回堆積，稍後重試
+        missed = set(popped) - set(published)
+        for article_id in missed:
+            scheduled_at = self._read_scheduled_at(article_id)
+            if scheduled_at:
+                self._set(article_id, max(_timestamp(scheduled_at), now + self.retry_delay))
+        return published
+
+    def on_article_changed(self, article_id: str, action: str):
+        """BlogManager 變更監聽器：同步單篇文章的排程"""
+        scheduled_at = None
+        if action != "delete":
+            try:
+                scheduled_at = self._read_scheduled_at(article_id)
+            except Exception as e:
+                logger.error(f"讀取排程時間失敗: {e}")
+                return
+
+        self._set(article_id, _timestamp(scheduled_at) if scheduled_at else None)
+
+    def _read_scheduled_at(self, article_id: str) -> Optional[str]:
+        """讀取文章的排程時間（只有草稿會被排程發布）"""
+        conn = sqlite3.connect(self.manager.db_path)
+        row = conn.execute('''
+            SELECT scheduled_at FROM blog_posts WHERE id = ? AND status IN ('draft', 'scheduled')
+        ''', (article_id,)).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def _load(self):
+        """從資料庫載入所有排程（使用 scheduled_at 部分索引）"""
+        entries = [
+            (_timestamp(item["scheduled_at"]), item["id"])
+            for item in self.manager.get_scheduled_articles()
+        ]
+        with self._condition:
+            self._heap = entries
+            heapq.heapify(self._heap)
+            self._scheduled = {article_id: due for due, article_id in entries}
+
+    def _set(self, article_id: str, due: Optional[float]):
+        """新增、改期或取消單篇文章的排程"""
+        with self._condition:
+            if due is None:
+                self._scheduled.pop(article_id, None)
+                return
+            if self._scheduled.get(article_id) == due:
+                return
+
+            self._scheduled[article_id] = due
+            heapq.heappush(self._heap, (due, article_id))
+            # 比目前等待的時間更早時喚醒執行緒重新計算
+            if self._heap[0] == (due, article_id):
+                self._condition.notify()
+
+    def _discard_stale(self):
+        """移除堆積頂端已改期或取消的項目"""
+        while self._heap and self._scheduled.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _run(self):
+        """背景執行緒：睡到下一篇到期再批次發布"""
+        while True:
+            with self._condition:
+                while not self._stop:
+                    self._discard_stale()
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                if self._stop:
+                    return
+
+            try:
+                self.run_pending()
+            except Exception as e:
+                logger.error(f"排程發布失敗: {e}")
+
+def main():
+    """主函數 - 啟動排程發布器"""
+    manager = BlogManager()
+    scheduler = PublishScheduler(manager)
+
+    print("=== 排程發布器 ===")
+    print(f"待發布文章：{scheduler.pending_count()} 篇，下一篇：{scheduler.next_due() or '無'}")
+
+    scheduler.start()
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        scheduler.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+LLM API 速率限制器
+以一分鐘滑動視窗追蹤請求數（RPM）與 token 數（TPM），遇到 429 時自適應退避
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+class RateLimiter:
+    """
+    RPM／TPM 預算控制
+
+    呼叫 API 前以預估 token 數取得額度，回應後以實際用量修正；
+    收到 429 時暫停所有請求並將有效預算減半，之後每次成功逐步恢復（AIMD）。
+    """
+
+    def __init__(self, requests_per_minute: int = 60, tokens_per_minute: int = 60000,
+                 min_factor: float = 0.1, recovery_step: float = 0.05, max_backoff: float = 60.0):
+        """
+        初始化速率限制器
+
+        Args:
+            requests_per_minute: 每分鐘請求數上限
+            tokens_per_minute: 每分鐘 token 數上限
+            min_factor: 有效預算的最低比例
+            recovery_step: 每次成功恢復的預算比例
+            max_backoff: 最長退避秒數
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.min_factor = min_factor
+        self.recovery_step = recovery_step
+        self.max_backoff = max_backoff
+
+        self.factor = 1.0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+        self._window = deque()  # [時間, token 數]
+        self._window_tokens = 0
+        self._paused_until = 0.0
+        self._consecutive_throttles = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, estimated_tokens: int) -> list:
+        """
+        取得一次請求的額度（不足時阻塞等待）
+
+        Args:
+            estimated_tokens: 預估 token 數（提示詞 + 最大輸出）
+
+        Returns:
+            額度憑證，回應後交給 settle 修正實際用量
+        """
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+
+                request_budget = max(1, int(self.requests_per_minute * self.factor))
+                token_budget = max(1, int(self.tokens_per_minute * self.factor))
+                fits = (
+                    len(self._window) < request_budget
+                    # 單一請求超過整個預算時，視窗淨空後仍放行，避免永久阻塞
+                    and (self._window_tokens + estimated_tokens <= token_budget or not self._window)
+                )
+
+                if now >= self._paused_until and fits:
+                    entry = [now, estimated_tokens]
+                    self._window.append(entry)
+                    self._window_tokens += estimated_tokens
+                    self.wait_seconds += now - started
+                    return entry
+
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self._window:
+                    delay = self._window[0][0] + WINDOW_SECONDS - now
+                else:
+                    delay = 0.05
+                delay = max(delay, 0.01)
+                self._condition.wait(delay)
+
+    def settle(self, entry: list, actual_tokens: Optional[int]):
+        """
+        以實際用量修正額度並記錄一次成功
+
+        Args:
+            entry: acquire 回傳的憑證
+            actual_tokens: 實際使用的 token 數（未知時為 None）
+        """
+        with self._condition:
+            if actual_tokens is not None and any(item is entry for item in self._window):
+                self._window_tokens += actual_tokens - entry[1]
+                entry[1] = actual_tokens
+
+            self._consecutive_throttles = 0
+            self.factor = min(1.0, self.factor + self.recovery_step)
+            self._condition.notify_all()
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """
+        收到 429 時呼叫：暫停所有請求並降低有效預算
+
+        Args:
+            retry_after: 伺服器建議的等待秒數（Retry-After 標頭）
+
+        Returns:
+            本次退避秒數
+        """
+        with self._condition:
+            self._consecutive_throttles += 1
+            self.throttled += 1
+            self.factor = max(self.min_factor, self.factor * 0.5)
+
+            backoff = retry_after or min(self.max_backoff, 2 ** self._consecutive_throttles)
+            backoff *= random.uniform(1.0, 1.25)
+            self._paused_until = max(self._paused_until, time.monotonic() + backoff)
+            self._condition.notify_all()
+
+        logger.warning(f"API 速率限制，暫停 {backoff:.1f} 秒，預算降為 {self.factor:.0%}")
+        return backoff
+
+    def stats(self) -> Dict:
+        """目前視窗用量與累計統計"""
+        with self._condition:
+            self._expire(time.monotonic())
+            return {
+                "requests_in_window": len(self._window),
+                "tokens_in_window": self._window_tokens,
+                "factor": self.factor,
+                "throttled": self.throttled,
+                "wait_seconds": self.wait_seconds
+            }
+
+    def _expire(self, now: float):
+        """移除一分鐘前的紀錄（呼叫時須持有鎖）"""
+        while self._window and self._window[0][0] <= now - WINDOW_SECONDS:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+相關文章索引
+結合標籤重疊與 TF-IDF 相似度，預先計算每篇已發布文章的前 K 篇相關文章
+"""
+
+import json
+import logging
+import sqlite3
+from typing import List, Dict
+
+from blog_manager import BlogManager
+from text_analysis import term_frequencies, tfidf_vector
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 各欄位的詞頻權重
+FIELD_WEIGHTS = {"title": 3, "summary": 2, "content": 1}
+
+class RelatedArticlesIndex:
+    """相關文章索引"""
+
+    def __init__(self, manager: BlogManager, top_k: int = 5, text_weight: float = 0.7,
+                 max_terms: int = 64):
+        """
+        初始化相關文章索引
+
+        Args:
+            manager: 部落格管理器
+            top_k: 每篇文章保留的相關文章數
+            text_weight: 文字相似度權重（其餘為標籤重疊權重）
+            max_terms: 每篇文章保留的 TF-IDF 詞元數
+        """
+        self.manager = manager
+        self.db_path = manager.db_path
+        self.top_k = top_k
+        self.text_weight = text_weight
+        self.max_terms = max_terms
+
+        self._needs_rebuild = False
+        self.init_tables()
+        if self._needs_rebuild:
+            self.rebuild()
+        else:
+            self.sync()
+        manager.add_change_listener(self.on_article_changed)
+        logger.info("相關文章索引初始化完成")
+
+    def init_tables(self):
+        """初始化索引資料表"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS related_docs (
+                    article_id TEXT PRIMARY KEY,
+                    updated_at TEXT,
+                    tag_count INTEGER DEFAULT 0
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS related_terms (
+                    term TEXT NOT NULL,
+                    article_id TEXT NOT NULL,
+                    weight REAL NOT NULL,
+                    PRIMARY KEY (term, article_id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_related_terms_article ON related_terms(article_id)')
+            # 文章的完整詞元集合（related_terms 只保留前 max_terms 個），移除文章時依此扣回文件頻率
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'related_doc_terms'")
+            has_doc_terms = cursor.fetchone() is not None
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS related_doc_terms (
+                    article_id TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    PRIMARY KEY (article_id, term)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS related_df (
+                    term TEXT PRIMARY KEY,
+                    df INTEGER DEFAULT 0
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS related_tags (
+                    tag TEXT NOT NULL,
+                    article_id TEXT NOT NULL,
+                    PRIMARY KEY (tag, article_id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_related_tags_article ON related_tags(article_id)')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS related_posts (
+                    article_id TEXT NOT NULL,
+                    rank INTEGER NOT NULL,
+                    related_id TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    PRIMARY KEY (article_id, rank)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_related_posts_related ON related_posts(related_id)')
+
+            # 舊版索引沒有完整詞元集合，文件頻率可能已偏移，需全量重建
+            cursor.execute('SELECT COUNT(*) FROM related_docs')
+            self._needs_rebuild = not has_doc_terms and cursor.fetchone()[0] > 0
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"相關文章索引資料表初始化失敗: {e}")
+
+    def get_related(self, article_id: str, limit: int = None) -> List[Dict]:
+        """
+        獲取相關文章（單次索引查詢）
+
+        Args:
+            article_id: 文章 ID
+            limit: 限制數量（預設為 top_k）
+
+        Returns:
+            相關文章列表
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT r.related_id, p.title, p.summary, p.category, p.read_time, r.score
+                FROM related_posts r
+                JOIN blog_posts p ON p.id = r.related_id
+                WHERE r.article_id = ?
+                ORDER BY r.rank
+                LIMIT ?
+            ''', (article_id, limit or self.top_k))
+            rows = cursor.fetchall()
+
+            conn.close()
+
+            return [
+                {
+                    "id": row[0],
+                    "title": row[1],
+                    "summary": row[2],
+                    "category": row[3],
+                    "read_time": row[4],
+                    "score": row[5]
+                }
+                for row in rows
+            ]
+
+        except Exception as e:
+            logger.error(f"獲取相關文章失敗: {e}")
+            return []
+
+    def on_article_changed(self, article_id: str, action: str):
+        """BlogManager 變更監聽器：增量更新索引"""
+        self.index_article(article_id)
+
+    def index_article(self, article_id: str) -> bool:
+        """
+        增量更新單篇文章的索引及受影響文章的相關清單
+
+        Args:
+            article_id: 文章 ID
+
+        Returns:
+            是否成功
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            self._index_document(cursor, article_id)
+
+            conn.commit()
+            conn.close()
+            return True
+
+        except Exception as e:
+            logger.error(f"更新相關文章索引失敗: {e}")
+            return False
+
+    def sync(self) -> int:
+        """
+        同步索引與 blog_posts（依 updated_at 找出新增、變更或移除的文章）
+
+        Returns:
+            重新索引的文章數
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT p.id FROM blog_posts p
+                LEFT JOIN related_docs d ON d.article_id = p.id
+                WHERE p.status = 'published' AND (d.article_id IS NULL OR d.updated_at IS NOT p.updated_at)
+                UNION
+                SELECT d.article_id FROM related_docs d
+                LEFT JOIN blog_posts p ON p.id = d.article_id
+                WHERE p.id IS NULL OR p.status != 'published'
+            ''')
+            stale_ids = [row[0] for row in cursor.fetchall()]
+
+            for article_id in stale_ids:
+                self._index_document(cursor, article_id)
+
+            conn.commit()
+            conn.close()
+
+            if stale_ids:
+                logger.info(f"相關文章索引同步 {len(stale_ids)} 篇文章")
+            return len(stale_ids)
+
+        except Exception as e:
+            logger.error(f"同步相關文章索引失敗: {e}")
+            return 0
+
+    def rebuild(self) -> bool:
+        """
+        全量重建索引（以最新的文件頻率重新計算所有權重）
+
+        Returns:
+            是否成功
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            for table in ("related_docs", "related_terms", "related_doc_terms", "related_df", "related_tags",
+                          "related_posts"):
+                cursor.execute(f'DELETE FROM {table}')
+
+            cursor.execute('''
+                SELECT id, title, summary, content, tags, updated_at
+                FROM blog_posts WHERE status = 'published'
+            ''')
+            documents = [(row[0], self._document_counts(row), row) for row in cursor.fetchall()]
+
+            # 1. 先統計文件頻率，讓所有文章使用同一組 IDF
+            document_frequencies = {}
+            for _, counts, _ in documents:
+                for term in counts:
+                    document_frequencies[term] = document_frequencies.get(term, 0) + 1
+            cursor.executemany(
+                'INSERT INTO related_df (term, df) VALUES (?, ?)',
+                document_frequencies.items()
+            )
+
+            # 2. 寫入向量與標籤
+            for article_id, counts, row in documents:
+                vector = tfidf_vector(counts, document_frequencies, len(documents), self.max_terms)
+                self._store_document(cursor, article_id, row, vector, counts)
+
+            # 3. 計算每篇文章的相關清單
+            for article_id, _, _ in documents:
+                self._store_neighbors(cursor, article_id, self._score_candidates(cursor, article_id))
+
+            conn.commit()
+            conn.close()
+
+            logger.info(f"相關文章索引重建完成，共 {len(documents)} 篇")
+            return True
+
+        except Exception as e:
+            logger.error(f"重建相關文章索引失敗: {e}")
+            return False
+
+    def _document_counts(self, row):
+        """計算文章（標題、摘要、內容）的加權詞頻"""
+        return term_frequencies([
+            (row[1], FIELD_WEIGHTS["title"]),
+            (row[2], FIELD_WEIGHTS["summary"]),
+            (self.manager.decode_content(row[3]), FIELD_WEIGHTS["content"])
+        ])
+
+    def _store_document(self, cursor, article_id: str, row, vector: Dict[str, float],
+                        counts: Dict[str, int]):
+        """寫入文章向量、完整詞元集合、標籤與索引狀態"""
+        tags = set(json.loads(row[4])) if row[4] else set()
+
+        cursor.executemany(
+            'INSERT INTO related_doc_terms (article_id, term) VALUES (?, ?)',
+            [(article_id, term) for term in counts]
+        )
+
+        cursor.executemany(
+            'INSERT INTO related_terms (term, article_id, weight) VALUES (?, ?, ?)',
+            [(term, article_id, weight) for term, weight in vector.items()]
+        )
+        cursor.executemany(
+            'INSERT INTO related_tags (tag, article_id) VALUES (?, ?)',
+            [(tag, article_id) for tag in tags]
+        )
+        cursor.execute(
+            'INSERT OR REPLACE INTO related_docs (article_id, updated_at, tag_count) VALUES (?, ?, ?)',
+            (article_id, row[5], len(tags))
+        )
+
+    def _remove_document(self, cursor, article_id: str):
+        """自索引移除文章（保留其他文章指向它的紀錄，由呼叫端處理）"""
+        cursor.execute('''
+            UPDATE related_df SET df = df - 1
+            WHERE term IN (SELECT term FROM related_doc_terms WHERE article_id = ?)
+        ''', (article_id,))
+        cursor.execute('DELETE FROM related_df WHERE df <= 0')
+        cursor.execute('DELETE FROM related_terms WHERE article_id = ?', (article_id,))
+        cursor.execute('DELETE FROM related_doc_terms WHERE article_id = ?', (article_id,))
+        cursor.execute('DELETE FROM related_tags WHERE article_id = ?', (article_id,))
+        cursor.execute('DELETE FROM related_docs WHERE article_id = ?', (article_id,))
+        cursor.execute('DELETE FROM related_posts WHERE article_id = ?', (article_id,))
+
+    def _index_document(self, cursor, article_id: str):
+        """增量索引單篇文章"""
+        # 先記下原本列出此文章的文章，之後需要重新檢查
+        cursor.execute('SELECT article_id, score FROM related_posts WHERE related_id = ?', (article_id,))
+        previous_scores = dict(cursor.fetchall())
+
+        self._remove_document(cursor, article_id)
+
+        cursor.execute('''
+            SELECT id, title, summary, content, tags, updated_at
+            FROM blog_posts WHERE id = ? AND status = 'published'
+        ''', (article_id,))
+        row = cursor.fetchone()
+
+        scores = {}
+        if row:
+            counts = self._document_counts(row)
+            cursor.execute('SELECT COUNT(*) FROM related_docs')
+            total_documents = cursor.fetchone()[0] + 1
+
+            document_frequencies = {}
+            terms = list(counts)
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor.execute(f'SELECT term, df FROM related_df WHERE term IN ({placeholders})', chunk)
+                document_frequencies.update(cursor.fetchall())
+            for term in terms:
+                document_frequencies[term] = document_frequencies.get(term, 0) + 1
+
+            cursor.executemany('''
+                INSERT INTO related_df (term, df) VALUES (?, 1)
+                ON CONFLICT(term) DO UPDATE SET df = df + 1
+            ''', [(term,) for term in terms])
+
+            vector = tfidf_vector(counts, document_frequencies, total_documents, self.max_terms)
+            self._store_document(cursor, article_id, row, vector, counts)
+
+            scores = self._score_candidates(cursor, article_id)
+            self._store_neighbors(cursor, article_id, scores)
+
+        # 分數為對稱值，直接更新其他文章的相關清單
+        for other_id in set(scores) | set(previous_scores):
+            new_score = scores.get(other_id)
+            old_score = previous_scores.get(other_id)
+
+            if old_score is not None and (new_score is None or new_score < old_score):
+                # 分數下降時，原本排在 K 名外的文章可能遞補，需重新計算
+                self._store_neighbors(cursor, other_id, self._score_candidates(cursor, other_id))
+            elif new_score is not None:
+                self._merge_neighbor(cursor, other_id, article_id, new_score)
+
+    def _score_candidates(self, cursor, article_id: str) -> Dict[str, float]:
+        """計算與其他文章的綜合相似度（TF-IDF 餘弦 + 標籤 Jaccard）"""
+        cursor.execute('''
+            SELECT b.article_id, SUM(a.weight * b.weight)
+            FROM related_terms a
+            JOIN related_terms b ON b.term = a.term
+            WHERE a.article_id = ? AND b.article_id != ?
+            GROUP BY b.article_id
+        ''', (article_id, article_id))
+        text_scores = dict(cursor.fetchall())
+
+        cursor.execute('''
+            SELECT b.article_id, COUNT(*), d.tag_count, s.tag_count
+            FROM related_tags a
+            JOIN related_tags b ON b.tag = a.tag
+            JOIN related_docs d ON d.article_id = b.article_id
+            JOIN related_docs s ON s.article_id = a.article_id
+            WHERE a.article_id = ? AND b.article_id != ?
+            GROUP BY b.article_id
+        ''', (article_id, article_id))
+        tag_scores = {
+            row[0]: row[1] / (row[2] + row[3] - row[1])
+            for row in cursor.fetchall()
+        }
+
+        return {
+            other_id: self.text_weight * text_scores.get(other_id, 0.0)
+            + (1 - self.text_weight) * tag_scores.get(other_id, 0.0)
+            for other_id in set(text_scores) | set(tag_scores)
+        }
+
+    def _store_neighbors(self, cursor, article_id: str, scores: Dict[str, float]):
+        """寫入文章的前 K 篇相關文章"""
+        top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:self.top_k]
+
+        cursor.execute('DELETE FROM related_posts WHERE article_id = ?', (article_id,))
+        cursor.executemany(
+            'INSERT INTO related_posts (article_id, rank, related_id, score) VALUES (?, ?, ?, ?)',
+            [(article_id, rank, related_id, score) for rank, (related_id, score) in enumerate(top)]
+        )
+
+    def _merge_neighbor(self, cursor, article_id: str, related_id: str, score: float):
+        """將一篇文章併入既有的相關清單（分數未下降時使用）"""
+        cursor.execute('SELECT related_id, score FROM related_posts WHERE article_id = ?', (article_id,))
+        current = dict(cursor.fetchall())
+
+        if related_id not in current and len(current) >= self.top_k and score <= min(current.values()):
+            return
+
+        current[related_id] = score
+        self._store_neighbors(cursor, article_id, current)
+
+def main():
+    """主函數 - 重建相關文章索引"""
+    manager = BlogManager()
+    index = RelatedArticlesIndex(manager)
+
+    print("=== 相關文章索引 ===")
+    if index.rebuild():
+        print("✅ 索引重建完成")
+
+    for article in manager.get_articles(limit=5):
+        related = index.get_related(article.id)
+        print(f"{article.title} → {[item['title'] for item in related]}")
+
+if __name__ == "__main__":
+    main()
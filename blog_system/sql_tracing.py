@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+SQL 追蹤與慢查詢紀錄
+量測每個 SQL 敘述的執行時間並依正規化後的 SQL 彙整，超過門檻時記錄查詢計畫
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Optional
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b|\bNULL\b', re.IGNORECASE)
+_IN_LIST_RE = re.compile(r'IN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 可以取得查詢計畫的敘述
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH", "REPLACE")
+
+def normalize_sql(sql: str) -> str:
+    """
+    正規化 SQL（常數改為 ?、合併空白與 IN 清單），讓同類查詢彙整在一起
+
+    Args:
+        sql: 原始 SQL
+
+    Returns:
+        正規化後的 SQL
+    """
+    normalized = _STRING_RE.sub('?', sql)
+    normalized = _NUMBER_RE.sub('?', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
+    return _IN_LIST_RE.sub('IN (...)', normalized)
+
+class QueryTracer:
+    """SQL 執行統計與慢查詢紀錄"""
+
+    def __init__(self, slow_query_ms: float = 50.0, connection_window: float = 10.0):
+        """
+        初始化追蹤器
+
+        Args:
+            slow_query_ms: 慢查詢門檻（毫秒）
+            connection_window: 計算每秒連線數的時間窗（秒）
+        """
+        self.slow_query_ms = slow_query_ms
+        self.connection_window = connection_window
+        self.started_at = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict] = {}
+        self._plans: Dict[str, str] = {}
+        self._connections = deque()
+        self._connections_total = 0
+
+    def attach(self, conn: sqlite3.Connection):
+        """
+        將追蹤器掛到連線上（連線須以 TracedConnection 建立）
+
+        除了量測 cursor 執行時間，也透過 trace callback 統計 SQLite 實際執行的
+        敘述次數（包含觸發器程式與隱含的 BEGIN／COMMIT）。
+        """
+        conn.tracer = self
+        conn.set_trace_callback(self._on_trace)
+        self.record_connection()
+
+    def record_connection(self):
+        """記錄新開啟的連線"""
+        now = time.monotonic()
+        with self._lock:
+            self._connections_total += 1
+            self._connections.append(now)
+            while self._connections and self._connections[0] < now - self.connection_window:
+                self._connections.popleft()
+
+    def record(self, sql: str, elapsed: float, conn: sqlite3.Connection = None, params=()) -> str:
+        """
+        記錄一次敘述執行
+
+        Args:
+            sql: SQL 敘述
+            elapsed: 執行時間（秒）
+            conn: 執行的連線（用於取得慢查詢的查詢計畫）
+            params: 查詢參數
+
+        Returns:
+            正規化後的 SQL
+        """
+        key = normalize_sql(sql)
+        elapsed_ms = elapsed * 1000
+
+        with self._lock:
+            stats = self._stats.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "traced": 0})
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+        if elapsed_ms >= self.slow_query_ms:
+            self._log_slow_query(key, sql, elapsed_ms, conn, params)
+
+        return key
+
+    def add_time(self, key: str, elapsed: float):
+        """將讀取結果（fetch）的時間累加到對應的敘述"""
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats:
+                stats["total_ms"] += elapsed_ms
+                stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def connections_per_second(self) -> float:
+        """最近時間窗內每秒開啟的連線數"""
+        now = time.monotonic()
+        with self._lock:
+            while self._connections and self._connections[0] < now - self.connection_window:
+                self._connections.popleft()
+            recent = len(self._connections)
+        window = min(self.connection_window, max(now - self.started_at, 1e-9))
+        return recent / window
+
+    def report(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict]:
+        """
+        依正規化 SQL 彙整的統計
+
+        Args:
+            limit: 限制數量
+            order_by: 排序欄位（total_ms、count、max_ms、avg_ms）
+
+        Returns:
+            統計列表
+        """
+        with self._lock:
+            rows = [
+                {
+                    "sql": sql,
+                    "count": stats["count"],
+                    "traced": stats["traced"],
+                    "total_ms": stats["total_ms"],
+                    "avg_ms": stats["total_ms"] / stats["count"] if stats["count"] else 0.0,
+                    "max_ms": stats["max_ms"],
+                    "plan": self._plans.get(sql)
+                }
+                for sql, stats in self._stats.items()
+            ]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit]
+
+    def summary(self) -> Dict:
+        """整體統計（敘述數、總時間、連線數）"""
+        with self._lock:
+            statements = sum(stats["count"] for stats in self._stats.values())
+            total_ms = sum(stats["total_ms"] for stats in self._stats.values())
+            connections_total = self._connections_total
+        elapsed = time.monotonic() - self.started_at
+
+        return {
+            "statements": statements,
+            "total_ms": total_ms,
+            "connections_opened": connections_total,
+            "connections_per_second": self.connections_per_second(),
+            "connections_per_second_overall": connections_total / elapsed if elapsed else 0.0,
+            "uptime_seconds": elapsed
+        }
+
+    def log_report(self, limit: int = 10):
+        """將統計寫入日誌"""
+        summary = self.summary()
+        logger.info(
+            f"SQL 統計：{summary['statements']} 個敘述，共 {summary['total_ms']:.1f} ms，"
+            f"開啟 {summary['connections_opened']} 個連線（近期 {summary['connections_per_second']:.1f} 個/秒）"
+        )
+        for row in self.report(limit):
+            logger.info(f"{row['total_ms']:9.1f} ms  {row['count']:6d} 次  平均 {row['avg_ms']:.3f} ms  {row['sql']}")
+
+    def reset(self):
+        """清除統計"""
+        with self._lock:
+            self._stats.clear()
+            self._plans.clear()
+            self._connections.clear()
+            self._connections_total = 0
+        self.started_at = time.monotonic()
+
+    def _on_trace(self, statement: str):
+        """
+        trace callback：統計 SQLite 實際執行的敘述
+
+        觸發器每次執行都會以外層敘述的文字再回報一次，因此 traced 與 count
+        的差值即為觸發器帶來的額外執行次數。
+        """
+        if statement.startswith("EXPLAIN"):
+            return
+
+        key = normalize_sql(statement)
+        with self._lock:
+            stats = self._stats.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "traced": 0})
+            stats["traced"] += 1
+
+    def _log_slow_query(self, key: str, sql: str, elapsed_ms: float, conn: Optional[sqlite3.Connection], params):
+        """記錄慢查詢與其查詢計畫（每種查詢只取得一次計畫）"""
+        with self._lock:
+            plan = self._plans.get(key)
+
+        if plan is None and conn is not None and sql.lstrip().upper().startswith(_EXPLAINABLE):
+            try:
+                # 直接建立基礎 Cursor，避免再次被追蹤
+                cursor = sqlite3.Cursor(conn)
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())
+                plan = "\n".join(f"  {'  ' * (row[1] > 0)}{row[3]}" for row in cursor.fetchall())
+                cursor.close()
+            except Exception as e:
+                plan = f"  （無法取得查詢計畫：{e}）"
+
+            with self._lock:
+                self._plans[key] = plan
+
+        logger.warning(f"慢查詢 {elapsed_ms:.1f} ms：{key}\n查詢計畫：\n{plan or '  （無）'}")
+
+class TracedCursor(sqlite3.Cursor):
+    """量測執行時間的 Cursor"""
+
+    _last_key = None
+
+    def execute(self, sql, parameters=()):
+        tracer = self.connection.tracer
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._last_key = tracer.record(sql, time.perf_counter() - start, self.connection, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        tracer = self.connection.tracer
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._last_key = tracer.record(sql, time.perf_counter() - start)
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self._timed_fetch(lambda: super(TracedCursor, self).fetchmany(size or self.arraysize))
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+    def _timed_fetch(self, fetch):
+        start = time.perf_counter()
+        try:
+            return fetch()
+        finally:
+            if self._last_key:
+                self.connection.tracer.add_time(self._last_key, time.perf_counter() - start)
+
+class TracedConnection(sqlite3.Connection):
+    """可掛載 QueryTracer 的連線（未掛載時行為與一般連線相同）"""
+
+    tracer: Optional[QueryTracer] = None
+
+    def cursor(self, factory=None):
+        if self.tracer is None:
+            return super().cursor(factory or sqlite3.Cursor)
+        return super().cursor(factory or TracedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+階段相依圖執行器
+依相依關係以執行緒池並行執行彼此獨立的階段（例如文章生成的各個 LLM 呼叫）
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Stage:
+    """單一階段"""
+    name: str  # 階段名稱（也是結果的鍵）
+    func: Callable[..., Any]  # 以相依階段的結果作為關鍵字參數呼叫
+    depends_on: Tuple[str, ...] = ()  # 相依的階段
+    required: bool = True  # 結果為 None 時是否視為失敗（相依的階段會略過）
+
+@dataclass
+class StageGraphResult:
+    """執行結果"""
+    results: Dict[str, Any] = field(default_factory=dict)  # 階段名稱 -> 結果
+    durations: Dict[str, float] = field(default_factory=dict)  # 階段名稱 -> 執行秒數
+    failed: List[str] = field(default_factory=list)  # 失敗的階段
+    skipped: List[str] = field(default_factory=list)  # 因相依失敗而略過的階段
+    elapsed: float = 0.0  # 總執行秒數
+
+    @property
+    def ok(self) -> bool:
+        """所有階段是否都成功"""
+        return not self.failed and not self.skipped
+
+class StageGraph:
+    """階段相依圖"""
+
+    def __init__(self, stages: List[Stage]):
+        """
+        初始化相依圖
+
+        Args:
+            stages: 階段列表（順序即單執行緒時的執行順序）
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = [stage.name for stage in stages]
+
+        for stage in stages:
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"階段 {stage.name} 相依於不存在的階段 {dependency}")
+        self._check_acyclic()
+
+    def critical_path_length(self) -> int:
+        """最長相依鏈的階段數（並行時的最少循序輪數）"""
+        depth = {}
+        for name in self._topological_order():
+            stage = self.stages[name]
+            depth[name] = 1 + max((depth[d] for d in stage.depends_on), default=0)
+        return max(depth.values(), default=0)
+
+    def run(self, max_workers: Optional[int] = None, completed: Dict[str, Any] = None) -> StageGraphResult:
+        """
+        執行所有階段
+
+        Args:
+            max_workers: 最大並行數（1 表示依宣告順序逐一執行；預設為階段數）
+            completed: 已完成階段的結果（例如從檢查點恢復），這些階段不再執行
+
+        Returns:
+            StageGraphResult 物件
+        """
+        result = StageGraphResult()
+        result.results.update({name: value for name, value in (completed or {}).items() if name in self.stages})
+        started_at = time.perf_counter()
+        pending = [name for name in self.order if name not in result.results]
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(self.order) or 1) as executor:
+            while pending or running:
+                # 相依失敗的階段直接略過
+                for name in list(pending):
+                    if any(d in result.failed or d in result.skipped for d in self.stages[name].depends_on):
+                        pending.remove(name)
+                        result.skipped.append(name)
+
+                # 提交相依已完成的階段（受並行數限制）
+                for name in list(pending):
+                    if max_workers and len(running) >= max_workers:
+                        break
+                    stage = self.stages[name]
+                    if all(d in result.results for d in stage.depends_on):
+                        pending.remove(name)
+                        kwargs = {d: result.results[d] for d in stage.depends_on}
+                        running[executor.submit(self._timed, stage.func, kwargs)] = name
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        value, duration = future.result()
+                    except Exception as e:
+                        logger.error(f"階段 {name} 執行失敗: {e}")
+                        result.failed.append(name)
+                        continue
+
+                    result.durations[name] = duration
+                    if value is None and self.stages[name].required:
+                        result.failed.append(name)
+                    else:
+                        result.results[name] = value
+
+        result.elapsed = time.perf_counter() - started_at
+        return result
+
+    @staticmethod
+    def _timed(func: Callable, kwargs: Dict) -> Tuple[Any, float]:
+        """執行並計時"""
+        start = time.perf_counter()
+        value = func(**kwargs)
+        return value, time.perf_counter() - start
+
+    def _topological_order(self) -> List[str]:
+        """拓撲排序"""
+        order = []
+        visited = set()
+
+        def visit(name: str, path: Tuple[str, ...]):
+            if name in path:
+                raise ValueError(f"階段相依形成循環：{' -> '.join(path + (name,))}")
+            if name in visited:
+                return
+            for dependency in self.stages[name].depends_on:
+                visit(dependency, path + (name,))
+            visited.add(name)
+            order.append(name)
+
+        for name in self.order:
+            visit(name, ())
+        return order
+
+    def _check_acyclic(self):
+        """檢查相依關係沒有循環"""
+        self._topological_order()
@@ -0,0 +1,34 @@
+"""測試共用設定：模組以 blog_system 目錄為匯入根目錄"""
+
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blog_manager import BlogManager, BlogPost  # noqa: E402
+
+@pytest.fixture
+def manager(tmp_path):
+    """以暫存資料庫建立的部落格管理器（含預設文章）"""
+    return BlogManager(db_path=str(tmp_path / "blog.db"))
+
+def make_post(article_id: str, title: str = "測試文章", content: str = "測試內容",
+              status: str = "published", **fields) -> BlogPost:
+    """建立測試用文章"""
+    now = datetime.now().isoformat()
+    return BlogPost(
+        id=article_id,
+        title=title,
+        content=content,
+        summary=fields.pop("summary", f"{title}摘要"),
+        category=fields.pop("category", "測試"),
+        tags=fields.pop("tags", ["測試"]),
+        author=fields.pop("author", "測試作者"),
+        status=status,
+        created_at=fields.pop("created_at", now),
+        updated_at=fields.pop("updated_at", now),
+        **fields
+    )
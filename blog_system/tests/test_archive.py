@@ -0,0 +1,39 @@
+"""封存冷熱分區測試"""
+
+from blog_manager import BlogManager
+
+def _archived_manager(tmp_path):
+    manager = BlogManager(db_path=str(tmp_path / "blog.db"), archive_path=str(tmp_path / "archive.db"))
+    assert manager.get_rendered_content("blog_001") is not None
+    assert manager.archive_article("blog_001")
+    assert manager.partition_archived() == 1
+    return manager
+
+def test_rendered_content_of_partitioned_article(tmp_path):
+    """已移至冷資料庫的文章仍可取得渲染結果"""
+    manager = _archived_manager(tmp_path)
+
+    rendered = manager.get_rendered_content("blog_001")
+    assert rendered is not None
+    assert rendered.html
+    assert manager.get_rendered_content("blog_missing") is None
+
+def test_hot_connections_do_not_attach_archive(tmp_path):
+    """一般連線不掛載冷資料庫，需要時才掛載"""
+    manager = _archived_manager(tmp_path)
+
+    conn = manager._connect()
+    assert [row[1] for row in conn.execute('PRAGMA database_list')] == ["main"]
+    conn.close()
+
+    assert manager.get_article("blog_001").status == "archived"
+    assert [post.id for post in manager.get_articles(status="archived")] == ["blog_001"]
+
+def test_update_restores_partitioned_article(tmp_path):
+    """更新冷資料庫中的文章會先移回主資料表"""
+    manager = _archived_manager(tmp_path)
+
+    assert manager.update_article("blog_001", {"status": "published"})
+    assert manager.increment_views("blog_001")
+    assert manager.get_article("blog_001").status == "published"
+    assert "blog_001" in [post.id for post in manager.get_articles()]
@@ -0,0 +1,46 @@
+"""文章儲存管線測試"""
+
+import sqlite3
+
+from article_sink import ArticleSink
+from conftest import make_post
+
+def test_bad_article_is_skipped(manager):
+    """單篇資料錯誤只略過該篇，其餘文章照常寫入"""
+    posts = [make_post("blog_ok_1"), make_post("blog_bad", title=None), make_post("blog_ok_2")]
+
+    assert manager.add_articles(posts) == ["blog_ok_1", "blog_ok_2"]
+    assert manager.get_article("blog_bad") is None
+    assert manager.get_rendered_content("blog_bad") is None
+
+def test_transient_error_rolls_back_batch(manager, monkeypatch):
+    """資料庫鎖定時整批回復並回傳 None"""
+    insert_post = manager._insert_post
+    calls = []
+
+    def locked_after_first(cursor, article, skip_existing=False):
+        calls.append(article.id)
+        if len(calls) > 1:
+            raise sqlite3.OperationalError("database is locked")
+        return insert_post(cursor, article, skip_existing)
+
+    monkeypatch.setattr(manager, "_insert_post", locked_after_first)
+    assert manager.add_articles([make_post("blog_a"), make_post("blog_b")]) is None
+    assert manager.get_article("blog_a") is None
+
+    # 連線已關閉、交易已回復，之後的寫入不受影響
+    monkeypatch.setattr(manager, "_insert_post", insert_post)
+    assert manager.add_articles([make_post("blog_a")]) == ["blog_a"]
+
+def test_sink_caps_retries(manager, monkeypatch):
+    """整批寫入持續失敗時重試有上限，不會無限放回緩衝區"""
+    monkeypatch.setattr(manager, "add_articles", lambda articles: None)
+    sink = ArticleSink(manager, batch_size=10, max_retries=2)
+    sink._buffer.append(make_post("blog_stuck"))
+
+    for _ in range(2):
+        assert sink.flush() == []
+        assert sink.pending_ids() == {"blog_stuck"}
+    assert sink.flush() == []
+    assert sink.pending() == 0
+    assert sink.dropped == 1
@@ -0,0 +1,44 @@
+"""搜尋框自動完成測試"""
+
+from autocomplete import AutocompleteIndex
+from conftest import make_post
+
+def _texts(index, prefix):
+    return [item["text"] for item in index.suggest(prefix)]
+
+def test_draft_only_tags_are_not_suggested(manager):
+    """只被草稿或封存文章使用的標籤不出現在建議中，全量與增量結果一致"""
+    manager.add_article(make_post("blog_draft", status="draft", tags=["草稿標籤"]))
+    manager.add_article(make_post("blog_old", status="archived", tags=["封存標籤"]))
+    index = AutocompleteIndex(manager)
+
+    assert _texts(index, "草稿") == []
+    assert _texts(index, "封存") == []
+
+    manager.add_article(make_post("blog_live", title="上線文章", tags=["上線標籤"]))
+    manager.add_article(make_post("blog_draft_2", status="draft", tags=["上線標籤", "新草稿標籤"]))
+    incremental = {prefix: index.suggest(prefix) for prefix in ("上線", "新草稿")}
+
+    index.rebuild()
+    assert {prefix: index.suggest(prefix) for prefix in ("上線", "新草稿")} == incremental
+    assert incremental["新草稿"] == []
+    assert [(item["text"], item["weight"]) for item in incremental["上線"] if item["kind"] == "tag"] == [("上線標籤", 1)]
+
+def test_engagement_updates_title_popularity(manager):
+    """瀏覽與按讚會即時調整標題排序"""
+    manager.add_article(make_post("blog_a", title="鉑金甲"))
+    manager.add_article(make_post("blog_b", title="鉑金乙"))
+    index = AutocompleteIndex(manager)
+    assert _texts(index, "鉑金")[:2] == ["鉑金乙", "鉑金甲"]
+
+    manager.increment_likes("blog_a")
+    assert _texts(index, "鉑金")[:2] == ["鉑金甲", "鉑金乙"]
+
+    for _ in range(6):
+        manager.increment_views("blog_b")
+    assert _texts(index, "鉑金")[:2] == ["鉑金乙", "鉑金甲"]
+
+    # 增量結果與全量重建一致
+    incremental = index.suggest("鉑金")
+    index.rebuild()
+    assert index.suggest("鉑金") == incremental
@@ -0,0 +1,50 @@
+"""靜態匯出測試"""
+
+import os
+
+from blog_exporter import BlogExporter, category_slug, post_slug
+from conftest import make_post
+
+def _files(root):
+    return {
+        os.path.relpath(os.path.join(directory, name), root)
+        for directory, _, names in os.walk(root) for name in names
+    }
+
+def test_export_writes_pages_and_skips_unchanged(manager, tmp_path):
+    """首次匯出產生文章頁與列表頁，沒有變更時不重寫"""
+    exporter = BlogExporter(manager, output_dir=str(tmp_path / "dist"), workers=1)
+
+    stats = exporter.export()
+    files = _files(tmp_path / "dist")
+    assert stats["posts_rendered"] == 2
+    assert {"posts/blog_001.html", "posts/blog_001.html.gz", "index.html"} <= files
+
+    assert exporter.export()["pages_written"] == 0
+
+def test_unpublished_post_pages_are_removed(manager, tmp_path):
+    """下架的文章與清空的分類頁會被移除"""
+    manager.add_article(make_post("blog_solo", category="單篇分類"))
+    exporter = BlogExporter(manager, output_dir=str(tmp_path / "dist"), workers=1)
+    exporter.export()
+    assert f"category/{category_slug('單篇分類')}/index.html" in _files(tmp_path / "dist")
+
+    manager.update_article("blog_solo", {"status": "draft"})
+    exporter.export()
+    files = _files(tmp_path / "dist")
+    assert "posts/blog_solo.html" not in files
+    assert not any(path.startswith("category/單篇分類") for path in files)
+
+def test_article_id_cannot_escape_output_dir(manager, tmp_path):
+    """含路徑字元的文章 ID 改寫為輸出目錄內的檔名，列表連結也經過編碼"""
+    manager.add_article(make_post("../../evil", title="越界文章"))
+    output_dir = tmp_path / "out" / "dist"
+    BlogExporter(manager, output_dir=str(output_dir), workers=1).export()
+
+    assert not (tmp_path / "evil.html").exists()
+    assert not (tmp_path / "out" / "evil.html").exists()
+    assert f"posts/{post_slug('../../evil')}.html" in _files(output_dir)
+    assert "/" not in post_slug("../../evil") and not post_slug("../../evil").startswith(".")
+
+    index = (output_dir / "index.html").read_text(encoding="utf-8")
+    assert f'href="/blog/posts/{post_slug("../../evil")}.html"' in index
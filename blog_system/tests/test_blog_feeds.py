@@ -0,0 +1,44 @@
+"""RSS／Atom／sitemap 測試"""
+
+from blog_feeds import BlogFeedGenerator
+from conftest import make_post
+
+def _body(chunks) -> str:
+    return b"".join(chunks).decode("utf-8")
+
+def test_rss_lists_published_posts_and_honours_etag(manager):
+    """RSS 只列出已發布文章，ETag 相符時回傳 304（無內容）"""
+    manager.add_article(make_post("blog_draft", title="草稿文章", status="draft"))
+    feeds = BlogFeedGenerator(manager, site_url="https://example.com")
+
+    etag, chunks = feeds.get_rss()
+    body = _body(chunks)
+    assert "https://example.com/blog/blog_001" in body
+    assert "草稿文章" not in body
+
+    assert feeds.get_rss(if_none_match=etag) == (etag, None)
+    assert _body(feeds.get_atom()[1]).count("<entry>") == 2
+
+def test_etag_changes_when_uncategorised_post_is_unpublished(manager):
+    """沒有分類的文章下架或刪除時 ETag 也會改變"""
+    manager.add_article(make_post("blog_plain", category=None, updated_at="2000-01-01T00:00:00"))
+    feeds = BlogFeedGenerator(manager, site_url="https://example.com")
+    before = feeds.current_etag("rss")
+
+    # 直接改狀態（不更新 updated_at），最新更新時間不變，只有已發布文章數改變
+    conn = manager._connect()
+    conn.execute("UPDATE blog_posts SET status = 'draft' WHERE id = 'blog_plain'")
+    conn.commit()
+    conn.close()
+    assert feeds.current_etag("rss") != before
+
+def test_sitemap_is_sharded(manager):
+    """sitemap 依網址上限分片"""
+    feeds = BlogFeedGenerator(manager, site_url="https://example.com", sitemap_max_urls=1)
+
+    assert feeds.sitemap_shard_count() == 2
+    index = _body(feeds.get_sitemap_index()[1])
+    assert "/blog/sitemap-1.xml" in index and "/blog/sitemap-2.xml" in index
+    first, second = _body(feeds.get_sitemap(1)[1]), _body(feeds.get_sitemap(2)[1])
+    assert first.count("<url>") == second.count("<url>") == 1
+    assert first != second
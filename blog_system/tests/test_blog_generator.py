@@ -0,0 +1,78 @@
+"""文章生成器測試（離線替身後端）"""
+
+import pytest
+
+from article_sink import ArticleSink
+from blog_generator import BlogGenerator
+from llm_backend import StubBackend
+
+def _generator(**kwargs) -> BlogGenerator:
+    return BlogGenerator(backend=StubBackend(), cache_path=None, draft_dir=None, export_json=False, **kwargs)
+
+def test_local_components_require_manager(tmp_path, monkeypatch):
+    """啟用本機關鍵字或主題去重時不會自動開啟工作目錄下的資料庫"""
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(ValueError):
+        _generator(local_keywords=True)
+    with pytest.raises(ValueError):
+        _generator(dedup_topics=True)
+    assert not (tmp_path / "data" / "blog.db").exists()
+
+def test_local_components_use_given_manager(manager):
+    """本機元件使用傳入的管理器，或沿用 sink 的管理器"""
+    generator = _generator(local_keywords=True, dedup_topics=True, manager=manager)
+    assert generator.keyword_extractor.manager is manager
+    assert generator.deduplicator.manager is manager
+
+    generator = _generator(dedup_topics=True, sink=ArticleSink(manager))
+    assert generator.deduplicator.manager is manager
+
+def test_sampled_responses_are_cached_per_article(tmp_path):
+    """同主題的不同文章不共用快取的標題與大綱，同一篇文章重跑時才重用"""
+    backend = StubBackend()
+    generator = BlogGenerator(backend=backend, cache_path=str(tmp_path / "llm_cache.db"), draft_dir=None,
+                              export_json=False)
+
+    generator.create_blog_article("投資策略", "黃金ETF投資", job_id="blog_first")
+    generator.create_blog_article("投資策略", "黃金ETF投資", job_id="blog_second")
+    assert backend.stage_calls["title"] == 2
+    assert backend.stage_calls["outline"] == 2
+
+    generator.create_blog_article("投資策略", "黃金ETF投資", job_id="blog_first")
+    assert backend.stage_calls["title"] == 2
+    assert backend.stage_calls["outline"] == 2
+
+    # 不在文章工作中的取樣呼叫不使用快取
+    generator.generate_seo_optimized_title("黃金ETF投資", "投資策略")
+    generator.generate_seo_optimized_title("黃金ETF投資", "投資策略")
+    assert backend.stage_calls["title"] == 4
+
+def test_cache_is_off_by_default(tmp_path, monkeypatch):
+    """未指定快取路徑時不在工作目錄建立快取資料庫"""
+    monkeypatch.chdir(tmp_path)
+    generator = BlogGenerator(backend=StubBackend(), draft_dir=None, export_json=False)
+    generator.create_blog_article("投資策略", "黃金ETF投資")
+
+    assert generator.response_cache is None
+    assert not (tmp_path / "data" / "llm_cache.db").exists()
+
+def test_batch_interleaves_categories_by_weight():
+    """批次依分類權重加權輪流出題，權重 0 的分類不出題，主題用完前不重複"""
+    generator = _generator(concurrent_stages=False)
+    topics = []
+    original = generator.pick_topic
+
+    def pick_topic(category, exclude=()):
+        topic = original(category, exclude)
+        topics.append(topic)
+        return topic
+    generator.pick_topic = pick_topic
+
+    weights = {"投資策略": 2, "市場分析": 1, "實用知識": 0, "歷史文化": 0, "時事評論": 0}
+    articles = generator.generate_batch(6, weights=weights, max_concurrency=1, save=False)
+
+    assert [article.category for article in articles] == ["投資策略", "投資策略", "市場分析",
+                                                        "投資策略", "投資策略", "市場分析"]
+    assert len(set(topics)) == len(topics)
+    assert generator.generate_batch(3, weights={category: 0 for category in weights}, save=False) == []
@@ -0,0 +1,43 @@
+"""內容壓縮測試"""
+
+import dataclasses
+import pickle
+
+from blog_manager import BlogManager, BlogPost
+from conftest import make_post
+
+def _compressed_manager(tmp_path):
+    manager = BlogManager(db_path=str(tmp_path / "blog.db"), compress_content=True)
+    manager.recode_content(compress=True)
+    return manager
+
+def test_listing_decodes_content_lazily(tmp_path):
+    """列表結果在存取內容前不解壓"""
+    manager = _compressed_manager(tmp_path)
+    expected = {post.id: post.content for post in manager.get_articles()}
+
+    calls = []
+    decode = manager.decode_content
+    manager.decode_content = lambda value: calls.append(value) or decode(value)
+
+    posts = manager.get_articles()
+    assert calls == []
+    assert {post.id: post.content for post in posts} == expected
+    assert len(calls) == len(posts)
+
+    post = posts[0]
+    assert post.content == expected[post.id]
+    assert len(calls) == len(posts)
+    assert dataclasses.asdict(post)["content"] == expected[post.id]
+    assert pickle.loads(pickle.dumps(post)) == post
+    assert BlogPost(**dataclasses.asdict(post)) == post
+
+def test_search_matches_compressed_content(tmp_path):
+    """搜尋仍可比對壓縮內容"""
+    manager = _compressed_manager(tmp_path)
+    manager.add_article(make_post("blog_needle", title="一般標題", content="內文中的關鍵片語 " * 50))
+    manager.recode_content(compress=True)
+
+    results = manager.search_articles("關鍵片語")
+    assert [post.id for post in results] == ["blog_needle"]
+    assert "關鍵片語" in results[0].content
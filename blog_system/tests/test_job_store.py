@@ -0,0 +1,77 @@
+"""生成工作紀錄與續跑測試（離線替身後端）"""
+
+from blog_generator import BlogGenerator
+from job_store import JobStore
+from llm_backend import StubBackend
+
+class FailingBackend(StubBackend):
+    """指定階段一律失敗的替身後端"""
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+
+    def complete(self, model, messages, params, stage=None):
+        if stage in self.failing:
+            self._record(stage)
+            raise RuntimeError(f"{stage} 失敗")
+        return super().complete(model, messages, params, stage)
+
+def _generator(store, backend, job_attempts=3) -> BlogGenerator:
+    return BlogGenerator(backend=backend, cache_path=None, draft_dir=None, export_json=False,
+                         concurrent_stages=False, job_store=store, job_attempts=job_attempts)
+
+def test_degraded_stage_is_retried_on_resume(tmp_path):
+    """API 失敗改用備援結果的階段標記為 degraded，續跑時重新執行"""
+    store = JobStore(str(tmp_path / "jobs.db"))
+    generator = _generator(store, FailingBackend({"title", "outline"}))
+    assert generator.create_blog_article("投資策略", "黃金投資入門指南", job_id="job_1") is None
+
+    assert "title" not in store.checkpoints("job_1")
+    assert store.checkpoints("job_1", include_degraded=True)["title"] == "黃金投資入門指南"
+
+    backend = StubBackend()
+    article = _generator(store, backend).resume_job("job_1")
+    assert article is not None
+    assert backend.stage_calls.get("title") == 1
+    assert article.title != "黃金投資入門指南"
+
+def test_attempts_accumulate_across_resumes(tmp_path):
+    """嘗試次數跨續跑累計，用完即放棄，批次不會永遠未完成"""
+    store = JobStore(str(tmp_path / "jobs.db"))
+    backend = FailingBackend({"outline"})
+    generator = _generator(store, backend, job_attempts=2)
+
+    assert generator.generate_batch(1, max_concurrency=1, save=False, batch_id="batch_1") == []
+    [job] = store.batch_jobs("batch_1")
+    assert job["status"] == "abandoned"
+    assert job["attempts"] == 2
+    assert store.unfinished_batches() == []
+
+    calls = backend.calls
+    assert generator.resume_batches(max_concurrency=1, save=False) == []
+    assert generator.generate_batch(1, max_concurrency=1, save=False, batch_id="batch_1") == []
+    assert backend.calls == calls
+
+def test_interrupted_job_at_limit_is_abandoned(tmp_path):
+    """中斷時已用完嘗試次數的工作在續跑時直接放棄"""
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.create_jobs([{"id": "job_1", "category": "投資策略", "topic": "黃金投資入門指南"}], "batch_1")
+    for _ in range(3):
+        store.start("job_1")
+
+    backend = StubBackend()
+    assert _generator(store, backend).generate_batch(1, max_concurrency=1, save=False, batch_id="batch_1") == []
+    assert backend.calls == 0
+    assert store.get_job("job_1")["status"] == "abandoned"
+    assert store.unfinished_batches() == []
+
+def test_job_without_topic_is_abandoned(tmp_path, monkeypatch):
+    """沒有可生成主題的工作標記為放棄"""
+    store = JobStore(str(tmp_path / "jobs.db"))
+    generator = _generator(store, StubBackend())
+    monkeypatch.setattr(generator, "pick_topic", lambda category, exclude=(): None)
+
+    assert generator.generate_batch(2, max_concurrency=1, save=False, batch_id="batch_1") == []
+    assert {job["status"] for job in store.batch_jobs("batch_1")} == {"abandoned"}
+    assert store.unfinished_batches() == []
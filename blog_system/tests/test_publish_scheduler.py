@@ -0,0 +1,69 @@
+"""排程發布測試"""
+
+from datetime import datetime, timedelta, timezone
+
+from conftest import make_post
+from publish_scheduler import PublishScheduler
+
+def test_timezone_aware_schedule_is_published(manager):
+    """帶時區的排程時間換算為本地時間保存，到期後可發布"""
+    manager.add_article(make_post("blog_tz", status="draft"))
+    publish_at = datetime.now(timezone(timedelta(hours=-10))) - timedelta(minutes=1)
+    assert manager.schedule_article("blog_tz", publish_at)
+
+    scheduled = manager.get_scheduled_articles()
+    assert [item["id"] for item in scheduled] == ["blog_tz"]
+    assert datetime.fromisoformat(scheduled[0]["scheduled_at"]).tzinfo is None
+
+    assert manager.publish_due_articles(datetime.now(timezone.utc)) == ["blog_tz"]
+    assert manager.get_article("blog_tz").status == "published"
+
+def test_status_change_cancels_schedule(manager):
+    """改變狀態即取消排程，已封存的文章不會被排程發布"""
+    manager.add_article(make_post("blog_cancel", status="draft"))
+    manager.schedule_article("blog_cancel", datetime.now() - timedelta(minutes=1))
+    manager.archive_article("blog_cancel")
+
+    article = manager.get_article("blog_cancel")
+    assert article.scheduled_at is None
+    assert manager.publish_due_articles() == []
+    assert manager.get_article("blog_cancel").status == "archived"
+
+def test_schedule_rejects_published_and_archived(manager):
+    """已發布、封存或不存在的文章不能排程"""
+    manager.add_article(make_post("blog_live"))
+    manager.add_article(make_post("blog_old", status="archived"))
+    publish_at = datetime.now() + timedelta(hours=1)
+
+    assert not manager.schedule_article("blog_live", publish_at)
+    assert not manager.schedule_article("blog_old", publish_at)
+    assert not manager.schedule_article("blog_missing", publish_at)
+    assert manager.get_article("blog_live").scheduled_at is None
+    assert manager.get_article("blog_old").scheduled_at is None
+    assert manager.get_scheduled_articles() == []
+
+def test_only_drafts_are_published(manager):
+    """排程時間殘留在非草稿文章上時不會改變其狀態"""
+    manager.add_article(make_post("blog_archived", status="archived",
+                                  scheduled_at=(datetime.now() - timedelta(minutes=1)).isoformat()))
+
+    assert manager.get_scheduled_articles() == []
+    assert manager.publish_due_articles() == []
+    assert manager.get_article("blog_archived").status == "archived"
+
+def test_scheduler_keeps_schedule_when_publish_fails(manager, monkeypatch):
+    """到期文章發布失敗時放回堆積，稍後重試"""
+    manager.add_article(make_post("blog_retry", status="draft"))
+    scheduler = PublishScheduler(manager, retry_delay=60)
+    manager.schedule_article("blog_retry", datetime.now() - timedelta(seconds=1))
+    assert scheduler.pending_count() == 1
+
+    publish_due_articles = manager.publish_due_articles
+    monkeypatch.setattr(manager, "publish_due_articles", lambda now=None: [])
+    assert scheduler.run_pending() == []
+    assert scheduler.pending_count() == 1
+    assert scheduler.next_due() > datetime.now() + timedelta(seconds=30)
+
+    monkeypatch.setattr(manager, "publish_due_articles", publish_due_articles)
+    assert manager.publish_due_articles() == ["blog_retry"]
+    assert scheduler.pending_count() == 0
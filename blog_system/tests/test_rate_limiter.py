@@ -0,0 +1,118 @@
+"""API 速率限制器測試"""
+
+import threading
+
+import pytest
+
+import rate_limiter
+from blog_generator import BlogGenerator
+from llm_backend import StubBackend
+from rate_limiter import RateLimiter
+
+class FakeClock:
+    """可手動推進的 monotonic 時鐘"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+class RateLimitError(Exception):
+    http_status = 429
+
+class ThrottledBackend(StubBackend):
+    """前幾次呼叫回傳 429 的替身後端"""
+
+    def __init__(self, throttled_calls=1):
+        super().__init__()
+        self.remaining = throttled_calls
+
+    def complete(self, model, messages, params, stage=None):
+        if self.remaining:
+            self.remaining -= 1
+            self._record(stage)
+            raise RateLimitError("429 Too Many Requests")
+        return super().complete(model, messages, params, stage)
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", fake)
+    return fake
+
+def _acquire_in_background(limiter, tokens):
+    thread = threading.Thread(target=limiter.acquire, args=(tokens,), daemon=True)
+    thread.start()
+    thread.join(0.2)
+    return thread
+
+def test_request_budget_blocks_until_window_expires(clock):
+    """每分鐘請求數用完時等待最舊的請求移出視窗"""
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=10 ** 6)
+    first = limiter.acquire(10)
+    limiter.acquire(10)
+
+    waiting = _acquire_in_background(limiter, 10)
+    assert waiting.is_alive()
+
+    clock.now += 61
+    limiter.settle(first, None)
+    waiting.join(1)
+    assert not waiting.is_alive()
+    assert limiter.stats()["requests_in_window"] == 1
+
+def test_token_budget_uses_actual_usage(clock):
+    """token 預算不足時等待，回應後以實際用量修正即可放行"""
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100)
+    first = limiter.acquire(60)
+
+    waiting = _acquire_in_background(limiter, 60)
+    assert waiting.is_alive()
+
+    limiter.settle(first, 30)
+    waiting.join(1)
+    assert not waiting.is_alive()
+    assert limiter.stats()["tokens_in_window"] == 90
+
+def test_oversized_request_passes_on_empty_window(clock):
+    """單一請求超過整個 token 預算時，視窗淨空即放行"""
+    limiter = RateLimiter(tokens_per_minute=100)
+    limiter.acquire(500)
+    assert limiter.stats()["tokens_in_window"] == 500
+
+def test_rate_limited_pauses_and_halves_budget(clock):
+    """429 後暫停所有請求並將預算減半，成功後逐步恢復"""
+    limiter = RateLimiter(requests_per_minute=10, tokens_per_minute=10 ** 6, recovery_step=0.1)
+    entry = limiter.acquire(10)
+
+    backoff = limiter.on_rate_limited(retry_after=2)
+    assert 2 <= backoff <= 2.5
+    assert limiter.factor == 0.5
+    assert limiter.throttled == 1
+
+    waiting = _acquire_in_background(limiter, 10)
+    assert waiting.is_alive()
+
+    clock.now += 3
+    limiter.settle(entry, 10)
+    waiting.join(1)
+    assert not waiting.is_alive()
+    assert limiter.factor == pytest.approx(0.6)
+
+    for _ in range(10):
+        limiter.on_rate_limited(retry_after=0.01)
+    assert limiter.factor == limiter.min_factor
+
+def test_generator_retries_after_rate_limit():
+    """生成器遇到 429 時退避後重試同一個呼叫"""
+    backend = ThrottledBackend(throttled_calls=2)
+    limiter = RateLimiter(max_backoff=0.01)
+    generator = BlogGenerator(backend=backend, cache_path=None, draft_dir=None, export_json=False,
+                              rate_limiter=limiter)
+
+    title = generator.generate_seo_optimized_title("黃金ETF投資", "投資策略")
+    assert title
+    assert backend.stage_calls["title"] == 3
+    assert limiter.throttled == 2
+    assert limiter.factor < 1.0
@@ -0,0 +1,40 @@
+"""相關文章索引測試"""
+
+import sqlite3
+
+from conftest import make_post
+from related_articles import RelatedArticlesIndex
+
+def _document_frequencies(db_path):
+    conn = sqlite3.connect(db_path)
+    rows = dict(conn.execute('SELECT term, df FROM related_df').fetchall())
+    conn.close()
+    return rows
+
+def test_reindex_keeps_document_frequencies(manager):
+    """重新索引同一篇文章後文件頻率不變（詞元數超過 max_terms 時也一樣）"""
+    content = " ".join(f"詞彙{i} term{i}" for i in range(200))
+    manager.add_article(make_post("blog_long", title="黃金價格分析", content=content))
+    index = RelatedArticlesIndex(manager, max_terms=8)
+    before = _document_frequencies(manager.db_path)
+
+    for _ in range(3):
+        manager.update_article("blog_long", {"summary": "更新摘要"})
+        manager.update_article("blog_long", {"summary": "黃金價格分析摘要"})
+    after = _document_frequencies(manager.db_path)
+
+    assert after == before
+    assert index.rebuild()
+    assert _document_frequencies(manager.db_path) == before
+
+def test_unpublish_removes_all_document_frequencies(manager):
+    """文章下架後，其所有詞元的文件頻率都會扣回"""
+    index = RelatedArticlesIndex(manager, max_terms=4)
+    before = _document_frequencies(manager.db_path)
+
+    manager.add_article(make_post("blog_extra", content=" ".join(f"word{i}" for i in range(50))))
+    assert _document_frequencies(manager.db_path) != before
+    manager.update_article("blog_extra", {"status": "draft"})
+
+    assert _document_frequencies(manager.db_path) == before
+    assert index.get_related("blog_extra") == []
@@ -0,0 +1,57 @@
+"""記憶體讀取快照測試"""
+
+import sqlite3
+import time
+
+from blog_manager import BlogManager
+
+def _external_update(db_path, article_id, title):
+    """以另一條連線（模擬 Node 伺服器等其他程序）直接寫入"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('UPDATE blog_posts SET title = ? WHERE id = ?', (title, article_id))
+    conn.commit()
+    conn.close()
+
+def test_refresh_picks_up_external_writes(tmp_path):
+    """其他連線的寫入在下次刷新時反映到快照"""
+    manager = BlogManager(db_path=str(tmp_path / "blog.db"), snapshot=True, snapshot_interval=3600)
+    try:
+        title = manager.get_article("blog_001").title
+        _external_update(manager.db_path, "blog_001", "外部更新的標題")
+        assert manager.get_article("blog_001").title == title
+
+        manager.refresh_snapshot()
+        assert manager.get_article("blog_001").title == "外部更新的標題"
+    finally:
+        manager.close()
+
+def test_refresh_loop_picks_up_external_writes(tmp_path):
+    """背景刷新執行緒會偵測其他連線的寫入"""
+    manager = BlogManager(db_path=str(tmp_path / "blog.db"), snapshot=True, snapshot_interval=0.05)
+    try:
+        _external_update(manager.db_path, "blog_002", "背景刷新的標題")
+
+        deadline = time.monotonic() + 5
+        while manager.get_article("blog_002").title != "背景刷新的標題":
+            assert time.monotonic() < deadline, "快照未反映外部寫入"
+            time.sleep(0.02)
+    finally:
+        manager.close()
+
+def test_engagement_counters_do_not_refresh_snapshot(tmp_path, monkeypatch):
+    """瀏覽與按讚計數不觸發快照刷新（避免每次瀏覽都備份整個資料庫）"""
+    manager = BlogManager(db_path=str(tmp_path / "blog.db"), snapshot=True, snapshot_interval=0)
+    try:
+        refreshes = []
+        monkeypatch.setattr(manager, "refresh_snapshot", lambda force=False: refreshes.append(force) or True)
+
+        for _ in range(5):
+            assert manager.increment_views("blog_001")
+        assert manager.increment_likes("blog_001")
+        assert refreshes == []
+        assert not manager._snapshot_dirty
+
+        manager.update_article("blog_001", {"summary": "更新摘要"})
+        assert refreshes == [False]
+    finally:
+        manager.close()
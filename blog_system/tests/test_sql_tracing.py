@@ -0,0 +1,52 @@
+"""SQL 追蹤測試"""
+
+import pytest
+
+from conftest import make_post
+from sql_tracing import QueryTracer, normalize_sql
+
+def test_normalize_sql_groups_constants():
+    """常數、空白與 IN 清單正規化後彙整為同一種查詢"""
+    assert normalize_sql("SELECT * FROM blog_posts WHERE id = 'a''b' AND views > 10") == \
+        "SELECT * FROM blog_posts WHERE id = ? AND views > ?"
+    assert normalize_sql("SELECT id\n  FROM tags WHERE name IN (?, ?,?)") == \
+        "SELECT id FROM tags WHERE name IN (...)"
+
+def test_manager_queries_are_traced(manager):
+    """啟用追蹤後依正規化 SQL 彙整次數，慢查詢附上查詢計畫"""
+    tracer = manager.enable_tracing(slow_query_ms=0)
+    manager.get_article("blog_001")
+    manager.get_article("blog_002")
+    manager.add_article(make_post("blog_traced"))
+
+    rows = tracer.report(limit=100, order_by="count")
+    by_sql = {row["sql"]: row for row in rows}
+    lookups = [row for sql, row in by_sql.items() if sql.startswith("SELECT") and "WHERE id = ?" in sql]
+    assert lookups and max(row["count"] for row in lookups) >= 2
+    assert all(row["plan"] for row in lookups)
+
+    insert = next(row for sql, row in by_sql.items() if sql.startswith("INSERT INTO blog_posts"))
+    # 觸發器會以外層敘述的文字再回報，traced 次數多於 cursor 執行次數
+    assert insert["traced"] > insert["count"]
+
+    summary = tracer.summary()
+    assert summary["connections_opened"] >= 3
+    assert summary["statements"] == sum(row["count"] for row in rows)
+
+    manager.disable_tracing()
+    tracer.reset()
+    manager.get_article("blog_001")
+    assert tracer.summary()["statements"] == 0
+
+def test_shared_tracer_counts_connections():
+    """未掛到管理器時也可直接記錄敘述與連線"""
+    tracer = QueryTracer(slow_query_ms=1000)
+    tracer.record_connection()
+    tracer.record("SELECT 1", 0.002)
+    tracer.record("SELECT 2", 0.004)
+
+    [row] = tracer.report()
+    assert row["sql"] == "SELECT ?"
+    assert row["count"] == 2
+    assert row["max_ms"] == pytest.approx(4.0)
+    assert tracer.summary()["connections_opened"] == 1
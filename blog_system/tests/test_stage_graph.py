@@ -0,0 +1,72 @@
+"""階段相依圖測試"""
+
+import threading
+
+import pytest
+
+from stage_graph import Stage, StageGraph
+
+def test_dependencies_receive_results():
+    """相依階段的結果以關鍵字參數傳入"""
+    graph = StageGraph([
+        Stage("outline", lambda: "大綱"),
+        Stage("content", lambda outline: f"{outline}內容", depends_on=("outline",)),
+        Stage("summary", lambda content: content[:2], depends_on=("content",)),
+    ])
+    result = graph.run()
+
+    assert result.ok
+    assert result.results == {"outline": "大綱", "content": "大綱內容", "summary": "大綱"}
+    assert graph.critical_path_length() == 3
+
+def test_independent_stages_run_concurrently():
+    """彼此獨立的階段同時執行"""
+    barrier = threading.Barrier(2, timeout=2)
+    graph = StageGraph([
+        Stage("title", lambda: barrier.wait() is not None),
+        Stage("outline", lambda: barrier.wait() is not None),
+    ])
+    result = graph.run()
+
+    assert result.ok
+    assert graph.critical_path_length() == 1
+
+def test_failures_skip_dependents():
+    """失敗或必要結果為 None 的階段讓相依階段略過，非必要階段可回傳 None"""
+    def explode():
+        raise RuntimeError("API 失敗")
+
+    graph = StageGraph([
+        Stage("outline", explode),
+        Stage("content", lambda outline: "內容", depends_on=("outline",)),
+        Stage("title", lambda: None),
+        Stage("image", lambda: None, required=False),
+    ])
+    result = graph.run()
+
+    assert not result.ok
+    assert sorted(result.failed) == ["outline", "title"]
+    assert result.skipped == ["content"]
+    assert "image" in result.results
+
+def test_completed_stages_are_not_rerun():
+    """從檢查點恢復的階段不再執行"""
+    calls = []
+    graph = StageGraph([
+        Stage("outline", lambda: calls.append("outline") or "大綱"),
+        Stage("content", lambda outline: calls.append("content") or f"{outline}內容", depends_on=("outline",)),
+    ])
+    result = graph.run(max_workers=1, completed={"outline": "舊大綱"})
+
+    assert calls == ["content"]
+    assert result.results["content"] == "舊大綱內容"
+
+def test_invalid_graphs_are_rejected():
+    """相依於不存在的階段或形成循環時拒絕建立"""
+    with pytest.raises(ValueError):
+        StageGraph([Stage("content", lambda outline: None, depends_on=("outline",))])
+    with pytest.raises(ValueError):
+        StageGraph([
+            Stage("a", lambda b: None, depends_on=("b",)),
+            Stage("b", lambda a: None, depends_on=("a",)),
+        ])
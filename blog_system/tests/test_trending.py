@@ -0,0 +1,50 @@
+"""熱門文章排行榜測試"""
+
+from conftest import make_post
+from trending import TrendingTracker
+
+def _ids(tracker, category=None):
+    return [item["id"] for item in tracker.get_trending(category)]
+
+def test_engagement_updates_boards(manager):
+    """瀏覽與按讚即時更新全站與分類排行"""
+    manager.add_article(make_post("blog_a", category="市場分析"))
+    manager.add_article(make_post("blog_b", category="市場分析"))
+    tracker = TrendingTracker(manager, persist_interval=0)
+
+    manager.increment_views("blog_a")
+    manager.increment_likes("blog_b")
+    assert _ids(tracker, "市場分析") == ["blog_b", "blog_a"]
+
+    for _ in range(6):
+        manager.increment_views("blog_a")
+    assert _ids(tracker, "市場分析") == ["blog_a", "blog_b"]
+    assert _ids(tracker)[0] == "blog_a"
+
+def test_unpublished_articles_leave_the_board(manager):
+    """下架或刪除的文章從排行移除，草稿的互動不列入排行"""
+    manager.add_article(make_post("blog_a"))
+    manager.add_article(make_post("blog_draft", status="draft"))
+    tracker = TrendingTracker(manager, persist_interval=0)
+
+    manager.increment_likes("blog_a")
+    manager.increment_likes("blog_draft")
+    assert "blog_a" in _ids(tracker)
+    assert "blog_draft" not in _ids(tracker)
+
+    manager.update_article("blog_a", {"status": "draft"})
+    assert "blog_a" not in _ids(tracker, "測試")
+    assert "blog_a" not in _ids(tracker)
+
+def test_scores_survive_restart(manager):
+    """寫回的分數在重新啟動後載入"""
+    manager.add_article(make_post("blog_a"))
+    tracker = TrendingTracker(manager, persist_interval=0)
+    for _ in range(3):
+        manager.increment_likes("blog_a")
+    tracker.close()
+
+    reloaded = TrendingTracker(manager, persist_interval=0)
+    board = reloaded.get_trending("測試")
+    assert [item["id"] for item in board] == ["blog_a"]
+    assert board[0]["score"] > 14
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+文字分析工具
+提供繁體中文文章的斷詞（字元 n-gram）與 TF-IDF 計算
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Dict, Iterable
+
+# 中日韓統一表意文字
+_CJK_RUN_RE = re.compile(r'[㐀-䶿一-鿿豈-﫿]+')
+# 英文字詞與數字（如 ETF、RSI、2025）
+_WORD_RE = re.compile(r'[A-Za-z][A-Za-z0-9]*|\d+')
+# Markdown 語法與網址
+_MARKUP_RE = re.compile(r'https?://\S+|[#>*`_\[\]()|~-]+')
+
+def strip_markdown(text: str) -> str:
+    """移除 Markdown 語法符號與網址"""
+    return _MARKUP_RE.sub(' ', text or "")
+
+def cjk_runs(text: str) -> List[str]:
+    """連續的中文片段（已移除 Markdown 語法）"""
+    return _CJK_RUN_RE.findall(strip_markdown(text))
+
+def latin_words(text: str) -> List[str]:
+    """英文字詞（保留大小寫，如 ETF、RSI；不含純數字）"""
+    return [word for word in _WORD_RE.findall(_CJK_RUN_RE.sub(' ', strip_markdown(text))) if not word.isdigit()]
+
+def tokenize(text: str, ngram: int = 2) -> List[str]:
+    """
+    將文字切分為詞元
+
+    中文以字元 n-gram 切分（片段短於 n 時保留整段），
+    英文與數字以單字切分並轉為小寫。
+
+    Args:
+        text: 原始文字
+        ngram: 中文字元 n-gram 長度
+
+    Returns:
+        詞元列表
+    """
+    text = strip_markdown(text)
+    tokens = []
+
+    for run in _CJK_RUN_RE.findall(text):
+        if len(run) <= ngram:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + ngram] for i in range(len(run) - ngram + 1))
+
+    tokens.extend(word.lower() for word in _WORD_RE.findall(_CJK_RUN_RE.sub(' ', text)))
+    return tokens
+
+def term_frequencies(fields: Iterable[tuple], ngram: int = 2) -> Counter:
+    """
+    計算加權詞頻
+
+    Args:
+        fields: (文字, 權重) 序列，例如標題權重高於內文
+        ngram: 中文字元 n-gram 長度
+
+    Returns:
+        詞頻 Counter
+    """
+    counts = Counter()
+    for text, weight in fields:
+        for token in tokenize(text, ngram):
+            counts[token] += weight
+    return counts
+
+def idf(document_frequency: int, total_documents: int) -> float:
+    """平滑 IDF"""
+    return math.log((total_documents + 1) / (document_frequency + 1)) + 1.0
+
+def tfidf_vector(counts: Counter, document_frequencies: Dict[str, int],
+                 total_documents: int, max_terms: int = None) -> Dict[str, float]:
+    """
+    計算 L2 正規化的 TF-IDF 向量
+
+    Args:
+        counts: 詞頻
+        document_frequencies: 各詞元的文件頻率
+        total_documents: 文件總數
+        max_terms: 只保留權重最高的詞元數（可選）
+
+    Returns:
+        {詞元: 權重}
+    """
+    weights = {
+        term: (1.0 + math.log(count)) * idf(document_frequencies.get(term, 0), total_documents)
+        for term, count in counts.items() if count > 0
+    }
+
+    if max_terms and len(weights) > max_terms:
+        weights = dict(sorted(weights.items(), key=lambda item: item[1], reverse=True)[:max_terms])
+
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if norm == 0:
+        return {}
+    return {term: weight / norm for term, weight in weights.items()}
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+主題去重
+生成文章前以既有文章的標題與摘要建立 TF-IDF 反向索引，找出與候選主題過於相似的文章
+"""
+
+import logging
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from blog_manager import BlogManager
+from text_analysis import term_frequencies, tfidf_vector
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 詞元只出現在摘要（不在標題）時的涵蓋權重：摘要常提及相關概念，只有標題相符才視為同一主題
+SUMMARY_COVERAGE = 0.5
+
+class TopicDeduplicator:
+    """
+    主題相似度檢查
+
+    每篇文章的標題與摘要轉為字元 bigram 並建立反向索引，查詢時只累加與候選主題共有詞元的文章。
+    主題通常遠短於標題加摘要，餘弦相似度會被文章長度稀釋，因此以「涵蓋率」評分：
+    候選主題的 TF-IDF 權重（平方和為 1）中有多少落在該文章出現的詞元上（只在摘要出現的詞元打折），
+    主題完整出現在既有標題時為 1，只共用「黃金」等常見詞時接近 0。
+    """
+
+    def __init__(self, manager: BlogManager, threshold: float = 0.7):
+        """
+        初始化去重索引
+
+        Args:
+            manager: 部落格管理器
+            threshold: 涵蓋率門檻（達到即視為重複）
+        """
+        self.manager = manager
+        self.db_path = manager.db_path
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._titles: Dict[str, str] = {}
+        self._terms: Dict[str, Dict[str, float]] = {}  # 文章 ID -> {詞元: 涵蓋權重}
+        self._postings: Dict[str, Dict[str, float]] = {}  # 詞元 -> {文章 ID: 涵蓋權重}
+        self._document_frequencies = Counter()
+
+        self.rebuild()
+        manager.add_change_listener(self.on_article_changed)
+
+    def rebuild(self) -> bool:
+        """
+        從資料庫重建索引（所有狀態的文章，草稿與已排程的主題也不重複生成）
+
+        Returns:
+            是否成功
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            rows = conn.execute('SELECT id, title, summary FROM blog_posts').fetchall()
+            conn.close()
+
+            terms = {row[0]: self._article_terms(row[1], row[2]) for row in rows}
+            document_frequencies = Counter()
+            for article_terms in terms.values():
+                document_frequencies.update(article_terms.keys())
+
+            with self._lock:
+                self._titles = {row[0]: row[1] for row in rows}
+                self._terms = {}
+                self._document_frequencies = document_frequencies
+                self._postings = {}
+                for article_id, article_terms in terms.items():
+                    self._index(article_id, article_terms)
+
+            logger.info(f"主題去重索引建立完成，共 {len(rows)} 篇文章")
+            return True
+
+        except Exception as e:
+            logger.error(f"建立主題去重索引失敗: {e}")
+            return False
+
+    def remember(self, article_id: str, title: str, summary: str = None):
+        """
+        加入（或更新）一篇文章，例如剛生成但尚未存入資料庫的文章
+
+        Args:
+            article_id: 文章 ID
+            title: 標題
+            summary: 摘要
+        """
+        terms = self._article_terms(title, summary)
+        with self._lock:
+            self._remove(article_id)
+            self._titles[article_id] = title
+            self._document_frequencies.update(terms.keys())
+            self._index(article_id, terms)
+
+    def forget(self, article_id: str):
+        """移除一篇文章"""
+        with self._lock:
+            self._remove(article_id)
+
+    def similar(self, text: str, limit: int = 5) -> List[Dict]:
+        """
+        找出與文字最相似的既有文章
+
+        Args:
+            text: 候選主題或標題
+            limit: 限制數量
+
+        Returns:
+            [{"id", "title", "score"}]，依涵蓋率由高到低
+        """
+        with self._lock:
+            query = tfidf_vector(term_frequencies([(text, 1)]), self._document_frequencies, len(self._terms))
+            scores = Counter()
+            for term, weight in query.items():
+                for article_id, coverage in self._postings.get(term, {}).items():
+                    scores[article_id] += weight * weight * coverage
+
+            return [
+                {"id": article_id, "title": self._titles[article_id], "score": score}
+                for article_id, score in scores.most_common(limit)
+            ]
+
+    def find_duplicate(self, text: str) -> Optional[Dict]:
+        """
+        檢查是否與既有文章重複
+
+        Args:
+            text: 候選主題或標題
+
+        Returns:
+            最相似且達到門檻的文章；沒有重複時回傳 None
+        """
+        matches = self.similar(text, limit=1)
+        if matches and matches[0]["score"] >= self.threshold:
+            return matches[0]
+        return None
+
+    def on_article_changed(self, article_id: str, action: str):
+        """BlogManager 變更監聽器：新增或更新時重新索引，刪除時移除"""
+        if action == "delete":
+            self.forget(article_id)
+            return
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            row = conn.execute('SELECT title, summary FROM blog_posts WHERE id = ?', (article_id,)).fetchone()
+            conn.close()
+        except Exception as e:
+            logger.error(f"更新主題去重索引失敗: {e}")
+            return
+
+        if row:
+            self.remember(article_id, row[0], row[1])
+        else:
+            self.forget(article_id)
+
+    @staticmethod
+    def _article_terms(title: str, summary: str = None) -> Dict[str, float]:
+        """文章的詞元與涵蓋權重（標題詞元為 1，只在摘要出現的為 SUMMARY_COVERAGE）"""
+        terms = {term: SUMMARY_COVERAGE for term in term_frequencies([(summary or "", 1)])}
+        terms.update((term, 1.0) for term in term_frequencies([(title or "", 1)]))
+        return terms
+
+    def _index(self, article_id: str, terms: Dict[str, float]):
+        """寫入反向索引（呼叫時須持有鎖）"""
+        self._terms[article_id] = terms
+        for term, coverage in terms.items():
+            self._postings.setdefault(term, {})[article_id] = coverage
+
+    def _remove(self, article_id: str):
+        """從索引移除文章（呼叫時須持有鎖）"""
+        terms = self._terms.pop(article_id, None)
+        for term in terms or ():
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(article_id, None)
+                if not postings:
+                    del self._postings[term]
+        if terms:
+            self._document_frequencies.subtract(terms.keys())
+        self._titles.pop(article_id, None)
+
+def main():
+    """主函數 - 檢查生成主題是否與既有文章重複"""
+    manager = BlogManager()
+    deduplicator = TopicDeduplicator(manager)
+
+    print("=== 主題去重 ===")
+    for topic in ["黃金投資入門指南", "黃金價格走勢分析", "央行購金潮對金價的影響"]:
+        match = deduplicator.find_duplicate(topic)
+        if match:
+            print(f"{topic}：重複（{match['title']}，涵蓋率 {match['score']:.2f}）")
+        else:
+            print(f"{topic}：可生成")
+
+if __name__ == "__main__":
+    main()
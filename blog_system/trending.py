@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+熱門文章排行榜
+以時間衰減分數（瀏覽、按讚）增量維護各分類的前 N 名，定期寫回資料庫
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from blog_manager import BlogManager
+
+# 設定日誌
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 全站排行榜的鍵（未分類的文章只列入全站排行）
+ALL_CATEGORIES = None
+
+# 分數低於此值（衰減後）不再保存
+_MIN_SCORE = 1e-3
+
+class TrendingTracker:
+    """
+    時間衰減熱門排行榜
+
+    分數以固定的基準時間表示（score × 2^((t - 基準) / 半衰期)），
+    所有文章的衰減倍率相同，因此不需隨時間更新即可直接比較；
+    每次事件只會讓分數上升，前 N 名只需檢查被更新的那篇文章。
+    """
+
+    def __init__(self, manager: BlogManager, top_n: int = 10, half_life_hours: float = 24.0,
+                 view_weight: float = 1.0, like_weight: float = 5.0, persist_interval: float = 60.0):
+        """
+        初始化排行榜
+
+        Args:
+            manager: 部落格管理器
+            top_n: 每個分類保留的名次數
+            half_life_hours: 分數半衰期（小時）
+            view_weight: 每次瀏覽的分數
+            like_weight: 每次按讚的分數
+            persist_interval: 寫回資料庫的間隔（秒），0 表示不啟動背景寫回
+        """
+        self.manager = manager
+        self.db_path = manager.db_path
+        self.top_n = top_n
+        self.half_life = half_life_hours * 3600
+        self.weights = {"view": view_weight, "like": like_weight}
+        self.persist_interval = persist_interval
+
+        self._lock = threading.Lock()
+        self._reference = time.time()
+        self._scores: Dict[str, float] = {}
+        self._articles: Dict[str, tuple] = {}  # article_id -> (title, category)
+        self._boards: Dict[Optional[str], List[tuple]] = {}  # 分類 -> [(score, article_id)]，由高到低
+        self._dirty = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.init_tables()
+        self.load()
+        manager.add_engagement_listener(self.record)
+        manager.add_change_listener(self.on_article_changed)
+
+        if persist_interval > 0:
+            self._thread = threading.Thread(target=self._persist_loop, name="trending-persist", daemon=True)
+            self._thread.start()
+
+        logger.info("熱門排行榜初始化完成")
+
+    def init_tables(self):
+        """初始化排行榜資料表"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS trending_scores (
+                    article_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    category TEXT,
+                    score REAL NOT NULL,
+                    scored_at REAL NOT NULL
+                )
+            ''')
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"排行榜資料表初始化失敗: {e}")
+
+    def get_trending(self, category: str = ALL_CATEGORIES, limit: int = None) -> List[Dict]:
+        """
+        獲取熱門文章（只讀取記憶體中的排行榜，不查詢 blog_posts）
+
+        Args:
+            category: 分類名稱（None 為全站）
+            limit: 限制數量（預設為 top_n）
+
+        Returns:
+            熱門文章列表（含目前的衰減分數）
+        """
+        with self._lock:
+            board = list(self._boards.get(category, ())[:limit or self.top_n])
+            decay = self._decay(time.time())
+            articles = self._articles
+
+            return [
+                {
+                    "id": article_id,
+                    "title": articles[article_id][0],
+                    "category": articles[article_id][1],
+                    "score": score * decay
+                }
+                for score, article_id in board
+            ]
+
+    def record(self, article_id: str, kind: str):
+        """
+        記錄一次互動（BlogManager 互動事件監聽器）
+
+        Args:
+            article_id: 文章 ID
+            kind: "view" 或 "like"
+        """
+        weight = self.weights.get(kind)
+        if not weight:
+            return
+
+        now = time.time()
+        with self._lock:
+            known = article_id in self._articles
+        if not known and not self._lookup(article_id):
+            return
+
+        with self._lock:
+            if now - self._reference > self.half_life * 32:
+                self._rebase(now)
+
+            score = self._scores.get(article_id, 0.0) + weight / self._decay(now)
+            self._scores[article_id] = score
+            self._dirty.add(article_id)
+
+            category = self._articles[article_id][1]
+            self._promote(ALL_CATEGORIES, article_id, score)
+            if category is not None:
+                self._promote(category, article_id, score)
+
+    def on_article_changed(self, article_id: str, action: str):
+        """BlogManager 變更監聽器：文章下架、刪除或改分類時更新排行榜"""
+        with self._lock:
+            tracked = article_id in self._articles
+        if not tracked:
+            return
+
+        if action == "delete" or not self._lookup(article_id):
+            with self._lock:
+                previous = self._articles.pop(article_id, (None, None))[1]
+                self._scores.pop(article_id, None)
+                self._dirty.add(article_id)
+                self._rebuild_boards([ALL_CATEGORIES, previous])
+
+    def load(self):
+        """從資料庫載入上次寫回的分數；沒有資料時以瀏覽數與發布時間估算初始分數"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT t.article_id, p.title, p.category, t.score, t.scored_at
+                FROM trending_scores t
+                JOIN blog_posts p ON p.id = t.article_id
+                WHERE p.status = 'published'
+            ''')
+            rows = cursor.fetchall()
+
+            if not rows:
+                rows = self._seed_rows(cursor)
+            conn.close()
+
+            with self._lock:
+                self._reference = time.time()
+                for article_id, title, category, score, scored_at in rows:
+                    # 寫回時的分數換算到基準時間（過舊的分數會下溢為 0）
+                    score *= math.pow(2.0, -(self._reference - scored_at) / self.half_life)
+                    if score >= _MIN_SCORE:
+                        self._articles[article_id] = (title, category)
+                        self._scores[article_id] = score
+                self._rebuild_boards()
+
+            logger.info(f"已載入 {len(rows)} 篇文章的熱門分數")
+
+        except Exception as e:
+            logger.error(f"載入熱門分數失敗: {e}")
+
+    def persist(self) -> int:
+        """
+        將變更過的分數寫回資料庫
+
+        Returns:
+            寫入（或刪除）的文章數
+        """
+        now = time.time()
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            decay = self._decay(now)
+            upserts = []
+            deletes = []
+            for article_id in dirty:
+                score = self._scores.get(article_id, 0.0) * decay
+                if article_id in self._articles and score >= _MIN_SCORE:
+                    title, category = self._articles[article_id]
+                    upserts.append((article_id, title, category, score, now))
+                else:
+                    deletes.append((article_id,))
+
+        if not upserts and not deletes:
+            return 0
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+
+            cursor.executemany('''
+                INSERT OR REPLACE INTO trending_scores (article_id, title, category, score, scored_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', upserts)
+            cursor.executemany('DELETE FROM trending_scores WHERE article_id = ?', deletes)
+
+            conn.commit()
+            conn.close()
+            return len(upserts) + len(deletes)
+
+        except Exception as e:
+            with self._lock:
+                self._dirty.update(dirty)
+            logger.error(f"寫回熱門分數失敗: {e}")
+            return 0
+
+    def close(self):
+        """停止背景寫回並寫入最後的分數"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.persist()
+
+    def _decay(self, timestamp: float) -> float:
+        """基準時間到指定時間的衰減倍率"""
+        return math.pow(2.0, -(timestamp - self._reference) / self.half_life)
+
+    def _rebase(self, now: float):
+        """將基準時間移到現在，避免分數倍率溢位（呼叫時須持有鎖）"""
+        decay = self._decay(now)
+        self._scores = {
+            article_id: score * decay
+            for article_id, score in self._scores.items()
+            if score * decay >= _MIN_SCORE or article_id in self._dirty
+        }
+        self._reference = now
+        self._rebuild_boards()
+
+    def _promote(self, category: Optional[str], article_id: str, score: float):
+        """分數上升後調整排行榜（只影響該篇文章，O(N)；呼叫時須持有鎖）"""
+        board = [entry for entry in self._boards.get(category, []) if entry[1] != article_id]
+
+        if len(board) >= self.top_n and score <= board[-1][0]:
+            return
+
+        index = len(board)
+        while index > 0 and board[index - 1][0] < score:
+            index -= 1
+        board.insert(index, (score, article_id))
+        self._boards[category] = board[:self.top_n]
+
+    def _rebuild_boards(self, categories=None):
+        """從全部分數重建排行榜（僅用於載入、文章移除等低頻事件；呼叫時須持有鎖）"""
+        if categories is None:
+            categories = {category for _, category in self._articles.values()}
+            self._boards = {}
+
+        for category in set(categories) | {ALL_CATEGORIES}:
+            entries = [
+                (score, article_id) for article_id, score in self._scores.items()
+                if article_id in self._articles
+                and (category is ALL_CATEGORIES or self._articles[article_id][1] == category)
+            ]
+            entries.sort(reverse=True)
+            self._boards[category] = entries[:self.top_n]
+
+    def _lookup(self, article_id: str) -> bool:
+        """讀取文章標題與分類（第一次出現或變更時），未發布的文章不列入排行"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            row = conn.execute(
+                "SELECT title, category FROM blog_posts WHERE id = ? AND status = 'published'",
+                (article_id,)
+            ).fetchone()
+            conn.close()
+        except Exception as e:
+            logger.error(f"讀取文章資訊失敗: {e}")
+            return False
+
+        if not row:
+            return False
+
+        with self._lock:
+            previous = self._articles.get(article_id)
+            self._articles[article_id] = row
+            if previous and previous != row and article_id in self._scores:
+                self._dirty.add(article_id)
+                self._rebuild_boards([ALL_CATEGORIES, previous[1], row[1]])
+        return True
+
+    def _seed_rows(self, cursor) -> List[tuple]:
+        """以既有的瀏覽數、按讚數依發布時間衰減，作為初始分數"""
+        now = time.time()
+        cursor.execute('''
+            SELECT id, title, category, views, likes, COALESCE(publish_date, created_at)
+            FROM blog_posts WHERE status = 'published'
+        ''')
+
+        rows = []
+        for article_id, title, category, views, likes, published in cursor.fetchall():
+            try:
+                published_at = datetime.fromisoformat(published).timestamp()
+            except (TypeError, ValueError):
+                published_at = now
+            score = (views or 0) * self.weights["view"] + (likes or 0) * self.weights["like"]
+            if score > 0:
+                rows.append((article_id, title, category, float(score), min(published_at, now)))
+        return rows
+
+    def _persist_loop(self):
+        """背景定期寫回分數"""
+        while not self._stop.wait(self.persist_interval):
+            self.persist()
+
+def main():
+    """主函數 - 顯示熱門文章"""
+    manager = BlogManager()
+    tracker = TrendingTracker(manager, persist_interval=0)
+
+    print("=== 熱門文章 ===")
+    for i, article in enumerate(tracker.get_trending(), 1):
+        print(f"{i}. {article['title']}（{article['category']}，分數 {article['score']:.2f}）")
+
+    tracker.close()
+
+if __name__ == "__main__":
+    main()
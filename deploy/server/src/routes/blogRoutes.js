@@ -74,7 +74,7 @@ router.get('/search/:keyword', (req, res) => {
 // 取得分類
 router.get('/categories/all', (req, res) => {
   try {
-    const rows = db.prepare('SELECT name, description, count FROM categories ORDER BY count DESC').all()
+    const rows = db.prepare('SELECT name, description, count FROM categories WHERE count > 0 ORDER BY count DESC').all()
     res.json({ success: true, data: rows })
   } catch (error) {
     res.status(500).json({ success: false, message: error.message })